@@ -0,0 +1,162 @@
+"""
+MEDIA_ROOT와 STATIC_ROOT의 파일을 응답하는 view입니다. (django.views.static.serve 대신 사용합니다.)
+이름에 내용의 hash가 들어간 파일(프로필 이미지, ManifestStaticFilesStorage로 collectstatic한 파일)은
+내용이 바뀌지 않으므로 1년 동안 캐시하도록 immutable 헤더를 붙이고, 그 외의 파일은 매번 ETag로 확인하게 합니다.
+
+MEDIA_OFFLOAD_HEADER를 설정하면 파일을 읽지 않고 앞단 웹 서버에 전송을 맡깁니다.
+  X-Accel-Redirect(nginx): MEDIA_OFFLOAD_PREFIX + 요청 경로, ex) /protected/media/profile/1/<hash>.webp
+      location /protected/ { internal; alias <BASE_DIR>/; }
+  X-Sendfile(apache, lighttpd): 파일의 절대 경로
+직접 응답할 때는 Range(한 구간), If-Range, If-None-Match, If-Modified-Since를 지원하며,
+wsgi.file_wrapper가 sendfile을 사용하는 서버(gunicorn 등)에서는 파일을 user space로 복사하지 않고 보냅니다.
+"""
+
+import mimetypes
+import os
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+# 내용의 hash가 들어간 이름입니다. 프로필 이미지는 <hash>.<확장자>, collectstatic은 <이름>.<hash>.<확장자>입니다.
+# 같은 이름의 파일이 있으면 storage가 _<임의의 7글자>를 붙이지만 내용은 hash와 같습니다.
+HASHED_NAME = re.compile(
+    r"(?:^|[/.])[0-9a-f]{12,64}(?:_[A-Za-z0-9]{7})?\.[A-Za-z0-9]+$"
+)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+class FileRange:
+    """
+    파일의 start부터 length 바이트만 읽는 file-like 객체입니다.
+    fileno()가 있으므로 sendfile을 사용하는 WSGI 서버는 현재 위치부터 Content-Length만큼 바로 보냅니다.
+    """
+
+    def __init__(self, path, start, length):
+        self.file = open(path, "rb")
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+class MediaFileResponse(FileResponse):
+    # sendfile을 사용하지 않을 때 한 번에 읽는 크기입니다. (FileResponse의 기본값은 4KB)
+    block_size = 256 * 1024
+
+
+def parse_range(header, size):
+    """
+    Range 헤더의 한 구간을 (start, end)로 반환합니다. 여러 구간이거나 형식이 다르면 None을 반환하여 전체를 보내고,
+    파일 범위를 벗어나면 ValueError를 발생시킵니다.
+    """
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        # bytes=-500은 마지막 500바이트입니다.
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range Not Satisfiable")
+    return start, end
+
+
+def _if_range_matches(request, etag, mtime):
+    header = request.META.get("HTTP_IF_RANGE")
+    if header is None:
+        return True
+    if header.startswith(('"', "W/")):
+        return header == etag
+    return parse_http_date_safe(header) == int(mtime)
+
+
+@require_safe
+def serve(request, path, document_root):
+    path = posixpath.normpath(path).lstrip("/")
+    try:
+        fullpath = safe_join(document_root, path)
+        stat = os.stat(fullpath)
+    except (OSError, ValueError, SuspiciousFileOperation):
+        raise Http404("파일이 없습니다.")
+    if not os.path.isfile(fullpath):
+        raise Http404("파일이 없습니다.")
+
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Accept-Ranges": "bytes",
+        "Cache-Control": (
+            IMMUTABLE_CACHE_CONTROL
+            if HASHED_NAME.search(path)
+            else REVALIDATE_CACHE_CONTROL
+        ),
+    }
+    not_modified = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if not_modified is not None:
+        for header, value in headers.items():
+            not_modified[header] = value
+        return not_modified
+
+    content_type, encoding = mimetypes.guess_type(fullpath)
+    content_type = content_type or "application/octet-stream"
+    offload_header = settings.MEDIA_OFFLOAD_HEADER
+    if offload_header:
+        response = HttpResponse(content_type=content_type, headers=headers)
+        if offload_header == "X-Sendfile":
+            response[offload_header] = fullpath
+        else:
+            prefix = settings.MEDIA_OFFLOAD_PREFIX.rstrip("/")
+            response[offload_header] = prefix + request.path
+        return response
+
+    start, end, status = 0, stat.st_size - 1, 200
+    range_header = request.META.get("HTTP_RANGE")
+    if range_header and _if_range_matches(request, etag, stat.st_mtime):
+        try:
+            byte_range = parse_range(range_header, stat.st_size)
+        except ValueError:
+            headers["Content-Range"] = f"bytes */{stat.st_size}"
+            return HttpResponse(status=416, headers=headers)
+        if byte_range is not None:
+            (start, end), status = byte_range, 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+    headers["Content-Length"] = end - start + 1
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    if request.method == "HEAD":
+        return HttpResponse(content_type=content_type, status=status, headers=headers)
+    response = MediaFileResponse(
+        FileRange(fullpath, start, end - start + 1),
+        content_type=content_type,
+        status=status,
+    )
+    for header, value in headers.items():
+        response[header] = value
+    return response
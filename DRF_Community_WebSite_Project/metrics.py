@@ -0,0 +1,281 @@
+"""
+요청마다 URL 이름(article_view, feed, profile 등)별로 처리 시간, DB 쿼리 수와 시간, serializer 시간, 응답 크기를 기록하는 미들웨어입니다.
+기록은 프로세스 안의 histogram에 모이며 관리자만 볼 수 있는 /metrics/에서 Prometheus text 형식으로 확인합니다.
+METRICS_ENABLED가 켜져 있을 때만 동작하며, 여러 프로세스로 실행한다면 프로세스마다 따로 집계됩니다.
+METRICS_PROFILE_SAMPLE_RATE의 비율만큼 요청을 cProfile로 실행하고, URL 이름마다 가장 느린 요청의 profile을 남깁니다.
+"""
+
+import cProfile
+import random
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework import permissions
+from rest_framework.serializers import BaseSerializer
+from rest_framework.views import APIView
+
+TIME_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# (이름, 설명, bucket, RequestStats에서 값을 꺼내는 속성)
+METRICS = (
+    ("http_request_duration_seconds", "요청 처리 시간", TIME_BUCKETS, "duration"),
+    ("db_queries", "요청당 DB 쿼리 수", QUERY_BUCKETS, "queries"),
+    ("db_duration_seconds", "요청당 DB 쿼리 시간", TIME_BUCKETS, "db_time"),
+    (
+        "serializer_duration_seconds",
+        "요청당 serializer.data 시간",
+        TIME_BUCKETS,
+        "serializer_time",
+    ),
+    ("response_size_bytes", "응답 크기", SIZE_BUCKETS, "size"),
+)
+
+
+class Histogram:
+    """
+    Prometheus histogram처럼 bucket별 누적 개수와 합계, 개수를 저장합니다.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Registry:
+    """
+    (metric 이름, view, method)별 Histogram을 모아두고 Prometheus text 형식으로 내보냅니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def observe(self, stats, view, method):
+        with self.lock:
+            for name, _, buckets, attr in METRICS:
+                value = getattr(stats, attr)
+                if value is None:
+                    continue
+                key = (name, view, method)
+                if key not in self.histograms:
+                    self.histograms[key] = Histogram(buckets)
+                self.histograms[key].observe(value)
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def render(self):
+        prefix = getattr(settings, "METRICS_PREFIX", "drf")
+        lines = []
+        with self.lock:
+            for name, description, _, _ in METRICS:
+                metric = f"{prefix}_{name}"
+                lines.append(f"# HELP {metric} {description}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (key, view, method), histogram in sorted(self.histograms.items()):
+                    if key != name:
+                        continue
+                    labels = f'view="{view}",method="{method}"'
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(
+                            f'{metric}_bucket{{{labels},le="{bound}"}} {count}'
+                        )
+                    lines.append(
+                        f'{metric}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+                    )
+                    lines.append(f"{metric}_sum{{{labels}}} {histogram.sum}")
+                    lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class RequestStats:
+    def __init__(self):
+        self.duration = 0
+        self.queries = 0
+        self.db_time = 0
+        self.serializer_time = 0
+        self.serializer_depth = 0
+        self.size = None
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        connection.execute_wrapper로 등록되어 쿼리 수와 시간을 잽니다.
+        """
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+_current_stats = ContextVar("request_stats", default=None)
+
+
+def instrument_serializers():
+    """
+    BaseSerializer.data를 감싸 측정 중인 요청의 serializer 시간을 더합니다.
+    Serializer.data, ListSerializer.data 모두 super().data를 거치므로 한 곳만 감싸면 되고,
+    serializer 안에서 다른 serializer의 data를 부르는 경우는 가장 바깥 호출만 셉니다.
+    """
+    original = BaseSerializer.data.fget
+    if getattr(original, "instrumented", False):
+        return
+
+    def data(self):
+        stats = _current_stats.get()
+        if stats is None:
+            return original(self)
+        stats.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return original(self)
+        finally:
+            stats.serializer_depth -= 1
+            if stats.serializer_depth == 0:
+                stats.serializer_time += time.perf_counter() - start
+
+    data.instrumented = True
+    BaseSerializer.data = property(data)
+
+
+class ProfileKeeper:
+    """
+    URL 이름마다 가장 느린 METRICS_PROFILE_KEEP개의 profile 파일만 남깁니다.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.slowest = {}
+
+    def offer(self, view, duration, profile):
+        keep = getattr(settings, "METRICS_PROFILE_KEEP", 5)
+        directory = Path(settings.METRICS_PROFILE_DIR)
+        with self.lock:
+            kept = self.slowest.setdefault(view, [])
+            if len(kept) >= keep and duration <= kept[0][0]:
+                return None
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{view}-{duration * 1000:.0f}ms-{time.time_ns()}.prof"
+            profile.dump_stats(path)
+            kept.append((duration, path))
+            kept.sort()
+            while len(kept) > keep:
+                _, evicted = kept.pop(0)
+                evicted.unlink(missing_ok=True)
+        return path
+
+
+profile_keeper = ProfileKeeper()
+
+
+class MetricsMiddleware:
+    """
+    METRICS_ENABLED가 꺼져 있으면 MiddlewareNotUsed로 미들웨어 목록에서 빠집니다.
+    스트리밍 응답은 미들웨어를 지난 뒤에 직렬화되므로 응답을 만들 때까지만 측정하며 크기는 기록하지 않습니다.
+    async view(ASGI)에서도 요청을 sync thread로 옮기지 않도록 async로 동작합니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        instrument_serializers()
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        sample_rate = getattr(settings, "METRICS_PROFILE_SAMPLE_RATE", 0)
+        profile = cProfile.Profile() if random.random() < sample_rate else None
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                _wrap_connections(stack, stats)
+                if profile is None:
+                    response = self.get_response(request)
+                else:
+                    response = profile.runcall(self.get_response, request)
+        finally:
+            stats.duration = time.perf_counter() - start
+            _current_stats.reset(token)
+        self.observe(request, stats, response, profile)
+        return response
+
+    async def __acall__(self, request):
+        """
+        async ORM은 요청마다 정해진 sync thread(thread_sensitive)에서 쿼리를 실행하고 DB 연결은 thread마다 따로 있으므로,
+        그 thread에서 측정을 등록하고 해제합니다.
+        cProfile은 event loop가 함께 처리하는 다른 요청까지 측정하게 되므로 사용하지 않습니다.
+        """
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        start = time.perf_counter()
+        stack = ExitStack()
+        try:
+            await sync_to_async(_wrap_connections)(stack, stats)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            stats.duration = time.perf_counter() - start
+            _current_stats.reset(token)
+        self.observe(request, stats, response, None)
+        return response
+
+    def observe(self, request, stats, response, profile):
+        if not response.streaming:
+            stats.size = len(response.content)
+        match = request.resolver_match
+        view = (match.url_name if match else None) or "unmatched"
+        registry.observe(stats, view, request.method)
+        if profile is not None:
+            profile_keeper.offer(view, stats.duration, profile)
+
+
+def _wrap_connections(stack, wrapper):
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(wrapper))
+
+
+class MetricsView(APIView):
+    """
+    관리자만 볼 수 있는 Prometheus text 형식의 측정값입니다.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(
+            registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -0,0 +1,234 @@
+"""
+한 요청 안에서 모양이 같은 쿼리가 반복되는 N+1 문제와 view별 쿼리 수 초과를 찾아냅니다.
+쿼리의 모양은 SQL에서 값과 IN 목록의 길이를 지운 것이며, 같은 모양이 QUERY_CHECK_THRESHOLD번 이상 실행되면
+그 쿼리를 실행한 serializer 필드와 호출 위치를 함께 알려줍니다.
+view는 query_budget(int 또는 {method: int})으로 요청당 최대 쿼리 수를 선언합니다.
+일괄 가져오기처럼 batch마다 같은 쿼리를 실행하는 method는 query_check_exempt_methods로 검사에서 뺍니다.
+QueryCheckMiddleware는 QUERY_CHECK가 "warn"이면 경고를, "raise"면 QueryCheckError를 발생시키며,
+테스트에서는 TestRunner(testing.py)가 "raise"로 실행하고 check_queries로 코드 일부만 검사할 수도 있습니다.
+"""
+
+import re
+import sys
+import traceback
+import warnings
+from collections import Counter
+from contextlib import ContextDecorator, ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import Serializer
+
+DEFAULT_THRESHOLD = 3
+# 트랜잭션 제어 문은 환경(테스트의 savepoint 등)에 따라 달라지므로 세지 않습니다.
+TRANSACTION_STATEMENTS = ("BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE")
+
+_IN_LIST = re.compile(r"\((?:\s*%s\s*,)+\s*%s\s*\)")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+
+
+class QueryCheckError(AssertionError):
+    pass
+
+
+class QueryCheckWarning(UserWarning):
+    pass
+
+
+def query_shape(sql):
+    """
+    값이 달라도 같은 쿼리로 볼 수 있도록 SQL의 숫자, 문자열, IN 목록의 길이를 지웁니다.
+    """
+    sql = _IN_LIST.sub("(%s)", sql)
+    sql = _STRING.sub("?", sql)
+    return _NUMBER.sub("?", sql)
+
+
+def _serializer_field():
+    """
+    지금 실행 중인 가장 안쪽 serializer의 필드를 "Serializer.field" 형태로 반환합니다.
+    Serializer.to_representation은 필드마다 지역 변수 field를 두고 값을 꺼냅니다.
+    """
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_name == "to_representation":
+            instance = frame.f_locals.get("self")
+            field = frame.f_locals.get("field")
+            if isinstance(instance, Serializer) and field is not None:
+                return f"{type(instance).__name__}.{field.field_name}"
+        frame = frame.f_back
+    return None
+
+
+def _project_stack():
+    """
+    manage.py, site-packages, 표준 라이브러리를 뺀 이 프로젝트의 호출 위치만 남깁니다.
+    """
+    base_dir = str(settings.BASE_DIR)
+    return [
+        frame
+        for frame in traceback.extract_stack()[:-3]
+        if frame.filename.startswith(base_dir)
+        and "site-packages" not in frame.filename
+        and not frame.filename.endswith("manage.py")
+    ]
+
+
+class QueryRecorder:
+    """
+    connection.execute_wrapper로 등록되어 쿼리 모양별 실행 횟수를 셉니다.
+    같은 모양이 두 번째로 실행될 때 serializer 필드와 호출 위치를 기록해둡니다.
+    """
+
+    def __init__(self):
+        self.counts = Counter()
+        self.origins = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(TRANSACTION_STATEMENTS):
+            shape = query_shape(sql)
+            self.counts[shape] += 1
+            if self.counts[shape] == 2:
+                self.origins[shape] = (_serializer_field(), _project_stack())
+        return execute(sql, params, many, context)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
+
+    def problems(self, budget=None, threshold=None):
+        """
+        반복된 쿼리와 budget 초과를 설명하는 문자열 목록을 반환합니다.
+        """
+        if threshold is None:
+            threshold = getattr(settings, "QUERY_CHECK_THRESHOLD", DEFAULT_THRESHOLD)
+        problems = []
+        for shape, count in self.counts.most_common():
+            if count < threshold:
+                break
+            field, stack = self.origins[shape]
+            lines = [f"같은 쿼리가 {count}번 실행되었습니다: {shape}"]
+            if field:
+                lines.append(f"serializer 필드: {field}")
+            lines.extend(traceback.format_list(stack))
+            problems.append("\n".join(lines))
+        if budget is not None and self.total > budget:
+            problems.append(
+                f"쿼리 {self.total}개로 query_budget {budget}개를 넘었습니다."
+            )
+        return problems
+
+
+class record_queries:
+    """
+    with 블록 안에서 모든 DB 연결의 쿼리를 QueryRecorder에 기록합니다.
+    """
+
+    def __enter__(self):
+        self.recorder = QueryRecorder()
+        self.stack = ExitStack()
+        for alias in connections:
+            self.stack.enter_context(connections[alias].execute_wrapper(self.recorder))
+        return self.recorder
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
+
+
+class check_queries(ContextDecorator):
+    """
+    테스트에서 사용하는 context manager/decorator입니다.
+    블록 안에서 같은 쿼리가 threshold번 이상 실행되거나 쿼리 수가 budget을 넘으면 QueryCheckError를 발생시킵니다.
+    """
+
+    def __init__(self, budget=None, threshold=None):
+        self.budget = budget
+        self.threshold = threshold
+
+    def __enter__(self):
+        self.recording = record_queries()
+        return self.recording.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.recording.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            problems = self.recording.recorder.problems(self.budget, self.threshold)
+            if problems:
+                raise QueryCheckError("\n\n".join(problems))
+
+
+def _get_view_class(request):
+    match = request.resolver_match
+    return getattr(match.func, "view_class", None) if match else None
+
+
+def is_query_check_exempt(request):
+    """
+    요청을 처리한 view가 query_check_exempt_methods로 이 method를 검사에서 뺐는지 확인합니다.
+    """
+    exempt = getattr(_get_view_class(request), "query_check_exempt_methods", ())
+    return request.method in exempt
+
+
+def get_query_budget(request):
+    """
+    요청을 처리한 view의 query_budget을 method에 맞게 반환합니다. 선언하지 않았으면 None입니다.
+    """
+    budget = getattr(_get_view_class(request), "query_budget", None)
+    if isinstance(budget, dict):
+        return budget.get(request.method)
+    return budget
+
+
+class QueryCheckMiddleware:
+    """
+    QUERY_CHECK가 비어 있으면 MiddlewareNotUsed로 미들웨어 목록에서 빠집니다.
+    스트리밍 응답은 미들웨어를 지난 뒤에 queryset을 chunk마다 읽으므로 응답을 만들 때까지만 검사합니다.
+    async view(ASGI)에서도 요청을 sync thread로 옮기지 않도록 async로 동작합니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.mode = getattr(settings, "QUERY_CHECK", "")
+        if self.mode not in ("warn", "raise"):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        self.check(request, recorder)
+        return response
+
+    async def __acall__(self, request):
+        """
+        async ORM은 요청마다 정해진 sync thread(thread_sensitive)에서 쿼리를 실행하고 DB 연결은 thread마다 따로 있으므로,
+        그 thread에서 기록을 등록하고 해제합니다.
+        """
+        recording = record_queries()
+        recorder = await sync_to_async(recording.__enter__)()
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(recording.__exit__)(None, None, None)
+        self.check(request, recorder)
+        return response
+
+    def check(self, request, recorder):
+        if is_query_check_exempt(request):
+            return
+        problems = recorder.problems(get_query_budget(request))
+        if problems:
+            message = f"{request.method} {request.path}\n" + "\n\n".join(problems)
+            if self.mode == "raise":
+                raise QueryCheckError(message)
+            warnings.warn(message, QueryCheckWarning)
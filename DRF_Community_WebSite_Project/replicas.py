@@ -0,0 +1,130 @@
+"""
+read_from_replica = True인 view의 GET/HEAD/OPTIONS 요청에서 실행하는 조회를 DATABASE_REPLICAS 중 하나로 보냅니다.
+그 외의 요청과 요청 밖(명령어, signal 등)의 조회, 모든 쓰기는 primary(default)를 사용합니다.
+replica는 primary보다 늦게 반영되므로 쓰기 요청을 보낸 유저는 REPLICA_STICKY_SECONDS 동안 primary에서 읽습니다.
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework import permissions
+
+_current_request = ContextVar("replica_request", default=None)
+
+
+def _sticky_key(user_id):
+    return f"replica-sticky:{user_id}"
+
+
+def _get_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def mark_written(user_id):
+    """
+    user_id의 조회를 REPLICA_STICKY_SECONDS 동안 primary로 보냅니다.
+    """
+    _get_cache().set(_sticky_key(user_id), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(user_id):
+    return _get_cache().get(_sticky_key(user_id), False)
+
+
+class ReplicaRequest:
+    """
+    요청 하나의 라우팅 정보입니다.
+    request.user는 DRF가 view 안에서 인증한 뒤에 정해지므로 유저별 primary 사용 여부는 조회할 때 확인합니다.
+    """
+
+    def __init__(self, request):
+        self.request = request
+        self.allowed = False
+        self.checked_user_id = None
+        self.sticky = False
+
+    def use_replica(self):
+        if not self.allowed:
+            return False
+        user = getattr(self.request, "user", None)
+        if user is None or not user.is_authenticated:
+            return True
+        if self.checked_user_id != user.id:
+            self.checked_user_id = user.id
+            self.sticky = is_sticky(user.id)
+        return not self.sticky
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _current_request.get()
+        if state is not None and state.use_replica():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica는 primary의 복제본이므로 어느 DB에서 불러온 객체끼리도 관계를 맺을 수 있습니다.
+        return True
+
+
+class ReplicaMiddleware:
+    """
+    DATABASE_REPLICAS가 비어 있으면 MiddlewareNotUsed로 미들웨어 목록에서 빠집니다.
+    스트리밍 응답은 미들웨어를 지난 뒤에 queryset을 읽으므로 primary에서 읽습니다.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "DATABASE_REPLICAS", None):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _current_request.set(ReplicaRequest(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        if self.is_write(request, response):
+            mark_written(request.user.id)
+        return response
+
+    async def __acall__(self, request):
+        token = _current_request.set(ReplicaRequest(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_request.reset(token)
+        if self.is_write(request, response):
+            await sync_to_async(mark_written)(request.user.id)
+        return response
+
+    def is_write(self, request, response):
+        user = getattr(request, "user", None)
+        return (
+            request.method not in permissions.SAFE_METHODS
+            and response.status_code < 400
+            and user is not None
+            and user.is_authenticated
+        )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        state = _current_request.get()
+        if state is not None:
+            state.allowed = request.method in permissions.SAFE_METHODS and getattr(
+                view_class, "read_from_replica", False
+            )
@@ -49,22 +49,46 @@ INSTALLED_APPS = [
 REST_FRAMEWORK = {
     # Use Django's standard `django.contrib.auth` permissions,
     # or allow read-only access for unauthenticated users.
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("user.authentication.ClaimsJWTAuthentication",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    # 앞단 proxy(nginx 등)의 수입니다. IP throttle은 X-Forwarded-For의 뒤에서 NUM_PROXIES번째 주소를 사용하며,
+    # 0이면 client가 보낸 X-Forwarded-For를 무시하고 REMOTE_ADDR를 사용합니다.
+    "NUM_PROXIES": int(os.environ.get("NUM_PROXIES", 0)),
+    # "<view의 throttle_scope>.<user|ip|username>": 비율 (DRF_Community_WebSite_Project/throttling.py)
+    "DEFAULT_THROTTLE_RATES": {
+        "toggle.user": "120/min",
+        "toggle.ip": "600/min",
+        # 일괄 처리(article/batch/)는 작업마다 token 하나를 쓰므로 한 요청의 최대 작업 수(500)보다 커야 합니다.
+        "batch.user": "1000/hour",
+        "batch.ip": "5000/hour",
+        "comment.user": "30/min",
+        "comment.ip": "120/min",
+        "login.ip": "30/min",
+        # 한 IP에서 한 username으로 시도하는 수입니다. (username만으로 세면 다른 유저의 로그인을 막을 수 있습니다.)
+        "login.username": "10/min",
+    },
 }
+# throttle을 사용할지 여부와 bucket을 저장할 곳("local": 프로세스 메모리, "cache": THROTTLE_CACHE_ALIAS)
+THROTTLE_ENABLED = os.environ.get("THROTTLE_ENABLED", "1") == "1"
+THROTTLE_STORE = os.environ.get("THROTTLE_STORE", "local")
+THROTTLE_CACHE_ALIAS = "default"
 
 CORS_ALLOWED_ORIGINS = ["http://127.0.0.1:5500"]  # live server
 
 MIDDLEWARE = [
+    # METRICS_ENABLED가 꺼져 있으면 스스로 빠집니다.
+    "DRF_Community_WebSite_Project.metrics.MetricsMiddleware",
+    # QUERY_CHECK가 비어 있으면 스스로 빠집니다.
+    "DRF_Community_WebSite_Project.querycheck.QueryCheckMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    # DATABASE_REPLICAS가 비어 있으면 스스로 빠집니다.
+    "DRF_Community_WebSite_Project.replicas.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -93,13 +117,128 @@ WSGI_APPLICATION = "DRF_Community_WebSite_Project.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
+# 기본값은 SQLite이며 DB_ENGINE=postgresql이면 DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT로 연결합니다.
+# 읽기 전용 replica는 DB_REPLICA_HOSTS(쉼표로 구분)에, SQLite라면 SQLITE_REPLICA_NAME에 지정합니다.
+DB_ENGINE = os.environ.get("DB_ENGINE", "sqlite3")
+
+if DB_ENGINE == "postgresql":
+    POSTGRESQL = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("DB_NAME", "drf_community"),
+        "USER": os.environ.get("DB_USER", "postgres"),
+        "PASSWORD": os.environ.get("DB_PASSWORD", ""),
+        "PORT": os.environ.get("DB_PORT", "5432"),
+        # 요청마다 새로 연결하지 않고 CONN_MAX_AGE초 동안 재사용하며, 재사용 전에 연결이 살아있는지 확인합니다.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        # 여러 worker의 연결을 pgbouncer(transaction pooling)로 모은다면 DB_HOST/DB_PORT를 pgbouncer로 지정하고
+        # DB_PGBOUNCER=1로 server-side cursor(.iterator())를 끕니다.
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get("DB_PGBOUNCER", "") == "1",
+    }
+    DATABASES = {
+        "default": {**POSTGRESQL, "HOST": os.environ.get("DB_HOST", "localhost")}
+    }
+    REPLICA_HOSTS = os.environ.get("DB_REPLICA_HOSTS", "")
+    for i, host in enumerate(filter(None, REPLICA_HOSTS.split(","))):
+        DATABASES[f"replica{i}"] = {
+            **POSTGRESQL,
+            "HOST": host,
+            "TEST": {"MIRROR": "default"},
+        }
+else:
+    # 연결마다 SQLITE_PRAGMAS를 적용하는 backend입니다. (DRF_Community_WebSite_Project/sqlite3)
+    SQLITE = {
+        "ENGINE": "DRF_Community_WebSite_Project.sqlite3",
+        # 다른 연결이 쓰는 중이면 실패하지 않고 이 시간(초)까지 기다립니다.
+        "OPTIONS": {"timeout": float(os.environ.get("SQLITE_BUSY_TIMEOUT", 20))},
+    }
+    # SQLITE_NAME으로 다른 DB 파일을 사용할 수 있습니다. (benchmarks.api의 서버 실행 등)
+    DATABASES = {
+        "default": {
+            **SQLITE,
+            "NAME": os.environ.get("SQLITE_NAME", BASE_DIR / "db.sqlite3"),
+        }
+    }
+    # 로컬에서 replica 라우팅을 확인할 때 사용합니다. 복제는 되지 않으므로 직접 복사해두어야 합니다.
+    if os.environ.get("SQLITE_REPLICA_NAME"):
+        DATABASES["replica0"] = {
+            **SQLITE,
+            "NAME": os.environ["SQLITE_REPLICA_NAME"],
+            "TEST": {"MIRROR": "default"},
+        }
+
+# 새 SQLite 연결마다 적용하는 PRAGMA입니다.
+# WAL은 읽기와 쓰기가 서로를 막지 않게 하며, WAL에서 synchronous=NORMAL은 전원이 꺼질 때만 마지막 커밋을 잃을 수 있습니다.
+SQLITE_PRAGMAS = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "mmap_size": 256 * 2**20,
+    # 음수는 KiB 단위입니다. (64MB)
+    "cache_size": -64000,
+    "temp_store": "memory",
+}
+# write_atomic(DRF_Community_WebSite_Project/transactions.py)으로 시작한 트랜잭션을 BEGIN IMMEDIATE로 시작합니다.
+SQLITE_IMMEDIATE_WRITES = True
+
+# read_from_replica가 켜진 view의 GET 요청은 replica에서 읽습니다. (DRF_Community_WebSite_Project/replicas.py)
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ["DRF_Community_WebSite_Project.replicas.ReplicaRouter"]
+# 쓰기 요청을 보낸 유저는 이 시간(초) 동안 primary에서 읽어 자신이 쓴 내용을 바로 볼 수 있습니다.
+# 여러 프로세스가 기록을 공유하려면 CACHE_BACKEND를 redis 등으로 지정해야 합니다.
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 10))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# 기본값은 프로세스 메모리(locmem)이며, 여러 프로세스가 캐시를 공유해야 한다면
+# CACHE_BACKEND/CACHE_LOCATION으로 redis, memcached 등의 backend를 지정합니다.
+# 응답 캐시가 locmem이면 게시글 상세와 프로필 조회는 ETag를 보내지 않습니다. (article/checks.py의 article.W001)
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": os.environ.get(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
     }
 }
 
+# web 서버의 worker 프로세스 수입니다. (gunicorn도 같은 환경 변수를 기본 worker 수로 사용합니다.)
+# 2 이상인데 응답 캐시가 locmem이면 무효화가 다른 worker에 반영되지 않으므로 응답 캐시를 사용하지 않습니다. (article.W002)
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", 1))
+# 응답 캐시(article/cache.py)가 사용할 CACHES의 alias와 게시글 상세 캐시의 유지 시간(초)
+RESPONSE_CACHE_ALIAS = "default"
+ARTICLE_DETAIL_CACHE_TIMEOUT = int(os.environ.get("ARTICLE_DETAIL_CACHE_TIMEOUT", 300))
+# 프로필 조회 캐시의 유지 시간(초)
+PROFILE_CACHE_TIMEOUT = int(os.environ.get("PROFILE_CACHE_TIMEOUT", 300))
+
+
+# Password hashing (user/hashers.py)
+# PASSWORD_HASHER가 새 비밀번호에 사용할 알고리즘이며, 나머지는 이전에 저장된 hash를 확인할 때 사용합니다.
+# argon2는 argon2-cffi, bcrypt는 bcrypt 패키지가 필요합니다.
+_PASSWORD_HASHERS = {
+    "pbkdf2": "user.hashers.PBKDF2PasswordHasher",
+    "argon2": "user.hashers.Argon2PasswordHasher",
+    "bcrypt": "user.hashers.BCryptSHA256PasswordHasher",
+    "scrypt": "user.hashers.ScryptPasswordHasher",
+}
+PASSWORD_HASHER = os.environ.get("PASSWORD_HASHER", "pbkdf2")
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+# hasher별 비용입니다. 바꾸면 다음 로그인에서 새 비용으로 다시 hash합니다.
+PASSWORD_HASH_COST = {
+    "pbkdf2": {"iterations": int(os.environ.get("PBKDF2_ITERATIONS", 600000))},
+    "argon2": {"time_cost": 2, "memory_cost": 102400, "parallelism": 8},
+    "bcrypt": {"rounds": 12},
+    "scrypt": {"work_factor": 2**14, "block_size": 8, "parallelism": 1},
+}
+# hash를 계산할 process 수입니다. 기본값 0이면 요청 thread에서 계산합니다.
+# pool은 web worker(WEB_CONCURRENCY)마다 따로 만들어지므로 process 수는 WEB_CONCURRENCY x PASSWORD_HASH_WORKERS가 되고,
+# worker마다 메모리를 차지합니다. 로그인이 몰려 web thread가 hash 계산에 묶이는 것이 확인된 경우에만
+# CPU 수와 web worker 수를 고려하여 켭니다. (python -m benchmarks.hashers로 처리량을 비교할 수 있습니다.)
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 0))
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -139,6 +278,24 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "static"
 MEDIA_ROOT = BASE_DIR / "media"
 MEDIA_URL = "/media/"
+# collectstatic이 파일 이름에 내용의 hash를 붙여 저장하므로 오래 캐시할 수 있습니다.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+    },
+}
+# STATIC_URL, MEDIA_URL을 django에서 응답할지 여부입니다. (DRF_Community_WebSite_Project/media.py)
+SERVE_MEDIA = os.environ.get("SERVE_MEDIA", "1" if DEBUG else "") == "1"
+# 파일 전송을 앞단 웹 서버에 맡길 때 사용할 헤더("X-Accel-Redirect", "X-Sendfile")와 nginx의 internal location
+MEDIA_OFFLOAD_HEADER = os.environ.get("MEDIA_OFFLOAD_HEADER", "")
+MEDIA_OFFLOAD_PREFIX = os.environ.get("MEDIA_OFFLOAD_PREFIX", "/protected/")
+
+# 프로필 이미지 썸네일(user/images.py)의 {이름: 한 변의 길이(px)}, 저장 형식, 품질, worker thread 수
+PROFILE_IMAGE_SIZES = {"small": 64, "medium": 256, "large": 640}
+PROFILE_IMAGE_FORMATS = ("webp", "jpeg")
+PROFILE_IMAGE_QUALITY = 80
+PROFILE_IMAGE_WORKERS = int(os.environ.get("PROFILE_IMAGE_WORKERS", 2))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -153,3 +310,23 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": False,
     "UPDATE_LAST_LOGIN": False,
 }
+
+# 게시글 검색 backend의 클래스 경로입니다. 비워두면 DB에 맞는 backend를 사용합니다. (article/search.py)
+ARTICLE_SEARCH_BACKEND = os.environ.get("ARTICLE_SEARCH_BACKEND", "")
+
+# 팔로워가 이 수보다 많은 유저의 게시글은 팔로워 피드에 미리 저장하지 않고 조회 시 함께 가져옵니다.
+FEED_FANOUT_MAX_FOLLOWERS = int(os.environ.get("FEED_FANOUT_MAX_FOLLOWERS", 5000))
+
+# 요청별 처리 시간/쿼리 수 등을 기록하는 미들웨어와 /metrics/ (DRF_Community_WebSite_Project/metrics.py)
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "") == "1"
+# 이 비율만큼의 요청을 cProfile로 실행하고, URL 이름마다 가장 느린 METRICS_PROFILE_KEEP개의 profile을 남깁니다.
+METRICS_PROFILE_SAMPLE_RATE = float(os.environ.get("METRICS_PROFILE_SAMPLE_RATE", 0))
+METRICS_PROFILE_DIR = os.environ.get("METRICS_PROFILE_DIR", BASE_DIR / "profiles")
+METRICS_PROFILE_KEEP = 5
+
+# 같은 모양의 쿼리 반복(N+1)과 view의 query_budget 초과를 검사합니다. (DRF_Community_WebSite_Project/querycheck.py)
+# "warn"이면 경고, "raise"면 예외를 발생시키고, 비워두면 검사하지 않습니다. 테스트는 항상 "raise"로 실행합니다.
+QUERY_CHECK = os.environ.get("QUERY_CHECK", "warn" if DEBUG else "")
+# 같은 모양의 쿼리가 이 횟수 이상 실행되면 N+1로 봅니다.
+QUERY_CHECK_THRESHOLD = 3
+TEST_RUNNER = "DRF_Community_WebSite_Project.testing.TestRunner"
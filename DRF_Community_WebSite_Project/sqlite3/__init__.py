@@ -0,0 +1,4 @@
+"""
+동시 요청이 많은 단일 서버 배포를 위한 SQLite backend입니다. (settings의 ENGINE)
+연결마다 SQLITE_PRAGMAS(WAL, synchronous 등)를 적용하고, write_atomic으로 시작한 트랜잭션은 BEGIN IMMEDIATE로 시작합니다.
+"""
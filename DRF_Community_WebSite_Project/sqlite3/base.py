@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.backends.sqlite3 import base
+from django.dispatch import receiver
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # write_atomic이 트랜잭션을 시작하는 동안만 True가 됩니다.
+    begin_immediate = False
+
+    def _start_transaction_under_autocommit(self):
+        """
+        기본 BEGIN(DEFERRED)은 첫 쓰기에서야 쓰기 잠금을 요청하며, 그때 다른 연결이 쓰고 있다면
+        busy timeout을 기다리지 않고 바로 "database is locked"가 발생합니다.
+        BEGIN IMMEDIATE는 시작할 때 잠금을 요청하므로 busy timeout 동안 차례를 기다립니다.
+        """
+        self.cursor().execute("BEGIN IMMEDIATE" if self.begin_immediate else "BEGIN")
+
+
+@receiver(connection_created, sender=DatabaseWrapper)
+def apply_pragmas(sender, connection, **kwargs):
+    """
+    새 연결에 SQLITE_PRAGMAS를 적용합니다. journal_mode=wal은 DB 파일에 저장되어 계속 유지됩니다.
+    """
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, "SQLITE_PRAGMAS", {}).items():
+            cursor.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,35 @@
+"""
+manage.py test가 사용하는 테스트 러너입니다. (settings.TEST_RUNNER)
+"""
+
+from tempfile import TemporaryDirectory
+
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    모든 요청을 QueryCheckMiddleware가 "raise" 모드로 검사하도록 합니다.
+    테스트 DB에서 replica는 primary를 그대로 가리키므로(TEST MIRROR) replica 라우팅은 끕니다.
+    비밀번호 hash는 worker process를 띄우지 않고 테스트 thread에서 계산합니다.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_CHECK = "raise"
+        settings.DATABASE_REPLICAS = []
+        settings.PASSWORD_HASH_WORKERS = 0
+
+
+def use_shared_cache(test_case):
+    """
+    test_case가 끝날 때까지 캐시를 여러 프로세스가 공유하는 FileBasedCache로 바꿉니다.
+    기본값인 locmem에서는 사용하지 않는 조건부 GET(article/conditional.py의 version_validators) 등을 검증할 때 사용합니다.
+    """
+    directory = TemporaryDirectory()
+    test_case.addCleanup(directory.cleanup)
+    backend = "django.core.cache.backends.filebased.FileBasedCache"
+    caches = {"default": {"BACKEND": backend, "LOCATION": directory.name}}
+    test_case.enterContext(override_settings(CACHES=caches))
@@ -0,0 +1,239 @@
+"""
+좋아요/북마크/팔로우 토글, 댓글 작성, 로그인의 반복 요청을 막는 DRF throttle입니다.
+view의 throttle_scope와 throttle 종류로 REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]의 "<scope>.<종류>" 비율을 찾으며,
+비율이 없는 scope와 GET 등의 안전한 요청은 제한하지 않습니다.
+요청 하나는 token 하나를 쓰며, view에 get_throttle_cost(request)가 있다면 그 수만큼 씁니다. (일괄 처리의 작업 수 등)
+view의 throttle 중 하나라도 거절하면 앞의 throttle이 쓴 token을 돌려주므로, 거절된 요청은 어느 제한에도 세지 않습니다.
+  user: 로그인한 유저마다, ip: 요청한 IP마다, username: 로그인 요청의 username과 IP마다
+THROTTLE_STORE가 "local"이면 프로세스 메모리의 token bucket을 사용하여 요청당 수 µs 안에 판단하고,
+"cache"면 THROTTLE_CACHE_ALIAS의 캐시에 sliding window 방식으로 세어 여러 프로세스가 같은 제한을 공유합니다.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+# local store가 이 수보다 많은 bucket을 가지면 가장 오래 요청이 없던 bucket부터 지웁니다.
+LOCAL_MAX_BUCKETS = 100000
+
+_parse_rate = SimpleRateThrottle.parse_rate
+_rates = {}
+
+
+def get_rate(name):
+    """
+    "30/min" 형태의 비율을 (요청 수, 기간(초))로 반환합니다. 설정되지 않았으면 None입니다.
+    """
+    if name not in _rates:
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(name)
+        _rates[name] = _parse_rate(None, rate) if rate else None
+    return _rates[name]
+
+
+@receiver(setting_changed)
+def clear_rates(setting, **kwargs):
+    if setting == "REST_FRAMEWORK":
+        _rates.clear()
+
+
+class LocalBucketStore:
+    """
+    key마다 (남은 token, 마지막 갱신 시각)을 저장하는 token bucket입니다.
+    token은 기간 동안 요청 수만큼 일정하게 다시 채워지며, 최대 요청 수만큼 한 번에 요청할 수 있습니다.
+    bucket은 최근에 요청한 순서로 유지하여, LOCAL_MAX_BUCKETS개를 넘으면 가장 오래된 bucket 하나만 O(1)에 지웁니다.
+    """
+
+    def __init__(self):
+        self.buckets = OrderedDict()
+        self.lock = threading.Lock()
+
+    def consume(self, key, capacity, period, now, cost=1):
+        """
+        token을 cost개 쓰고 0을 반환합니다. token이 모자라면 cost개가 찰 때까지 기다릴 시간(초)을 반환합니다.
+        """
+        refill = capacity / period
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                tokens = capacity
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * refill)
+                self.buckets.move_to_end(key)
+            allowed = tokens >= cost
+            self.buckets[key] = (tokens - cost if allowed else tokens, now)
+            if len(self.buckets) > LOCAL_MAX_BUCKETS:
+                self.buckets.popitem(last=False)
+        return 0 if allowed else (cost - tokens) / refill
+
+    def refund(self, key, capacity, period, now, cost=1):
+        """
+        consume으로 쓴 token cost개를 돌려줍니다.
+        """
+        with self.lock:
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                self.buckets[key] = (min(capacity, bucket[0] + cost), bucket[1])
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+
+class CacheWindowStore:
+    """
+    기간 단위의 요청 수를 캐시에 incr로 세고, 이전 기간의 수를 지난 비율만큼 더해 최근 기간 동안의 요청 수를 추정합니다.
+    incr은 memcached, redis 등에서 원자적으로 실행되므로 여러 프로세스가 동시에 요청해도 수를 잃지 않습니다.
+    """
+
+    def get_key(self, key, window):
+        # username 등 요청에서 온 값이 들어있으므로 캐시 key로 사용할 수 있는 문자로 바꿉니다.
+        return f"throttle:{hashlib.md5(key.encode()).hexdigest()}:{window}"
+
+    def consume(self, key, capacity, period, now, cost=1):
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        window = int(now // period)
+        current_key = self.get_key(key, window)
+        cache.add(current_key, 0, period * 2)
+        try:
+            count = cache.incr(current_key, cost)
+        except ValueError:
+            # add와 incr 사이에 만료된 경우입니다.
+            cache.set(current_key, cost, period * 2)
+            count = cost
+        previous = cache.get(self.get_key(key, window - 1), 0)
+        remaining = 1 - (now - window * period) / period
+        estimated = previous * remaining + count
+        if estimated <= capacity:
+            return 0
+        # 거절된 요청은 세지 않습니다.
+        cache.decr(current_key, cost)
+        if previous and estimated - capacity < previous * remaining:
+            return (estimated - capacity) / previous * period
+        return remaining * period
+
+    def refund(self, key, capacity, period, now, cost=1):
+        """
+        consume으로 센 요청 수를 같은 기간에서 cost만큼 뺍니다.
+        """
+        cache = caches[settings.THROTTLE_CACHE_ALIAS]
+        try:
+            cache.decr(self.get_key(key, int(now // period)), cost)
+        except ValueError:
+            # 기간이 지나 이미 만료된 경우입니다.
+            pass
+
+    def clear(self):
+        pass
+
+
+_local_store = LocalBucketStore()
+_cache_store = CacheWindowStore()
+
+
+def get_store():
+    if settings.THROTTLE_STORE == "cache":
+        return _cache_store
+    return _local_store
+
+
+def reset_throttles():
+    """
+    local store의 모든 bucket을 비웁니다. 테스트에서 사용합니다. (cache store는 캐시를 비우면 됩니다.)
+    """
+    _local_store.clear()
+
+
+class BucketThrottle(BaseThrottle):
+    """
+    kind별 ident를 정하는 부모 클래스입니다. ident가 None이면 제한하지 않습니다.
+    DRF는 앞의 throttle이 거절해도 모든 throttle의 allow_request를 호출하므로,
+    요청에 쓴 token을 기록해두었다가 거절되면 돌려주고 이후 throttle은 token을 쓰지 않습니다.
+    """
+
+    kind = None
+
+    def get_ident_for(self, request):
+        raise NotImplementedError
+
+    def get_cost(self, request, view):
+        get_throttle_cost = getattr(view, "get_throttle_cost", None)
+        return get_throttle_cost(request) if get_throttle_cost else 1
+
+    def allow_request(self, request, view):
+        self.wait_seconds = None
+        if not settings.THROTTLE_ENABLED or request.method in SAFE_METHODS:
+            return True
+        scope = getattr(view, "throttle_scope", None)
+        rate = get_rate(f"{scope}.{self.kind}") if scope else None
+        if rate is None:
+            return True
+        ident = self.get_ident_for(request)
+        if ident is None:
+            return True
+        if getattr(request, "_bucket_throttled", False):
+            # 앞의 throttle이 이미 거절한 요청입니다.
+            return True
+        consumed = getattr(request, "_bucket_consumed", None)
+        if consumed is None:
+            consumed = request._bucket_consumed = []
+        store = get_store()
+        args = (
+            f"{scope}.{self.kind}:{ident}",
+            *rate,
+            time.time(),
+            self.get_cost(request, view),
+        )
+        wait = store.consume(*args)
+        if wait:
+            self.wait_seconds = wait
+            request._bucket_throttled = True
+            for consumed_store, consumed_args in consumed:
+                consumed_store.refund(*consumed_args)
+            return False
+        consumed.append((store, args))
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserBucketThrottle(BucketThrottle):
+    kind = "user"
+
+    def get_ident_for(self, request):
+        if request.user and request.user.is_authenticated:
+            return request.user.id
+        return None
+
+
+class IPBucketThrottle(BucketThrottle):
+    kind = "ip"
+
+    def get_ident_for(self, request):
+        return self.get_ident(request)
+
+
+class UsernameBucketThrottle(BucketThrottle):
+    """
+    로그인 요청의 username과 IP마다 제한하여 한 IP에서 한 계정의 비밀번호를 반복해서 시도하는 것을 막습니다.
+    username만으로 제한하면 누구나 다른 유저의 username으로 요청을 보내 그 유저의 로그인을 막을 수 있으므로 IP를 함께 사용합니다.
+    """
+
+    kind = "username"
+
+    def get_ident_for(self, request):
+        username = (
+            request.data.get("username") if hasattr(request.data, "get") else None
+        )
+        if not isinstance(username, str) or not username:
+            return None
+        return f"{username.lower()}:{self.get_ident(request)}"
@@ -0,0 +1,24 @@
+"""
+쓰기를 하는 트랜잭션에 사용하는 transaction.atomic입니다.
+프로젝트의 SQLite backend(DRF_Community_WebSite_Project/sqlite3)에서 SQLITE_IMMEDIATE_WRITES가 켜져 있으면
+가장 바깥 트랜잭션을 BEGIN IMMEDIATE로 시작하여, 동시에 쓰는 요청이 "database is locked" 대신 차례를 기다리게 합니다.
+다른 DB에서는 transaction.atomic과 같습니다.
+"""
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+
+
+@contextmanager
+def write_atomic(using=None):
+    connection = transaction.get_connection(using)
+    if getattr(settings, "SQLITE_IMMEDIATE_WRITES", False):
+        connection.begin_immediate = True
+    try:
+        with transaction.atomic(using=using):
+            connection.begin_immediate = False
+            yield
+    finally:
+        connection.begin_immediate = False
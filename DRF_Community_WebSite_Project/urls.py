@@ -15,15 +15,28 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 from django.contrib import admin
-from django.urls import path
+import re
+from django.urls import path, re_path
 from django.urls import include
 from django.conf import settings
-from django.conf.urls.static import static
+from DRF_Community_WebSite_Project import media
+from DRF_Community_WebSite_Project.metrics import MetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("user/", include("user.urls")),
     path("article/", include("article.urls")),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
 ]
-urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.SERVE_MEDIA:
+    urlpatterns += [
+        re_path(
+            r"^%s(?P<path>.*)$" % re.escape(prefix.lstrip("/")),
+            media.serve,
+            {"document_root": root},
+        )
+        for prefix, root in (
+            (settings.STATIC_URL, settings.STATIC_ROOT),
+            (settings.MEDIA_URL, settings.MEDIA_ROOT),
+        )
+    ]
@@ -0,0 +1,198 @@
+"""
+게시글 목록, 상세, 피드, 댓글 목록을 async ORM(aget, acount, async for)으로 조회하는 읽기 전용 view입니다.
+DRF 3.14의 APIView는 async handler를 지원하지 않으므로 django View 위에 인증, 권한, 예외 처리, JSON 응답만 직접 구현했습니다.
+ASGI로 실행하면 DB를 기다리는 동안 요청이 worker thread를 붙잡지 않으며, 응답 형식은 같은 이름의 동기 view와 같습니다.
+If-None-Match 등의 조건부 요청(article/conditional.py)과 스트리밍은 동기 view에서만 지원합니다.
+"""
+
+import inspect
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import exceptions, permissions, status
+from rest_framework.exceptions import NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from article.cache import aget_or_build, article_detail_key
+from article.feeds import afeed_queryset
+from article.models import Article, Comment
+from article.paginations import ArticlePagination, CommentPagination, FeedPagination
+from article.serializers import (
+    ArticleListSerializer,
+    CommentSerializer,
+    aget_user_article_status,
+)
+from article.views import ArticleDetailView
+from user.authentication import AsyncClaimsJWTAuthentication
+
+
+async def _maybe_await(value):
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class AsyncAPIView(View):
+    """
+    async handler를 사용하는 APIView입니다.
+    authentication_classes의 authenticate와 permission_classes의 has_permission은
+    동기 함수와 async 함수 모두 사용할 수 있으므로 DB를 조회하지 않는 DRF 권한 클래스는 그대로 사용합니다.
+    """
+
+    authentication_classes = [AsyncClaimsJWTAuthentication]
+    permission_classes = [permissions.AllowAny]
+    renderer = JSONRenderer()
+
+    async def dispatch(self, request, *args, **kwargs):
+        # query_params, build_absolute_uri 등을 사용하는 pagination과 serializer를 위해 DRF Request로 감쌉니다.
+        request = Request(request)
+        self.request = request
+        try:
+            await self.initial(request)
+            method = request.method.lower()
+            handler = getattr(self, method, None)
+            if method not in self.http_method_names or handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            return await _maybe_await(handler(request, *args, **kwargs))
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    async def initial(self, request):
+        self.authenticator = None
+        user, auth = AnonymousUser(), None
+        for authenticator in [cls() for cls in self.authentication_classes]:
+            result = await _maybe_await(authenticator.authenticate(request))
+            if result is not None:
+                self.authenticator = authenticator
+                user, auth = result
+                break
+        request.user = user
+        request.auth = auth
+
+        for permission in [cls() for cls in self.permission_classes]:
+            if not await _maybe_await(permission.has_permission(request, self)):
+                if self.authenticator is None and self.authentication_classes:
+                    raise exceptions.NotAuthenticated()
+                raise exceptions.PermissionDenied(
+                    getattr(permission, "message", None),
+                    getattr(permission, "code", None),
+                )
+
+    def respond(self, data, status_code=status.HTTP_200_OK):
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status_code,
+            content_type="application/json",
+        )
+
+    def handle_exception(self, exc):
+        """
+        DRF의 기본 exception handler와 같은 형식으로 응답합니다.
+        """
+        if isinstance(exc.detail, (list, dict)):
+            data = exc.detail
+        else:
+            data = {"detail": exc.detail}
+        response = self.respond(data, exc.status_code)
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            authenticator = self.authentication_classes[0]()
+            response["WWW-Authenticate"] = authenticator.authenticate_header(
+                self.request
+            )
+        return response
+
+
+class AsyncArticleListMixin:
+    pagination_class = ArticlePagination
+
+    async def list(self, request, queryset):
+        """
+        한 페이지를 읽고 좋아요/북마크 여부를 미리 조회해 serializer에 넘겨줍니다.
+        """
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, request, view=self)
+        article_status = await aget_user_article_status(
+            request, [article.id for article in page]
+        )
+        serializer = ArticleListSerializer(
+            page,
+            many=True,
+            context={"request": request, "article_status": article_status},
+        )
+        return self.respond(paginator.get_paginated_response(serializer.data).data)
+
+
+class AsyncArticleView(AsyncArticleListMixin, AsyncAPIView):
+    """
+    ArticleView의 GET(게시글 목록)과 같습니다.
+    """
+
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    read_from_replica = True
+    query_budget = 4
+
+    async def get(self, request):
+        queryset = Article.objects.for_listing().order_by("-created_at", "-id")
+        return await self.list(request, queryset)
+
+
+class AsyncFeedView(AsyncArticleListMixin, AsyncAPIView):
+    """
+    FeedView와 같습니다.
+    """
+
+    pagination_class = FeedPagination
+    permission_classes = [permissions.IsAuthenticated]
+    read_from_replica = True
+    query_budget = 5
+
+    async def get(self, request):
+        return await self.list(request, await afeed_queryset(request.user))
+
+
+class AsyncArticleDetailView(AsyncAPIView):
+    """
+    ArticleDetailView의 GET과 같으며 같은 상세 조회 캐시를 사용합니다.
+    캐시가 비어 있으면 두 view가 같은 값을 저장하도록 ArticleDetailView.build_detail로 만듭니다.
+    """
+
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    query_budget = 3
+
+    async def get(self, request, article_id):
+        build_detail = sync_to_async(ArticleDetailView().build_detail)
+        data = await aget_or_build(
+            article_detail_key(article_id),
+            lambda: build_detail(article_id),
+            settings.ARTICLE_DETAIL_CACHE_TIMEOUT,
+        )
+        return self.respond(data)
+
+
+class AsyncCommentView(AsyncAPIView):
+    """
+    CommentView의 GET(댓글 목록)과 같습니다.
+    """
+
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    read_from_replica = True
+    query_budget = 3
+
+    async def get(self, request, article_id):
+        if not await Article.objects.filter(id=article_id).aexists():
+            raise NotFound(
+                detail="작성한 글이 없습니다.", code=status.HTTP_404_NOT_FOUND
+            )
+        comments = Comment.objects.select_related("author").filter(
+            article_id=article_id
+        )
+        paginator = CommentPagination()
+        page = await paginator.apaginate_queryset(comments, request, view=self)
+        serializer = CommentSerializer(page, many=True)
+        return self.respond(paginator.get_paginated_response(serializer.data).data)
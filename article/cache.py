@@ -0,0 +1,174 @@
+"""
+django cache framework를 이용한 응답 캐시 함수들입니다.
+캐시 키는 "이름:id:버전" 형태이며, 데이터가 바뀌면 버전을 새로 발급해 이전 값을 더 이상 읽지 않도록 합니다.
+(삭제 방식과 달리, 변경 전에 만들기 시작한 느린 요청이 끝나면서 이전 값을 다시 저장해도 새 버전에는 영향이 없습니다.)
+캐시가 비어 있을 때는 한 요청만 값을 만들고 나머지는 잠시 기다렸다가 만들어진 값을 사용합니다.
+무효화는 쓰기 요청을 처리한 프로세스의 캐시에만 반영되므로, locmem처럼 프로세스마다 따로 저장하는 캐시에서
+web worker가 여럿이면(WEB_CONCURRENCY) 다른 worker가 이전 값을 보내지 않도록 캐시를 사용하지 않습니다.
+"""
+
+import asyncio
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+LOCK_TIMEOUT = 5
+POLL_INTERVAL = 0.05
+# 프로세스마다 따로 저장하는 backend입니다. 버전과 값을 다른 프로세스와 공유하지 않습니다.
+PROCESS_LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def get_cache():
+    return caches[getattr(settings, "RESPONSE_CACHE_ALIAS", "default")]
+
+
+def is_shared_cache():
+    """
+    응답 캐시를 모든 web worker와 관리 명령이 공유하는지 여부입니다. (redis, memcached, DB, 파일 등)
+    """
+    alias = getattr(settings, "RESPONSE_CACHE_ALIAS", "default")
+    return settings.CACHES[alias]["BACKEND"] not in PROCESS_LOCAL_BACKENDS
+
+
+def is_cache_enabled():
+    """
+    get_or_build가 캐시를 사용하는지 여부입니다. 프로세스마다 따로 저장하는 캐시는 web worker가 하나일 때만 사용합니다.
+    """
+    return is_shared_cache() or settings.WEB_CONCURRENCY <= 1
+
+
+def get_version(key):
+    """
+    key의 현재 버전을 가져옵니다. 버전이 없다면(처음이거나 캐시에서 밀려난 경우) 새로 발급합니다.
+    """
+    cache = get_cache()
+    version_key = f"{key}:version"
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+    return version
+
+
+def get_or_build(key, build, timeout=None):
+    """
+    캐시에서 key의 값을 가져오고, 없다면 build()로 만들어 저장한 뒤 반환합니다.
+    동시에 여러 요청이 빈 캐시를 만나면 lock을 얻은 한 요청만 build()를 실행합니다.
+    lock을 얻지 못한 요청은 LOCK_TIMEOUT초까지 값이 저장되기를 기다리고, 그래도 없으면 직접 만듭니다.
+    is_cache_enabled()가 False면 캐시 없이 build()의 결과를 반환합니다.
+    """
+    if not is_cache_enabled():
+        return build()
+    cache = get_cache()
+    versioned_key = f"{key}:{get_version(key)}"
+    value = cache.get(versioned_key)
+    if value is not None:
+        return value
+
+    lock_key = f"{versioned_key}:lock"
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = build()
+            cache.set(versioned_key, value, timeout)
+        finally:
+            cache.delete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        lock_released = cache.get(lock_key) is None
+        value = cache.get(versioned_key)
+        if value is not None:
+            return value
+        if lock_released:
+            break
+    return build()
+
+
+async def aget_version(key):
+    """
+    get_version의 async 버전입니다.
+    """
+    cache = get_cache()
+    version_key = f"{key}:version"
+    version = await cache.aget(version_key)
+    if version is None:
+        await cache.aadd(version_key, time.time_ns(), None)
+        version = await cache.aget(version_key)
+    return version
+
+
+async def aget_or_build(key, build, timeout=None):
+    """
+    get_or_build의 async 버전입니다. build는 값을 반환하는 coroutine 함수입니다.
+    """
+    if not is_cache_enabled():
+        return await build()
+    cache = get_cache()
+    versioned_key = f"{key}:{await aget_version(key)}"
+    value = await cache.aget(versioned_key)
+    if value is not None:
+        return value
+
+    lock_key = f"{versioned_key}:lock"
+    if await cache.aadd(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            value = await build()
+            await cache.aset(versioned_key, value, timeout)
+        finally:
+            await cache.adelete(lock_key)
+        return value
+
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        await asyncio.sleep(POLL_INTERVAL)
+        lock_released = await cache.aget(lock_key) is None
+        value = await cache.aget(versioned_key)
+        if value is not None:
+            return value
+        if lock_released:
+            break
+    return await build()
+
+
+def invalidate(*keys):
+    """
+    keys의 버전을 새로 발급해 저장된 값을 무효화합니다.
+    트랜잭션 안에서 호출되면 커밋된 뒤에 무효화하여, 커밋 전 데이터로 캐시가 다시 채워지지 않도록 합니다.
+    """
+    if not keys:
+        return
+
+    def bump():
+        version = time.time_ns()
+        get_cache().set_many({f"{key}:version": version for key in keys}, None)
+
+    transaction.on_commit(bump)
+
+
+def article_detail_key(article_id):
+    return f"article:detail:{article_id}"
+
+
+def invalidate_article_detail(*article_ids):
+    """
+    게시글 상세 조회 캐시를 무효화합니다.
+    """
+    invalidate(*[article_detail_key(article_id) for article_id in article_ids])
+
+
+def profile_key(user_id):
+    return f"profile:{user_id}"
+
+
+def invalidate_profile(*user_ids):
+    """
+    프로필 조회 캐시를 무효화합니다.
+    """
+    invalidate(*[profile_key(user_id) for user_id in user_ids])
@@ -0,0 +1,44 @@
+"""
+응답 캐시(article/cache.py) 설정을 확인하는 system check입니다.
+"""
+
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from article.cache import is_cache_enabled, is_shared_cache
+
+
+@register(Tags.caches, deploy=True)
+def check_conditional_get(app_configs, **kwargs):
+    """
+    캐시 버전으로 만드는 상세/프로필 조회의 ETag는 다른 프로세스와 공유하는 캐시에서만 사용합니다.
+    """
+    if is_shared_cache():
+        return []
+    return [
+        Warning(
+            "응답 캐시가 프로세스마다 따로 저장되므로 게시글 상세와 프로필 조회에 ETag를 보내지 않습니다.",
+            hint=(
+                f"CACHES[{settings.RESPONSE_CACHE_ALIAS!r}]에 redis, memcached 등 "
+                "여러 프로세스가 공유하는 backend를 지정하세요. (CACHE_BACKEND)"
+            ),
+            id="article.W001",
+        )
+    ]
+
+
+@register(Tags.caches)
+def check_response_cache(app_configs, **kwargs):
+    """
+    프로세스마다 따로 저장하는 캐시는 무효화가 다른 worker에 반영되지 않으므로 worker가 여럿이면 사용하지 않습니다.
+    """
+    if is_cache_enabled():
+        return []
+    return [
+        Warning(
+            f"WEB_CONCURRENCY가 {settings.WEB_CONCURRENCY}이고 응답 캐시가 프로세스마다 따로 저장되므로 "
+            "게시글 상세와 프로필 조회 캐시를 사용하지 않습니다.",
+            hint="여러 프로세스가 공유하는 backend를 CACHE_BACKEND로 지정하세요.",
+            id="article.W002",
+        )
+    ]
@@ -0,0 +1,132 @@
+"""
+HTTP 조건부 GET(ETag/Last-Modified)을 위한 함수들입니다.
+view의 get_validators()가 캐시 버전이나 updated_at의 최댓값 같은 가벼운 값으로 (ETag, Last-Modified)를 만들면
+@conditional_get이 직렬화하기 전에 If-None-Match/If-Modified-Since를 확인하여 바뀌지 않았다면 304를 반환합니다.
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from functools import wraps
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from article.cache import get_version, is_shared_cache
+from article.serializers import get_user_article_status
+from article.streaming import get_stream_format
+
+
+def make_etag(*parts):
+    """
+    parts를 이어 붙인 문자열의 해시로 weak ETag를 만듭니다.
+    """
+    digest = hashlib.md5(":".join(map(str, parts)).encode()).hexdigest()
+    return "W/" + quote_etag(digest)
+
+
+def conditional_get(method):
+    """
+    get 메서드에 사용하는 decorator입니다.
+    view의 get_validators(request, *args, **kwargs)는 (etag, last_modified)를 반환해야 합니다.
+    last_modified는 None이거나 datetime이며, view의 exact_last_modified가 False라면
+    좋아요 수처럼 updated_at이 바뀌지 않는 변경이 있을 수 있으므로 If-Modified-Since는 확인하지 않고 헤더만 보냅니다.
+    목록의 is_liked처럼 유저마다 응답이 다르므로 ETag에는 유저 정보를 포함하고 Vary: Authorization을 붙입니다.
+    Accept 헤더로 스트리밍(article/streaming.py)을 요청할 수 있으므로 Vary: Accept도 함께 붙입니다.
+    etag가 None이면 조건부 요청을 확인하지 않고 validator 없이 응답합니다.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, *args, **kwargs)
+        if etag is None:
+            return method(self, request, *args, **kwargs)
+        stream_format = get_stream_format(request)
+        if stream_format:
+            # 같은 url이라도 Accept 헤더로 스트리밍을 요청하면 응답이 다릅니다.
+            etag = make_etag(etag, stream_format)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=(
+                timestamp if getattr(self, "exact_last_modified", False) else None
+            ),
+        )
+        if response is None:
+            response = method(self, request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+            patch_vary_headers(response, ("Authorization", "Accept"))
+        return response
+
+    return wrapper
+
+
+def version_validators(key, *parts):
+    """
+    응답 캐시(article/cache.py) key의 버전으로 (etag, last_modified)를 만듭니다. DB를 조회하지 않습니다.
+    버전은 만료되지 않으므로 다른 process가 새로 발급한 버전을 볼 수 없는 캐시(locmem 등)에서는
+    바뀐 뒤에도 304를 계속 반환하게 되어 validator를 만들지 않습니다.
+    """
+    if not is_shared_cache():
+        return None, None
+    version = get_version(key)
+    last_modified = datetime.fromtimestamp(version / 1e9, tz=timezone.utc)
+    return make_etag(*parts, version), last_modified
+
+
+class ArticleListValidatorsMixin:
+    """
+    게시글 목록 view(ListAPIView)에 사용하며, 응답할 페이지의 행으로 ETag를 만듭니다.
+    페이지의 게시글(수정 시각, 저장된 수, 작성자 이름), 전체 개수(또는 다음 페이지 여부), 좋아요/북마크 여부가
+    같으면 응답도 같으므로 DB에 저장된 값과 항상 일치하고, 다른 페이지의 게시글이 바뀌어도 ETag는 그대로입니다.
+    ETag를 만들며 읽은 페이지와 좋아요/북마크 여부는 200 응답의 직렬화에 그대로 사용하므로 쿼리가 늘지 않습니다.
+    스트리밍은 목록 전체를 읽어야 하므로 validator를 만들지 않습니다.
+    """
+
+    page_rows = None
+    article_status = None
+
+    def get_validators(self, request, *args, **kwargs):
+        if get_stream_format(request):
+            return None, None
+        queryset = self.filter_queryset(self.get_queryset())
+        self.page_rows = self.paginator.paginate_queryset(queryset, request, view=self)
+        self.article_status = get_user_article_status(
+            request, [article.id for article in self.page_rows]
+        )
+        liked_ids, bookmarked_ids = self.article_status
+        rows = [
+            (
+                article.id,
+                article.updated_at,
+                article.likes_count,
+                article.comment_count,
+                article.bookmark_count,
+                article.author.username,
+            )
+            for article in self.page_rows
+        ]
+        etag = make_etag(
+            request.get_full_path(),
+            self.paginator.get_page_state(),
+            rows,
+            sorted(liked_ids),
+            sorted(bookmarked_ids),
+        )
+        last_modified = max(
+            (article.updated_at for article in self.page_rows), default=None
+        )
+        return etag, last_modified
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.article_status is not None:
+            context["article_status"] = self.article_status
+        return context
+
+    def list(self, request, *args, **kwargs):
+        if self.page_rows is None:
+            return super().list(request, *args, **kwargs)
+        serializer = self.get_serializer(self.page_rows, many=True)
+        return self.get_paginated_response(serializer.data)
@@ -0,0 +1,53 @@
+"""
+Article에 저장해둔 likes_count, comment_count, bookmark_count와
+User에 저장해둔 followers_count, followings_count, articles_count를 다루는 함수들입니다.
+평소에는 view에서 F()로 갱신하고, 값이 어긋났을 때만 이곳의 함수로 M2M 테이블에서 다시 계산합니다.
+"""
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from article.models import Article, Comment
+from user.models import User
+
+
+def _count_subquery(model, fk_name):
+    """
+    fk_name으로 게시글(또는 유저)을 가리키는 model의 행 수를 행마다 세는 서브쿼리를 만듭니다.
+    """
+    counts = (
+        model.objects.filter(**{fk_name: OuterRef("pk")})
+        .order_by()
+        .values(fk_name)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def rebuild_article_counts(queryset=None):
+    """
+    likes/bookmarks through 테이블과 댓글 테이블을 기준으로 저장된 수를 다시 계산합니다.
+    UPDATE 한 번으로 처리하며 갱신된 게시글 수를 반환합니다.
+    """
+    if queryset is None:
+        queryset = Article.objects.all()
+    return queryset.update(
+        likes_count=_count_subquery(Article.likes.through, "article_id"),
+        bookmark_count=_count_subquery(Article.bookmarks.through, "article_id"),
+        comment_count=_count_subquery(Comment, "article_id"),
+    )
+
+
+def rebuild_user_counts(queryset=None):
+    """
+    followings through 테이블과 게시글 테이블을 기준으로 유저의 저장된 수를 다시 계산합니다.
+    UPDATE 한 번으로 처리하며 갱신된 유저 수를 반환합니다.
+    """
+    if queryset is None:
+        queryset = User.objects.all()
+    follow_model = User.followings.through
+    return queryset.update(
+        followers_count=_count_subquery(follow_model, "to_user_id"),
+        followings_count=_count_subquery(follow_model, "from_user_id"),
+        articles_count=_count_subquery(Article, "author_id"),
+    )
@@ -0,0 +1,233 @@
+"""
+팔로우한 유저의 게시글을 보여주는 피드를 미리 만들어두는(fan-out-on-write) 함수들입니다.
+게시글이 작성되면 작성자의 팔로워마다 FeedEntry를 저장하므로, 피드 조회는 FeedEntry 인덱스만 따라가면 됩니다.
+팔로워가 FEED_FANOUT_MAX_FOLLOWERS명보다 많은 유저는 게시글마다 너무 많은 행을 만들게 되므로
+저장하지 않고 피드를 조회할 때 작성자 기준으로 함께 가져옵니다(fan-out-on-read).
+한 번 fan-out-on-read가 된 유저는 팔로워가 다시 줄어도 그대로 두어(User.feed_fanout_on_read),
+그동안 저장하지 않은 게시글이 피드에서 사라지지 않도록 합니다.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.query_utils import Q
+from article.models import Article, FeedEntry
+from user.models import User
+
+BATCH_SIZE = 1000
+
+
+def get_fanout_limit():
+    return getattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 5000)
+
+
+def is_fanout_on_read(user):
+    """
+    팔로워가 많아 게시글을 피드에 미리 저장하지 않는 유저인지 확인합니다.
+    """
+    return user.feed_fanout_on_read or user.followers_count > get_fanout_limit()
+
+
+def fanout_on_read_q(prefix=""):
+    """
+    is_fanout_on_read의 queryset 조건입니다. prefix로 작성자 등의 관계를 따라갈 수 있습니다.
+    """
+    return Q(**{f"{prefix}feed_fanout_on_read": True}) | Q(
+        **{f"{prefix}followers_count__gt": get_fanout_limit()}
+    )
+
+
+def fanout_on_read_after(delta):
+    """
+    followers_count를 delta만큼 올리는 update에 함께 넣을 feed_fanout_on_read 값입니다.
+    팔로워가 FEED_FANOUT_MAX_FOLLOWERS명을 넘으면 fan-out-on-read로 바꾸며, 이후 팔로워가 줄어도 되돌리지 않습니다.
+    """
+    return Q(feed_fanout_on_read=True) | Q(
+        followers_count__gt=get_fanout_limit() - delta
+    )
+
+
+def _bulk_create_entries(entries):
+    """
+    (owner_id, article_id, created_at) 목록을 BATCH_SIZE씩 나누어 저장합니다.
+    이미 있는 항목은 무시합니다.
+    """
+    batch = []
+    for owner_id, article_id, created_at in entries:
+        batch.append(
+            FeedEntry(owner_id=owner_id, article_id=article_id, created_at=created_at)
+        )
+        if len(batch) >= BATCH_SIZE:
+            FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def fan_out_article(article):
+    """
+    새 게시글을 작성자의 팔로워들의 피드에 저장합니다.
+    팔로워가 많은 작성자라면 저장하지 않습니다.
+    """
+    if is_fanout_on_read(article.author):
+        return
+    follower_ids = article.author.followers.values_list("id", flat=True)
+    _bulk_create_entries(
+        (
+            (follower_id, article.id, article.created_at)
+            for follower_id in follower_ids.iterator()
+        ),
+    )
+
+
+def fan_out_articles(article_ids):
+    """
+    fan_out_article을 여러 게시글에 대해 한 번에 수행합니다. (article/transfer.py의 finish_import)
+    팔로워가 많은 작성자의 게시글은 저장된 followers_count와 feed_fanout_on_read로 걸러냅니다.
+    """
+    articles = (
+        Article.objects.filter(id__in=article_ids)
+        .exclude(fanout_on_read_q("author__"))
+        .values_list("id", "author_id", "created_at")
+    )
+    by_author = defaultdict(list)
+    for article_id, author_id, created_at in articles:
+        by_author[author_id].append((article_id, created_at))
+    if not by_author:
+        return
+    follows = User.followings.through.objects.filter(
+        to_user_id__in=by_author
+    ).values_list("from_user_id", "to_user_id")
+    _bulk_create_entries(
+        (
+            (follower_id, article_id, created_at)
+            for follower_id, author_id in follows.iterator()
+            for article_id, created_at in by_author[author_id]
+        ),
+    )
+
+
+def backfill_follow(user, author):
+    """
+    user가 author를 팔로우했을 때 author의 기존 게시글을 user의 피드에 채워 넣습니다.
+    """
+    if is_fanout_on_read(author):
+        return
+    articles = Article.objects.filter(author=author).values_list("id", "created_at")
+    _bulk_create_entries(
+        (
+            (user.id, article_id, created_at)
+            for article_id, created_at in articles.iterator()
+        ),
+    )
+
+
+def prune_follow(user, author):
+    """
+    user가 author를 언팔로우했을 때 user의 피드에서 author의 게시글을 지웁니다.
+    """
+    FeedEntry.objects.filter(owner_id=user.id, article__author_id=author.id).delete()
+
+
+def backfill_follows(user_id, author_ids):
+    """
+    backfill_follow를 여러 작성자에 대해 한 번에 수행합니다. (article/relations.py의 apply_batch)
+    팔로워가 많은 작성자는 저장된 followers_count와 feed_fanout_on_read로 걸러냅니다.
+    """
+    authors = (
+        User.objects.filter(id__in=author_ids).exclude(fanout_on_read_q()).values("id")
+    )
+    articles = Article.objects.filter(author_id__in=authors).values_list(
+        "id", "created_at"
+    )
+    _bulk_create_entries(
+        (
+            (user_id, article_id, created_at)
+            for article_id, created_at in articles.iterator()
+        ),
+    )
+
+
+def prune_follows(user_id, author_ids):
+    """
+    prune_follow를 여러 작성자에 대해 한 번에 수행합니다.
+    """
+    FeedEntry.objects.filter(
+        owner_id=user_id, article__author_id__in=author_ids
+    ).delete()
+
+
+def _fanout_on_read_followings(user):
+    following_ids = User.followings.through.objects.filter(from_user_id=user.id).values(
+        "to_user_id"
+    )
+    return User.objects.filter(fanout_on_read_q(), id__in=following_ids).values_list(
+        "id", flat=True
+    )
+
+
+def feed_queryset(user):
+    """
+    user의 피드 queryset을 최신순으로 정렬하여 반환합니다.
+    팔로워가 많은 유저를 팔로우하지 않았다면 FeedEntry queryset을 반환하여 feed_owner_created_idx만 따라가고,
+    (article/paginations.py의 FeedPagination이 페이지의 FeedEntry를 게시글로 바꿉니다.)
+    팔로우했다면 그 유저들의 게시글을 작성자 기준으로 함께 가져오는 Article queryset을 반환합니다.
+    """
+    return _feed(user, list(_fanout_on_read_followings(user)))
+
+
+async def afeed_queryset(user):
+    """
+    feed_queryset의 async 버전입니다.
+    """
+    followings = _fanout_on_read_followings(user)
+    return _feed(user, [user_id async for user_id in followings])
+
+
+def _feed(user, fanout_on_read_ids):
+    if not fanout_on_read_ids:
+        return (
+            FeedEntry.objects.filter(owner=user.id)
+            .select_related("article__author")
+            .defer("article__content")
+            .order_by("-created_at", "-article_id")
+        )
+    stored = FeedEntry.objects.filter(owner=user.id).values("article_id")
+    return (
+        Article.objects.for_listing()
+        .filter(Q(id__in=stored) | Q(author_id__in=fanout_on_read_ids))
+        .order_by("-created_at", "-id")
+    )
+
+
+def rebuild_feed_entries():
+    """
+    팔로우 관계와 게시글을 기준으로 모든 FeedEntry를 다시 만듭니다.
+    fan-out-on-read 여부도 현재 FEED_FANOUT_MAX_FOLLOWERS와 팔로워 수로 다시 정합니다.
+    """
+    limit = get_fanout_limit()
+
+    FeedEntry.objects.all().delete()
+    User.objects.update(feed_fanout_on_read=Q(followers_count__gt=limit))
+    authors = (
+        User.objects.annotate(followers_num=Count("followers"))
+        .filter(
+            followers_num__gt=0, followers_num__lte=limit, feed_fanout_on_read=False
+        )
+        .values_list("id", flat=True)
+    )
+    for author_id in authors.iterator():
+        follower_ids = list(
+            User.objects.filter(followings=author_id).values_list("id", flat=True)
+        )
+        articles = Article.objects.filter(author_id=author_id).values_list(
+            "id", "created_at"
+        )
+        _bulk_create_entries(
+            (
+                (follower_id, article_id, created_at)
+                for article_id, created_at in articles.iterator()
+                for follower_id in follower_ids
+            ),
+        )
@@ -0,0 +1,70 @@
+import sys
+import time
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand, CommandError
+
+from article.transfer import (
+    DEFAULT_BATCH_SIZE,
+    FORMATS,
+    MODELS,
+    ImportRowError,
+    decode_rows,
+    guess_format,
+    import_rows,
+)
+
+
+class Command(BaseCommand):
+    """
+    JSONL/CSV 파일의 게시글 또는 댓글을 batch_size개씩 bulk_create로 가져옵니다.
+    작성자는 username으로 찾으며, 없는 작성자의 행은 건너뜁니다.
+    잘못된 행이 있으면 그 줄 번호를 알려주고 아무것도 저장하지 않습니다.
+    batch마다 가져온 행의 저장된 수, 피드, 검색 인덱스를 함께 갱신합니다. (--no-rebuild로 생략)
+    ex) python manage.py import_articles article articles.jsonl --batch-size 5000
+        python manage.py import_articles comment comments.csv
+    """
+
+    help = "JSONL 또는 CSV의 게시글/댓글을 가져옵니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(MODELS))
+        parser.add_argument("path", help="읽을 파일 경로 (-이면 표준 입력)")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="생략하면 파일 확장자로 정합니다. (기본값 jsonl)",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument(
+            "--no-rebuild",
+            action="store_true",
+            help="저장된 수/피드/검색 인덱스를 갱신하지 않습니다.",
+        )
+
+    def handle(self, *args, **options):
+        kind, path = options["kind"], options["path"]
+        fmt = options["format"] or guess_format(path)
+
+        started = time.perf_counter()
+        if path == "-":
+            source = nullcontext(sys.stdin)
+        else:
+            source = open(path, encoding="utf-8", newline="")
+        with source as lines:
+            try:
+                created, skipped = import_rows(
+                    kind,
+                    decode_rows(lines, fmt),
+                    options["batch_size"],
+                    finish=not options["no_rebuild"],
+                )
+            except ImportRowError as error:
+                raise CommandError(f"{error} 아무것도 가져오지 않았습니다.")
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{created}개의 행을 {elapsed:.1f}초 동안 가져왔습니다. "
+                f"({created / elapsed:.0f} rows/sec, 건너뜀 {skipped}개)"
+            )
+        )
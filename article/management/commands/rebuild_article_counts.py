@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from article.counters import rebuild_article_counts
+from article.models import Article
+
+
+class Command(BaseCommand):
+    """
+    저장된 좋아요/댓글/북마크 수를 M2M 테이블 기준으로 다시 계산합니다.
+    ex) python manage.py rebuild_article_counts
+        python manage.py rebuild_article_counts --article 1 --article 2
+    """
+
+    help = "Article의 likes_count, comment_count, bookmark_count를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--article",
+            action="append",
+            type=int,
+            dest="article_ids",
+            help="다시 계산할 게시글 id (여러 번 지정 가능, 생략 시 전체)",
+        )
+
+    def handle(self, *args, **options):
+        queryset = Article.objects.all()
+        if options["article_ids"]:
+            queryset = queryset.filter(id__in=options["article_ids"])
+        updated = rebuild_article_counts(queryset)
+        self.stdout.write(
+            self.style.SUCCESS(f"{updated}개의 게시글을 다시 계산했습니다.")
+        )
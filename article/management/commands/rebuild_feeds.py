@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from article.feeds import rebuild_feed_entries
+from article.models import FeedEntry
+
+
+class Command(BaseCommand):
+    """
+    팔로우 관계와 게시글을 기준으로 모든 유저의 피드(FeedEntry)를 다시 만듭니다.
+    FEED_FANOUT_MAX_FOLLOWERS를 바꾼 뒤나 피드가 어긋났을 때 사용합니다.
+    ex) python manage.py rebuild_feeds
+    """
+
+    help = "팔로우 관계를 기준으로 FeedEntry를 다시 만듭니다."
+
+    def handle(self, *args, **options):
+        rebuild_feed_entries()
+        count = FeedEntry.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"{count}개의 피드 항목을 만들었습니다."))
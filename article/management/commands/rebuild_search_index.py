@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from article.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    모든 게시글로 검색 인덱스를 다시 만듭니다.
+    bulk_create처럼 signal을 보내지 않는 방법으로 게시글을 넣은 뒤에 사용합니다.
+    ex) python manage.py rebuild_search_index
+    """
+
+    help = "게시글 검색 인덱스를 다시 만듭니다."
+
+    def handle(self, *args, **options):
+        get_search_backend().rebuild()
+        self.stdout.write(self.style.SUCCESS("검색 인덱스를 다시 만들었습니다."))
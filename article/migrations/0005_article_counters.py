@@ -0,0 +1,55 @@
+# Generated by Django 4.2.1 on 2026-10-18 09:55
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, fk_name):
+    counts = (
+        model.objects.filter(**{fk_name: OuterRef("pk")})
+        .order_by()
+        .values(fk_name)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def fill_counts(apps, schema_editor):
+    """
+    이후 바뀌는 article/counters.py에 영향을 받지 않도록 이 시점의 모델로 저장된 수를 계산합니다.
+    """
+    Article = apps.get_model("article", "Article")
+    Comment = apps.get_model("article", "Comment")
+    Article.objects.update(
+        likes_count=count_subquery(Article.likes.through, "article_id"),
+        bookmark_count=count_subquery(Article.bookmarks.through, "article_id"),
+        comment_count=count_subquery(Comment, "article_id"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0004_alter_comment_article"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="bookmark_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="article",
+            name="likes_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 4.2.1 on 2026-10-18 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def fill_feed_entries(apps, schema_editor):
+    """
+    팔로워가 FEED_FANOUT_MAX_FOLLOWERS명 이하인 작성자의 게시글을 팔로워들의 피드에 저장합니다.
+    이후 바뀌는 article/feeds.py에 영향을 받지 않도록 이 시점의 모델만 사용합니다.
+    """
+    Article = apps.get_model("article", "Article")
+    FeedEntry = apps.get_model("article", "FeedEntry")
+    User = apps.get_model("user", "User")
+    limit = getattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 5000)
+
+    authors = (
+        User.objects.annotate(followers_num=Count("followers"))
+        .filter(followers_num__gt=0, followers_num__lte=limit)
+        .values_list("id", flat=True)
+    )
+    for author_id in authors.iterator():
+        follower_ids = list(
+            User.objects.filter(followings=author_id).values_list("id", flat=True)
+        )
+        articles = Article.objects.filter(author_id=author_id).values_list(
+            "id", "created_at"
+        )
+        batch = []
+        for article_id, created_at in articles.iterator():
+            for follower_id in follower_ids:
+                batch.append(
+                    FeedEntry(
+                        owner_id=follower_id,
+                        article_id=article_id,
+                        created_at=created_at,
+                    )
+                )
+            if len(batch) >= BATCH_SIZE:
+                FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        if batch:
+            FeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("article", "0006_article_created_id_idx"),
+        ("user", "0004_delete_userbookmark"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                (
+                    "article",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="feed_entries",
+                        to="article.article",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="feed_entries",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["owner", "-created_at", "-article"],
+                        name="feed_owner_created_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="feedentry",
+            constraint=models.UniqueConstraint(
+                fields=("owner", "article"), name="unique_feed_entry"
+            ),
+        ),
+        migrations.RunPython(fill_feed_entries, migrations.RunPython.noop),
+    ]
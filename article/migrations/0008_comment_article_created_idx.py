@@ -0,0 +1,20 @@
+# Generated by Django 4.2.1 on 2026-10-18 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0007_feedentry"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["article", "created_at", "id"],
+                name="comment_article_created_idx",
+            ),
+        ),
+    ]
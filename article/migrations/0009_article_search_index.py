@@ -0,0 +1,45 @@
+from django.db import migrations
+
+# 이후 바뀌는 article/search.py에 영향을 받지 않도록 이 시점의 이름과 식을 그대로 둡니다.
+FTS_TABLE = "article_fts"
+VECTOR = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))"
+
+
+def create_search_index(apps, schema_editor):
+    """
+    SQLite는 FTS5 가상 테이블을 만들고 기존 게시글을 채웁니다.
+    PostgreSQL은 PostgresSearchBackend가 검색하는 식과 같은 GIN 인덱스를 만듭니다.
+    """
+    table = apps.get_model("article", "Article")._meta.db_table
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"title, content, tokenize='unicode61', prefix='2 3')"
+        )
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content)"
+            f" SELECT id, title, content FROM {table}"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            f"CREATE INDEX article_search_idx ON {table} USING GIN ({VECTOR})"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP INDEX IF EXISTS article_search_idx")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("article", "0008_comment_article_created_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
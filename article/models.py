@@ -4,6 +4,16 @@ from user.models import User
 # Create your models here.
 
 
+class ArticleQuerySet(models.QuerySet):
+    def for_listing(self):
+        """
+        게시글 목록에서 사용하는 queryset입니다.
+        작성자를 join하여 가져오므로 author/author_id를 출력할 때 추가 쿼리가 발생하지 않습니다.
+        좋아요/댓글 수는 Article에 저장된 값을 사용하며, 목록에서 쓰지 않는 content는 불러오지 않습니다.
+        """
+        return self.select_related("author").defer("content")
+
+
 class Article(models.Model):
     """
     Article 모델입니다,
@@ -11,6 +21,8 @@ class Article(models.Model):
     유저가 작성한 게시글은 남게 됩니다. 그렇기에 db에서 유저 정보가 삭제되는 상황에서 함께 삭제되도록 변경하였습니다.
     title(게시글제목),content(게시글내용),created_at(게시글생성일),updated_at(게시글수정일), likes (좋아요)
     필드로 구성되어있습니다.
+    likes_count, comment_count, bookmark_count는 목록 조회 시 매번 count 쿼리를 하지 않도록 저장해두는 값입니다.
+    좋아요/북마크/댓글이 바뀔 때 F()로 갱신되며, 어긋난 경우 rebuild_article_counts 명령어로 다시 계산할 수 있습니다.
     """
 
     author = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -24,6 +36,18 @@ class Article(models.Model):
     likes = models.ManyToManyField(User, related_name="like_articles")
     bookmarks = models.ManyToManyField(User, related_name="bookmarked_articles")
 
+    likes_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    bookmark_count = models.PositiveIntegerField(default=0)
+
+    objects = ArticleQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # 목록의 최신순 정렬과 cursor pagination이 사용하는 인덱스
+            models.Index(fields=["-created_at", "-id"], name="article_created_id_idx"),
+        ]
+
 
       
     def __str__(self):
@@ -35,15 +59,48 @@ class Comment(models.Model):
     content = models.TextField(max_length=50)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-    
- 
+
+    class Meta:
+        indexes = [
+            # 게시글별 댓글 목록의 작성순 정렬과 cursor pagination이 사용하는 인덱스
+            models.Index(
+                fields=["article", "created_at", "id"],
+                name="comment_article_created_idx",
+            ),
+        ]
+
     def __str__(self):
        return str(self.content)
 #def()파이썬에서 함수 또는 메소드를 정의하기 위해 사용디는 키워드
 #'return self.comment'는 'self.comment' 값을 문자열로 변환하고
 #변환된 문자열을 변환하는 구몬     
 
-    
 
+class FeedEntry(models.Model):
+    """
+    피드에 보여줄 게시글을 유저(owner)마다 미리 저장해두는 모델입니다.
+    게시글 작성 시 작성자의 팔로워마다 한 행씩 저장되며(article/feeds.py), 게시글이 삭제되면 함께 삭제됩니다.
+    created_at은 게시글의 created_at을 복사해두어 owner별 최신순 조회를 인덱스만으로 처리합니다.
+    """
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="feed_entries")
+    article = models.ForeignKey(
+        Article, on_delete=models.CASCADE, related_name="feed_entries"
+    )
+    created_at = models.DateTimeField()
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "article"], name="unique_feed_entry"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["owner", "-created_at", "-article"],
+                name="feed_owner_created_idx",
+            ),
+        ]
 
+    def __str__(self):
+        return f"{self.owner_id}:{self.article_id}"
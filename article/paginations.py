@@ -1,10 +1,203 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+import math
+from collections import OrderedDict
+from django.core.paginator import InvalidPage
+from django.db.models.query_utils import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from article.models import FeedEntry
 
 """
 pagination을 커스텀 하거나, 필요한 곳에 지정하여 사용할 수 있습니다.
 """
 
 
+def encode_cursor(values):
+    """
+    정렬 기준 값들(ex. created_at, id)을 url에 넣을 수 있는 문자열로 바꿉니다.
+    datetime은 마이크로초까지 보존하기 위해 isoformat을 그대로 사용합니다.
+    """
+    values = [v.isoformat() if hasattr(v, "isoformat") else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+# SQLite 등의 정수 컬럼에 넣을 수 있는 범위입니다. 벗어난 값은 DB에서 OverflowError가 발생합니다.
+MAX_CURSOR_INT = 2**63 - 1
+
+
+def parse_cursor_datetime(value):
+    parsed = parse_datetime(value) if isinstance(value, str) else None
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+def parse_cursor_int(value):
+    if type(value) is not int or abs(value) > MAX_CURSOR_INT:
+        raise ValueError(value)
+    return value
+
+
+def parse_cursor_float(value):
+    if type(value) not in (int, float) or not math.isfinite(value):
+        raise ValueError(value)
+    return float(value)
+
+
+def decode_cursor(cursor, parsers):
+    """
+    encode_cursor로 만든 문자열을 다시 값 목록으로 바꿉니다.
+    parsers는 값마다 형식을 검사하고 변환하는 함수입니다. (ex. parse_cursor_datetime, parse_cursor_int)
+    형식이 맞지 않으면 쿼리에서 500이 발생하지 않도록 404를 발생시킵니다.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError(values)
+        return [parse(value) for parse, value in zip(parsers, values)]
+    except (TypeError, ValueError):
+        raise NotFound("유효하지 않은 cursor입니다.")
+
+
+class KeysetPagination(BasePagination):
+    """
+    OFFSET 대신 마지막으로 본 행의 정렬 값(cursor)보다 뒤에 있는 행만 가져오는 pagination입니다.
+    COUNT(*)와 OFFSET을 사용하지 않기 때문에 몇 번째 페이지든 인덱스를 따라 page_size개만 읽습니다.
+    ordering의 마지막 필드는 id처럼 유일한 값이어야 같은 시간에 작성된 행이 빠지거나 중복되지 않습니다.
+    다음 페이지로만 이동할 수 있으며, 응답의 next에 다음 페이지 url이 담깁니다.
+    """
+
+    page_size = 10
+    cursor_query_param = "cursor"
+    ordering = ("-created_at", "-id")
+    # ordering의 필드마다 cursor 값을 검사하는 함수입니다.
+    cursor_parsers = (parse_cursor_datetime, parse_cursor_int)
+
+    def get_ordering(self, request):
+        return self.ordering
+
+    def get_page_size(self, request):
+        return self.page_size
+
+    def get_fields(self):
+        return [field.lstrip("-") for field in self.ordering]
+
+    def get_position_filter(self, values):
+        """
+        (a, b) 정렬에서 cursor 뒤에 오는 행 조건
+        a <= a0 AND (a < a0 OR (a = a0 AND b < b0)) 를 만듭니다. (내림차순 기준, 오름차순은 >)
+        앞의 a <= a0 조건이 있어야 DB가 OR 조건에서도 인덱스 범위 탐색을 사용합니다.
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+        first = self.ordering[0]
+        lookup = "lte" if first.startswith("-") else "gte"
+        return Q(**{f"{first.lstrip('-')}__{lookup}": values[0]}) & condition
+
+    def get_page_queryset(self, queryset, request):
+        """
+        다음 페이지가 있는지 알 수 있도록 page_size + 1개를 읽는 queryset을 반환합니다.
+        """
+        self.request = request
+        self.ordering = self.get_ordering(request)
+        self.current_page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*self.ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = decode_cursor(cursor, self.cursor_parsers)
+            queryset = queryset.filter(self.get_position_filter(values))
+        return queryset[: self.current_page_size + 1]
+
+    def set_page(self, rows):
+        self.has_next = len(rows) > self.current_page_size
+        self.page = rows[: self.current_page_size]
+        return self.page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset의 async 버전입니다.
+        """
+        rows = self.get_page_queryset(queryset, request)
+        return self.set_page([row async for row in rows])
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        cursor = encode_cursor([getattr(last, name) for name in self.get_fields()])
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "properties": {
+                "next": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+
+class ArticleCursorPagination(KeysetPagination):
+    """
+    게시글 목록을 (created_at, id) 역순으로 나누는 cursor pagination입니다.
+    Article의 article_created_id_idx 인덱스를 그대로 따라갑니다.
+    """
+
+    page_size = 10
+    ordering = ("-created_at", "-id")
+
+
+class CommentPagination(KeysetPagination):
+    """
+    댓글 목록을 (created_at, id) 순서, 즉 오래된 댓글부터 나누는 cursor pagination입니다.
+    Comment의 comment_article_created_idx 인덱스를 따라갑니다.
+    newest param을 주면 최신 댓글부터 newest개씩 보여줍니다. (게시글 목록의 댓글 미리보기용)
+    ex)http://127.0.0.1:8000/article/1/comment/?newest=3
+    """
+
+    page_size = 20
+    max_page_size = 100
+    ordering = ("created_at", "id")
+    newest_query_param = "newest"
+
+    def get_ordering(self, request):
+        if self.newest_query_param in request.query_params:
+            return ("-created_at", "-id")
+        return self.ordering
+
+    def get_page_size(self, request):
+        newest = request.query_params.get(self.newest_query_param)
+        if newest is None:
+            return self.page_size
+        try:
+            return min(max(int(newest), 1), self.max_page_size)
+        except ValueError:
+            return self.page_size
+
+
 class ArticlePagination(PageNumberPagination):
     """
     page_size는 한 페이지에 몇 개의 게시글을 담을지 결정합니다.
@@ -13,8 +206,95 @@ class ArticlePagination(PageNumberPagination):
     여기서 param을 "mypage"라고 지정한다면
     http://127.0.0.1:8000/article/?mypage=2 라고 사용해야합니다.
     max_page_size는 최대 페이지 수를 결정합니다.
+
+    cursor param이 있으면 ArticleCursorPagination으로 동작합니다.
+    ex)http://127.0.0.1:8000/article/?cursor= 로 첫 페이지를 받고, 응답의 next url로 다음 페이지를 받습니다.
+    cursor param이 없는 기존 클라이언트는 그대로 페이지 번호를 사용합니다.
     """
 
     page_size = 10
     page_query_param = "page"
     max_page_size = 100
+    cursor_pagination_class = ArticleCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_pagination = None
+        if self.cursor_pagination_class.cursor_query_param in request.query_params:
+            self.cursor_pagination = self.cursor_pagination_class()
+            return self.cursor_pagination.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset의 async 버전입니다.
+        Paginator는 count를 동기로 조회하므로 acount()로 미리 세어 넣어두고 페이지의 행만 async로 읽습니다.
+        """
+        self.cursor_pagination = None
+        if self.cursor_pagination_class.cursor_query_param in request.query_params:
+            self.cursor_pagination = self.cursor_pagination_class()
+            return await self.cursor_pagination.apaginate_queryset(
+                queryset, request, view
+            )
+
+        self.request = request
+        paginator = self.django_paginator_class(queryset, self.get_page_size(request))
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        self.page.object_list = [row async for row in self.page.object_list]
+        return self.page.object_list
+
+    def get_paginated_response(self, data):
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_page_state(self):
+        """
+        페이지의 행 외에 응답에 들어가는 값입니다. (페이지 번호면 전체 개수, cursor면 다음 페이지 여부)
+        """
+        if self.cursor_pagination is not None:
+            return self.cursor_pagination.has_next
+        return self.page.paginator.count
+
+
+class FeedEntryCursorPagination(KeysetPagination):
+    """
+    FeedEntry로 만든 피드를 (created_at, article_id) 역순으로 나누는 cursor pagination입니다.
+    FeedEntry의 feed_owner_created_idx 인덱스를 그대로 따라가며, cursor 값은 게시글의 (created_at, id)와 같습니다.
+    """
+
+    page_size = 10
+    ordering = ("-created_at", "-article_id")
+
+
+class FeedPagination(ArticlePagination):
+    """
+    피드(article/feeds.py의 feed_queryset)를 나누는 pagination입니다.
+    FeedEntry queryset이면 FeedEntryCursorPagination으로 나누고 페이지의 FeedEntry를 게시글로 바꿔 반환합니다.
+    두 cursor의 값이 같으므로 피드가 Article queryset으로 바뀌어도(fan-out-on-read) 받은 cursor를 이어서 사용할 수 있습니다.
+    """
+
+    def use_entries(self, queryset):
+        entries = queryset.model is FeedEntry
+        self.cursor_pagination_class = (
+            FeedEntryCursorPagination if entries else ArticleCursorPagination
+        )
+        return entries
+
+    def paginate_queryset(self, queryset, request, view=None):
+        entries = self.use_entries(queryset)
+        page = super().paginate_queryset(queryset, request, view)
+        return [entry.article for entry in page] if entries else page
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        entries = self.use_entries(queryset)
+        page = await super().apaginate_queryset(queryset, request, view)
+        return [entry.article for entry in page] if entries else page
@@ -18,4 +18,4 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
             return True
 
         # Instance must have an attribute named `owner`.
-        return obj.author == request.user
+        return obj.author_id == request.user.id
@@ -0,0 +1,247 @@
+"""
+좋아요/북마크/팔로우처럼 M2M through 테이블의 행 하나를 추가/삭제하는 함수들입니다.
+관계 전체를 불러와 확인하지 않고, 인덱스가 있는 (source, target) 행 하나만 삭제/추가합니다.
+through 테이블의 unique 제약 덕분에 같은 요청이 동시에 들어와도 행이 중복되지 않으며,
+실제로 행이 바뀐 경우에만 저장된 수(likes_count, followers_count 등), 피드, 조회 캐시를 갱신합니다.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from article.cache import invalidate_article_detail, invalidate_profile
+from article.feeds import (
+    backfill_follow,
+    backfill_follows,
+    fanout_on_read_after,
+    prune_follow,
+    prune_follows,
+)
+from article.models import Article
+from user.models import User
+from DRF_Community_WebSite_Project.transactions import write_atomic
+
+
+def apply_membership(through, lookup, state=None):
+    """
+    through 테이블에서 lookup에 해당하는 행이 state가 되도록 만듭니다.
+    state가 None이면 현재 상태를 뒤집습니다(토글).
+    (적용 후 상태, 실제로 바뀌었는지)를 반환합니다.
+    """
+    if state is not True:
+        deleted, _ = through.objects.filter(**lookup).delete()
+        if deleted:
+            return False, True
+        if state is False:
+            return False, False
+    try:
+        with transaction.atomic():
+            through.objects.create(**lookup)
+    except IntegrityError:
+        # 동시에 들어온 다른 요청이 먼저 추가한 경우입니다.
+        return True, False
+    return True, True
+
+
+def _update_count(article_id, field, added):
+    delta = 1 if added else -1
+    Article.objects.filter(id=article_id).update(**{field: F(field) + delta})
+
+
+def set_like(article_id, user_id, state=None):
+    """
+    게시글 좋아요를 state로 만들고(None이면 토글) likes_count를 함께 갱신합니다.
+    적용 후 좋아요 상태를 반환합니다.
+    """
+    with write_atomic():
+        liked, changed = apply_membership(
+            Article.likes.through,
+            {"article_id": article_id, "user_id": user_id},
+            state,
+        )
+        if changed:
+            _update_count(article_id, "likes_count", liked)
+            invalidate_article_detail(article_id)
+    return liked
+
+
+def set_bookmark(article_id, user_id, state=None):
+    """
+    게시글 북마크를 state로 만들고(None이면 토글) bookmark_count를 함께 갱신합니다.
+    적용 후 북마크 상태를 반환합니다.
+    """
+    with write_atomic():
+        bookmarked, changed = apply_membership(
+            Article.bookmarks.through,
+            {"article_id": article_id, "user_id": user_id},
+            state,
+        )
+        if changed:
+            _update_count(article_id, "bookmark_count", bookmarked)
+            invalidate_article_detail(article_id)
+    return bookmarked
+
+
+def set_follow(user, the_user, state=None):
+    """
+    user가 the_user를 팔로우하는 상태를 state로 만들고(None이면 토글) 팔로워/팔로잉 수와 피드를 함께 갱신합니다.
+    적용 후 팔로우 상태를 반환합니다.
+    """
+    with write_atomic():
+        following, changed = apply_membership(
+            User.followings.through,
+            {"from_user_id": user.id, "to_user_id": the_user.id},
+            state,
+        )
+        if changed:
+            delta = 1 if following else -1
+            User.objects.filter(id=user.id).update(
+                followings_count=F("followings_count") + delta
+            )
+            User.objects.filter(id=the_user.id).update(
+                followers_count=F("followers_count") + delta,
+                feed_fanout_on_read=fanout_on_read_after(delta),
+            )
+            # 피드 갱신 시 fan-out 여부를 갱신된 팔로워 수로 판단합니다.
+            the_user.refresh_from_db(fields=["followers_count", "feed_fanout_on_read"])
+            invalidate_profile(user.id, the_user.id)
+        if changed and following:
+            backfill_follow(user, the_user)
+        elif changed:
+            prune_follow(user, the_user)
+    return following
+
+
+# action: (through 테이블, 요청한 유저 컬럼, 대상 컬럼)
+BATCH_RELATIONS = {
+    "like": (Article.likes.through, "user_id", "article_id"),
+    "bookmark": (Article.bookmarks.through, "user_id", "article_id"),
+    "follow": (User.followings.through, "from_user_id", "to_user_id"),
+}
+
+
+def _find_batch_errors(user_id, keys):
+    """
+    (action, target_id) 중 적용할 수 없는 것의 실패 이유를 반환합니다.
+    게시글과 유저의 존재 여부를 각각 쿼리 한 번으로 확인합니다.
+    """
+    article_ids = {target_id for action, target_id in keys if action != "follow"}
+    user_ids = {target_id for action, target_id in keys if action == "follow"}
+    articles = set(
+        Article.objects.filter(id__in=article_ids).values_list("id", flat=True)
+        if article_ids
+        else ()
+    )
+    users = set(
+        User.objects.filter(id__in=user_ids).values_list("id", flat=True)
+        if user_ids
+        else ()
+    )
+
+    errors = {}
+    for action, target_id in keys:
+        if target_id not in (users if action == "follow" else articles):
+            errors[action, target_id] = "not_found"
+        elif action == "follow" and target_id == user_id:
+            errors[action, target_id] = "self_follow"
+    return errors
+
+
+def _insert_rows(through, source, user_id, target, target_ids):
+    """
+    target_ids 대상의 행을 한 번에 추가하고 실제로 추가한 대상 목록을 반환합니다.
+    동시에 들어온 다른 요청이 먼저 추가한 행이 있다면 행마다 다시 시도하여 그 대상은 제외합니다.
+    """
+    try:
+        with transaction.atomic():
+            through.objects.bulk_create(
+                [through(**{source: user_id, target: t}) for t in target_ids]
+            )
+        return target_ids
+    except IntegrityError:
+        return [
+            t
+            for t in target_ids
+            if apply_membership(through, {source: user_id, target: t}, True)[1]
+        ]
+
+
+def _update_counts(model, field, added, removed):
+    """
+    added 대상의 field를 1 올리고 removed 대상의 field를 1 내립니다.
+    """
+    for target_ids, delta in ((added, 1), (removed, -1)):
+        if target_ids:
+            model.objects.filter(id__in=target_ids).update(**{field: F(field) + delta})
+
+
+def apply_batch(user_id, operations):
+    """
+    [{"action", "target_id", "desired_state"}] 목록을 한 트랜잭션 안에서 적용하고 항목마다 결과를 반환합니다.
+    같은 대상에 대한 작업이 여러 번 있다면 마지막 desired_state를 따릅니다.
+    action마다 현재 상태를 한 번에 조회(select_for_update)한 뒤 bulk_create와 IN 조건 삭제로 바꾸고,
+    저장된 수는 토글과 같이 실제로 추가/삭제한 대상만 F()로 1씩 올리거나 내리므로
+    작업 수와 관계없이 쿼리 수가 일정하며, 동시에 들어온 다른 요청과 겹쳐도 수가 어긋나지 않습니다.
+    """
+    desired = {}
+    for operation in operations:
+        desired[operation["action"], operation["target_id"]] = operation[
+            "desired_state"
+        ]
+    errors = _find_batch_errors(user_id, desired)
+
+    changed = set()
+    deltas = {}
+    with write_atomic():
+        for action, (through, source, target) in BATCH_RELATIONS.items():
+            wanted = {
+                target_id: state
+                for (kind, target_id), state in desired.items()
+                if kind == action and (kind, target_id) not in errors
+            }
+            if not wanted:
+                continue
+            rows = through.objects.filter(**{source: user_id, f"{target}__in": wanted})
+            # 지울 행을 잠가 동시에 들어온 요청이 먼저 지운 행을 한 번 더 세지 않도록 합니다.
+            current = set(rows.select_for_update().values_list(target, flat=True))
+            added = [t for t, state in wanted.items() if state and t not in current]
+            removed = [t for t, state in wanted.items() if not state and t in current]
+            if added:
+                added = _insert_rows(through, source, user_id, target, added)
+            if removed:
+                rows.filter(**{f"{target}__in": removed}).delete()
+            deltas[action] = (added, removed)
+            changed.update((action, t) for t in added + removed)
+
+        for action, field in (("like", "likes_count"), ("bookmark", "bookmark_count")):
+            _update_counts(Article, field, *deltas.get(action, ((), ())))
+        article_ids = {t for action, t in changed if action != "follow"}
+        if article_ids:
+            invalidate_article_detail(*article_ids)
+
+        followed, unfollowed = deltas.get("follow", ((), ()))
+        if followed or unfollowed:
+            User.objects.filter(id=user_id).update(
+                followings_count=F("followings_count") + len(followed) - len(unfollowed)
+            )
+            _update_counts(User, "followers_count", (), unfollowed)
+            if followed:
+                User.objects.filter(id__in=followed).update(
+                    followers_count=F("followers_count") + 1,
+                    feed_fanout_on_read=fanout_on_read_after(1),
+                )
+            invalidate_profile(user_id, *followed, *unfollowed)
+            if followed:
+                backfill_follows(user_id, followed)
+            if unfollowed:
+                prune_follows(user_id, unfollowed)
+
+    results = []
+    for operation in operations:
+        key = (operation["action"], operation["target_id"])
+        result = {"action": key[0], "target_id": key[1]}
+        if key in errors:
+            result["error"] = errors[key]
+        else:
+            result["state"] = desired[key]
+            result["changed"] = key in changed
+        results.append(result)
+    return results
@@ -0,0 +1,181 @@
+"""
+게시글 검색 backend입니다.
+SQLite에서는 FTS5 가상 테이블(article_fts), PostgreSQL에서는 tsvector GIN 인덱스를 사용하며
+ARTICLE_SEARCH_BACKEND에 클래스 경로를 지정하면 다른 backend로 바꿀 수 있습니다. (비워두면 DB에 맞게 선택)
+모든 backend는 (article_id, score) 목록을 score가 작은 순(관련도가 높은 순), 같은 score면 id 순으로 반환하며
+마지막으로 받은 (article_id, score)를 after로 넘기면 그 다음 결과부터 반환합니다. (cursor pagination)
+"""
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.query_utils import Q
+from django.utils.module_loading import import_string
+from article.models import Article
+
+FTS_TABLE = "article_fts"
+
+
+class SearchBackend:
+    def search(self, query, after=None, limit=10):
+        raise NotImplementedError
+
+    def index(self, article):
+        """
+        게시글이 저장될 때 호출됩니다.
+        """
+
+    def index_many(self, article_ids):
+        """
+        bulk_create 등으로 signal 없이 저장된 게시글들을 인덱스에 반영합니다.
+        """
+        articles = Article.objects.filter(id__in=article_ids).only("title", "content")
+        for article in articles.iterator():
+            self.index(article)
+
+    def remove(self, article_id):
+        """
+        게시글이 삭제될 때 호출됩니다.
+        """
+
+    def rebuild(self):
+        """
+        모든 게시글로 인덱스를 다시 만듭니다.
+        """
+
+
+class IcontainsSearchBackend(SearchBackend):
+    """
+    인덱스 없이 title/content에 검색어가 포함된 게시글을 찾습니다.
+    관련도 계산이 없으므로 score는 모두 0이며 id 순으로 반환합니다. (비교용, 그 외 DB용)
+    """
+
+    def search(self, query, after=None, limit=10):
+        articles = Article.objects.all()
+        for term in query.split():
+            articles = articles.filter(
+                Q(title__icontains=term) | Q(content__icontains=term)
+            )
+        if after is not None:
+            articles = articles.filter(id__gt=after[0])
+        ids = articles.order_by("id").values_list("id", flat=True)[:limit]
+        return [(article_id, 0.0) for article_id in ids]
+
+
+class SqliteSearchBackend(SearchBackend):
+    """
+    SQLite FTS5 가상 테이블을 사용합니다. rowid는 게시글 id와 같습니다.
+    검색어의 각 단어는 접두어로 검색하므로 "게시글"로 "게시글을"도 찾을 수 있습니다.
+    score는 bm25이며 제목에 더 높은 가중치를 줍니다.
+    """
+
+    TITLE_WEIGHT = 10.0
+    CONTENT_WEIGHT = 1.0
+
+    def to_match_query(self, query):
+        terms = ['"{}"*'.format(term.replace('"', '""')) for term in query.split()]
+        return " ".join(terms)
+
+    def search(self, query, after=None, limit=10):
+        match = self.to_match_query(query)
+        if not match:
+            return []
+        sql = (
+            f"SELECT article_id, score FROM ("
+            f" SELECT rowid AS article_id, bm25({FTS_TABLE}, %s, %s) AS score"
+            f" FROM {FTS_TABLE}"
+            f" WHERE {FTS_TABLE} MATCH %s"
+            f")"
+        )
+        params = [self.TITLE_WEIGHT, self.CONTENT_WEIGHT, match]
+        if after is not None:
+            sql += " WHERE (score, article_id) > (%s, %s)"
+            params += [after[1], after[0]]
+        sql += " ORDER BY score, article_id LIMIT %s"
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def index(self, article):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article.id])
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, content) VALUES (%s, %s, %s)",
+                [article.id, article.title, article.content],
+            )
+
+    def index_many(self, article_ids):
+        table = Article._meta.db_table
+        placeholders = ", ".join(["%s"] * len(article_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", article_ids
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, content)"
+                f" SELECT id, title, content FROM {table} WHERE id IN ({placeholders})",
+                article_ids,
+            )
+
+    def remove(self, article_id):
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [article_id])
+
+    def rebuild(self):
+        table = Article._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}(rowid, title, content)"
+                f" SELECT id, title, content FROM {table}"
+            )
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    PostgreSQL의 전문 검색을 사용합니다.
+    migration에서 만든 article_search_idx(GIN) 인덱스와 같은 식으로 검색해야 인덱스를 사용합니다.
+    인덱스는 DB가 관리하므로 index/remove에서 할 일이 없습니다.
+    score는 ts_rank의 음수입니다. (작을수록 관련도가 높음)
+    """
+
+    VECTOR = (
+        "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(content, ''))"
+    )
+
+    def search(self, query, after=None, limit=10):
+        table = Article._meta.db_table
+        sql = (
+            f"SELECT id, score FROM ("
+            f" SELECT id, -ts_rank({self.VECTOR}, q) AS score"
+            f" FROM {table}, plainto_tsquery('simple', %s) q"
+            f" WHERE {self.VECTOR} @@ q"
+            f") ranked"
+        )
+        params = [query]
+        if after is not None:
+            sql += " WHERE (score, id) > (%s, %s)"
+            params += [after[1], after[0]]
+        sql += " ORDER BY score, id LIMIT %s"
+        params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def index_many(self, article_ids):
+        pass
+
+
+def get_search_backend():
+    """
+    ARTICLE_SEARCH_BACKEND에 지정된 backend를 반환합니다.
+    지정하지 않았다면 DB 종류에 맞는 backend를 사용합니다.
+    """
+    path = getattr(settings, "ARTICLE_SEARCH_BACKEND", "")
+    if path:
+        return import_string(path)()
+    if connection.vendor == "sqlite":
+        return SqliteSearchBackend()
+    if connection.vendor == "postgresql":
+        return PostgresSearchBackend()
+    return IcontainsSearchBackend()
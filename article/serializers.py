@@ -1,5 +1,11 @@
+from django.db import models
+from django.db.models import F, Value
 from rest_framework import serializers
 from article.models import Article, Comment
+from article.cache import invalidate_profile
+from article.feeds import fan_out_article
+from user.models import User
+from DRF_Community_WebSite_Project.transactions import write_atomic
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -26,19 +32,12 @@ class ArticleSerializer(serializers.ModelSerializer):
     article/ url에 GET방식일 때 사용합니다.
     article db에 저장된 모든 게시글을 보여줍니다.
     DateTimeField를 사용하여 시간 가독성을 좋게했습니다.
+    likes_count, comment_count, bookmark_count는 Article에 저장된 값을 그대로 사용하므로 추가 쿼리가 없습니다.
     """
 
     created_at = serializers.DateTimeField(format="%m월%d일 %H:%M", read_only=True)
     author = serializers.SerializerMethodField()
     author_id = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
-    comment_count = serializers.SerializerMethodField()
-
-    def get_comment_count(self, obj):
-        """
-        comment 추가 시 댓글의 수를 int형태로 출력합니다.
-        """
-        return obj.comment_set.count()
 
     def get_author(self, obj):
         """
@@ -52,29 +51,121 @@ class ArticleSerializer(serializers.ModelSerializer):
         """
         return obj.author.id
 
-    def get_likes_count(self, obj):
-        """
-        게시글에서 like의 수를 int형태로 출력합니다.
-        """
-        return obj.likes.count()
-
     class Meta:
         model = Article
         fields = "__all__"
 
 
+def _user_article_status_query(request, article_ids):
+    """
+    요청한 유저가 article_ids 중 좋아요/북마크한 게시글의 (article_id, "like" 또는 "bookmark") queryset입니다.
+    likes/bookmarks through 테이블을 UNION으로 묶어 쿼리 한 번으로 가져오며,
+    로그인하지 않은 경우 조회할 필요가 없으므로 None을 반환합니다.
+    """
+    user = getattr(request, "user", None)
+    if not article_ids or user is None or not user.is_authenticated:
+        return None
+
+    likes = (
+        Article.likes.through.objects.filter(
+            user_id=user.id, article_id__in=article_ids
+        )
+        .annotate(kind=Value("like"))
+        .values_list("article_id", "kind")
+    )
+    bookmarks = (
+        Article.bookmarks.through.objects.filter(
+            user_id=user.id, article_id__in=article_ids
+        )
+        .annotate(kind=Value("bookmark"))
+        .values_list("article_id", "kind")
+    )
+    return likes.union(bookmarks, all=True)
+
+
+def _split_status(rows):
+    liked_ids, bookmarked_ids = set(), set()
+    for article_id, kind in rows:
+        if kind == "like":
+            liked_ids.add(article_id)
+        else:
+            bookmarked_ids.add(article_id)
+    return liked_ids, bookmarked_ids
+
+
+def get_user_article_status(request, article_ids):
+    """
+    요청한 유저가 article_ids 중 좋아요/북마크한 게시글 id를 (liked_ids, bookmarked_ids)로 반환합니다.
+    """
+    query = _user_article_status_query(request, article_ids)
+    return _split_status(query if query is not None else ())
+
+
+async def aget_user_article_status(request, article_ids):
+    """
+    get_user_article_status의 async 버전입니다.
+    """
+    query = _user_article_status_query(request, article_ids)
+    return _split_status([row async for row in query] if query is not None else ())
+
+
+class ArticleListListSerializer(serializers.ListSerializer):
+    """
+    게시글 목록을 출력하기 전에 페이지에 포함된 게시글들의 좋아요/북마크 여부를 한 번에 조회합니다.
+    조회한 결과는 context에 담아 각 게시글의 is_liked, is_bookmarked에서 사용합니다.
+    async view처럼 미리 조회했다면 context의 article_status를 그대로 사용합니다.
+    """
+
+    def to_representation(self, data):
+        articles = list(
+            data.all() if isinstance(data, models.manager.BaseManager) else data
+        )
+        if "article_status" in self.context:
+            liked_ids, bookmarked_ids = self.context["article_status"]
+        else:
+            liked_ids, bookmarked_ids = get_user_article_status(
+                self.context.get("request"), [article.id for article in articles]
+            )
+        self.context["liked_ids"] = liked_ids
+        self.context["bookmarked_ids"] = bookmarked_ids
+        return super().to_representation(articles)
+
+
 class ArticleListSerializer(ArticleSerializer):
     """
     전체 게시글을 확인하기 위해 만들었습니다.
-    제목, 작성자, 좋아요 수, 댓글 수, 생성일을 표시합니다.
+    제목, 작성자, 좋아요 수, 댓글 수, 북마크 수, 생성일을 표시합니다.
+    is_liked, is_bookmarked는 요청한 유저가 좋아요/북마크했는지 여부이며,
+    목록 단위로 한 번에 조회하기 때문에 게시글 수와 관계없이 쿼리가 늘지 않습니다.
     """
 
+    is_liked = serializers.SerializerMethodField()
+    is_bookmarked = serializers.SerializerMethodField()
+
+    def get_status_ids(self, obj):
+        """
+        목록에서 미리 조회한 id 집합을 가져옵니다.
+        목록이 아닌 단일 게시글로 사용된 경우에는 해당 게시글만 조회합니다.
+        """
+        if "liked_ids" in self.context:
+            return self.context["liked_ids"], self.context["bookmarked_ids"]
+        return get_user_article_status(self.context.get("request"), [obj.id])
+
+    def get_is_liked(self, obj):
+        liked_ids, _ = self.get_status_ids(obj)
+        return obj.id in liked_ids
+
+    def get_is_bookmarked(self, obj):
+        _, bookmarked_ids = self.get_status_ids(obj)
+        return obj.id in bookmarked_ids
+
     class Meta:
         """
         id는 aticle_id 입니다.
         """
 
         model = Article
+        list_serializer_class = ArticleListListSerializer
         fields = (
             "id",
             "author_id",
@@ -82,6 +173,9 @@ class ArticleListSerializer(ArticleSerializer):
             "author",
             "likes_count",
             "comment_count",
+            "bookmark_count",
+            "is_liked",
+            "is_bookmarked",
             "created_at",
         )
 
@@ -92,6 +186,7 @@ class ArticleCreateSerializer(serializers.ModelSerializer):
     게시글을 작성할 때 사용합니다, title과 content 값이 필요합니다.
     create를 오버라이딩하였습니다.
     title과 content에 검증된 값을 넣습니다,db에 author_idr값을 넣기위해 view에서 context를 이용하여 받은 유저의 정보에서 user.id만 뽑아 author_id에 넣습니다.
+    저장한 게시글은 작성자의 팔로워 피드에도 저장하고, 작성자의 articles_count를 함께 올립니다.
     """
 
     class Meta:
@@ -99,9 +194,40 @@ class ArticleCreateSerializer(serializers.ModelSerializer):
         fields = ("title", "content")
 
     def create(self, validated_data):
-        article = Article.objects.create(
-            title=validated_data["title"],
-            content=validated_data["content"],
-            author_id=self.context["request"].user.id,
-        )
+        with write_atomic():
+            author_id = self.context["request"].user.id
+            article = Article.objects.create(
+                title=validated_data["title"],
+                content=validated_data["content"],
+                author_id=author_id,
+            )
+            User.objects.filter(id=author_id).update(
+                articles_count=F("articles_count") + 1
+            )
+            invalidate_profile(author_id)
+            fan_out_article(article)
         return article
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    """
+    일괄 처리할 좋아요/북마크/팔로우 작업 하나입니다.
+    like, bookmark는 게시글 id를, follow는 유저 id를 target_id로 받습니다.
+    """
+
+    action = serializers.ChoiceField(choices=("like", "bookmark", "follow"))
+    target_id = serializers.IntegerField(min_value=1)
+    desired_state = serializers.BooleanField()
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    article/batch/ url에 POST방식일 때 사용합니다.
+    한 번에 최대 MAX_OPERATIONS개의 작업을 받습니다.
+    """
+
+    MAX_OPERATIONS = 500
+
+    operations = BatchOperationSerializer(
+        many=True, allow_empty=False, max_length=MAX_OPERATIONS
+    )
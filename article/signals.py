@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from article.cache import invalidate_article_detail, invalidate_profile
+from article.models import Article
+from article.search import get_search_backend
+from user.models import User, Profile
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_articles(sender, instance, created, update_fields, **kwargs):
+    """
+    프로필과 게시글 상세 조회 캐시에는 유저 정보가 들어있으므로,
+    유저 정보가 저장되면(수정, 탈퇴) 프로필 캐시와 해당 유저가 작성한 게시글의 캐시를 무효화합니다.
+    게시글 캐시에는 username만 들어있으므로 update_fields에 username이 없다면 건너뜁니다.
+    """
+    if created:
+        return
+    invalidate_profile(instance.id)
+    if update_fields is not None and "username" not in update_fields:
+        return
+    article_ids = Article.objects.filter(author=instance).values_list("id", flat=True)
+    invalidate_article_detail(*article_ids)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_user_profile(sender, instance, **kwargs):
+    """
+    프로필이 수정되면 프로필 조회 캐시를 무효화합니다.
+    """
+    invalidate_profile(instance.username_id)
+
+
+@receiver(post_save, sender=Article)
+def index_article(sender, instance, **kwargs):
+    """
+    게시글이 저장되면 검색 인덱스에 반영합니다.
+    """
+    get_search_backend().index(instance)
+
+
+@receiver(post_delete, sender=Article)
+def remove_article_index(sender, instance, **kwargs):
+    get_search_backend().remove(instance.id)
@@ -0,0 +1,121 @@
+"""
+목록 전체를 한 번에 직렬화하지 않고 chunk_size개씩 직렬화하여 바로 내려보내는 응답입니다.
+?stream=json(또는 1)이면 JSON 배열을, ?stream=ndjson 또는 Accept: application/x-ndjson이면 한 줄에 하나씩 보냅니다.
+queryset은 .iterator(chunk_size)로 읽으므로 행 수와 관계없이 한 번에 chunk_size개만 메모리에 올라가고,
+첫 chunk를 직렬화하자마자 응답을 보내기 시작합니다.
+"""
+
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+NDJSON = "application/x-ndjson"
+STREAM_QUERY_PARAM = "stream"
+DEFAULT_CHUNK_SIZE = 500
+
+
+class NDJSONRenderer(JSONRenderer):
+    """
+    Accept: application/x-ndjson 요청이 content negotiation에서 406이 되지 않도록 등록하는 renderer입니다.
+    스트리밍 응답은 renderer를 거치지 않으며, 404 같은 일반 응답은 JSON으로 보냅니다.
+    """
+
+    media_type = NDJSON
+    format = "ndjson"
+
+
+def get_stream_format(request):
+    """
+    스트리밍을 요청했다면 "json" 또는 "ndjson"을, 아니라면 None을 반환합니다.
+    """
+    value = request.GET.get(STREAM_QUERY_PARAM, "").lower()
+    if value == "ndjson":
+        return "ndjson"
+    if value in ("1", "true", "json"):
+        return "json"
+    if NDJSON in request.META.get("HTTP_ACCEPT", ""):
+        return "ndjson"
+    return None
+
+
+def _chunks(queryset, chunk_size, field=None):
+    chunk = []
+    for instance in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(getattr(instance, field) if field else instance)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _encode(queryset, serializer_class, context, fmt, chunk_size, field):
+    """
+    chunk마다 many=True로 직렬화하므로 ArticleListSerializer의 좋아요/북마크 여부도 chunk마다 한 번씩 조회됩니다.
+    """
+    separator = "\n" if fmt == "ndjson" else ","
+    if fmt == "json":
+        yield "["
+    first = True
+    for chunk in _chunks(queryset, chunk_size, field):
+        data = serializer_class(chunk, many=True, context=context).data
+        text = separator.join(
+            json.dumps(item, cls=JSONEncoder, ensure_ascii=False) for item in data
+        )
+        if fmt == "ndjson":
+            yield text + "\n"
+        else:
+            yield text if first else "," + text
+        first = False
+    if fmt == "json":
+        yield "]"
+
+
+def streaming_response(
+    request,
+    queryset,
+    serializer_class,
+    context=None,
+    chunk_size=DEFAULT_CHUNK_SIZE,
+    field=None,
+):
+    """
+    queryset 전체를 request가 요청한 형식으로 스트리밍하는 응답을 만듭니다.
+    field를 주면 queryset의 행 대신 행의 field(FeedEntry의 article 등)를 직렬화합니다.
+    """
+    fmt = get_stream_format(request) or "json"
+    return StreamingHttpResponse(
+        _encode(queryset, serializer_class, context or {}, fmt, chunk_size, field),
+        content_type=NDJSON if fmt == "ndjson" else "application/json",
+    )
+
+
+class StreamingListMixin:
+    """
+    ListAPIView에 사용하며, 스트리밍을 요청하면 pagination 없이 queryset 전체를 streaming_response로 보냅니다.
+    """
+
+    stream_chunk_size = DEFAULT_CHUNK_SIZE
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+
+    def get_stream_field(self, queryset):
+        """
+        queryset의 행 대신 직렬화할 필드 이름입니다. (streaming_response의 field)
+        """
+        return None
+
+    def list(self, request, *args, **kwargs):
+        if get_stream_format(request) is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        return streaming_response(
+            request,
+            queryset,
+            self.get_serializer_class(),
+            self.get_serializer_context(),
+            self.stream_chunk_size,
+            self.get_stream_field(queryset),
+        )
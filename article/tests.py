@@ -1,3 +1,1575 @@
-from django.test import TestCase
+import json
+import os
+import time
+from datetime import datetime, timezone
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+from asgiref.sync import sync_to_async
+from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.test import SimpleTestCase, TransactionTestCase
+from rest_framework.test import APITestCase
+from article.models import Article, Comment, FeedEntry
+from article.feeds import feed_queryset
+from article.paginations import encode_cursor
+from article.relations import _insert_rows, apply_batch, set_follow, set_like
+from article.serializers import ArticleListSerializer, CommentSerializer
+from article.cache import get_or_build
+from article.checks import check_conditional_get, check_response_cache
+from article.async_views import AsyncArticleView
+from article.views import ArticleView, LikeView
+from user.models import User
+from user.views import ProfileView
+from DRF_Community_WebSite_Project import media
+from DRF_Community_WebSite_Project.metrics import profile_keeper, registry
+from DRF_Community_WebSite_Project.querycheck import (
+    QueryCheckError,
+    check_queries,
+    query_shape,
+)
+from DRF_Community_WebSite_Project.replicas import ReplicaMiddleware, ReplicaRouter
+from DRF_Community_WebSite_Project.testing import use_shared_cache
+from DRF_Community_WebSite_Project.throttling import LocalBucketStore, reset_throttles
+
 
 # Create your tests here.
+class ArticleBaseTestCase(APITestCase):
+    """
+    게시글 기능을 검증하기 위한 부모 클래스입니다.
+    유저와 게시글 하나를 만들고 로그인한 토큰을 준비합니다.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = User.objects.create_user(
+            username="zxcvbnasdf_",
+            email="abcd@naver.com",
+            password="asdf1234!!",
+        )
+        cls.user_data = {"username": "zxcvbnasdf_", "password": "asdf1234!!"}
+        cls.article = Article.objects.create(
+            author=cls.user, title="제목", content="내용"
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+        reset_throttles()
+        self.access = self.client.post(reverse("token"), self.user_data).data["access"]
+
+
+class ArticleCountTestCase(ArticleBaseTestCase):
+    """
+    저장된 좋아요/북마크/댓글 수가 올바르게 유지되는지 검증하는 케이스
+    """
+
+    def test_like_toggle(self):
+        url = reverse("like_view", args=[self.article.id])
+        self.client.post(path=url, HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+
+        self.client.post(path=url, HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 0)
+
+    def test_like_put_delete(self):
+        """
+        PUT/DELETE는 여러 번 요청해도 결과가 같다.
+        """
+        url = reverse("like_view", args=[self.article.id])
+        for _ in range(2):
+            response = self.client.put(
+                path=url, HTTP_AUTHORIZATION=f"Bearer {self.access}"
+            )
+            self.assertEqual(response.status_code, 200)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+
+        for _ in range(2):
+            response = self.client.delete(
+                path=url, HTTP_AUTHORIZATION=f"Bearer {self.access}"
+            )
+            self.assertEqual(response.status_code, 200)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 0)
+        self.assertFalse(self.article.likes.exists())
+
+    def test_like_missing_article(self):
+        url = reverse("like_view", args=[self.article.id + 100])
+        response = self.client.post(
+            path=url, HTTP_AUTHORIZATION=f"Bearer {self.access}"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_bookmark_toggle(self):
+        url = reverse("bookmark_view", args=[self.article.id])
+        self.client.post(path=url, HTTP_AUTHORIZATION=f"Bearer {self.access}")
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.bookmark_count, 1)
+
+    def test_comment(self):
+        url = reverse("comment_view", args=[self.article.id])
+        response = self.client.post(
+            path=url,
+            HTTP_AUTHORIZATION=f"Bearer {self.access}",
+            data={"content": "댓글"},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.comment_count, 1)
+
+    def test_rebuild_command(self):
+        """
+        어긋난 값을 M2M/댓글 테이블 기준으로 다시 계산
+        """
+        self.article.likes.add(self.user)
+        Comment.objects.create(author=self.user, article=self.article, content="댓글")
+        Article.objects.filter(id=self.article.id).update(
+            likes_count=10, comment_count=10, bookmark_count=10
+        )
+        call_command("rebuild_article_counts", stdout=StringIO())
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes_count, 1)
+        self.assertEqual(self.article.comment_count, 1)
+        self.assertEqual(self.article.bookmark_count, 0)
+
+
+class ArticleListQueryTestCase(ArticleBaseTestCase):
+    """
+    목록 조회의 쿼리 수가 게시글 수와 관계없이 일정한지 검증하는 케이스
+    """
+
+    # 전체 개수, 페이지 조회 (ETag는 캐시의 버전으로 만듭니다.)
+    QUERY_BUDGET = 2
+    # 페이지 게시글들의 좋아요/북마크 여부를 한 번에 조회하는 쿼리 1개가 추가됩니다.
+    # 인증 유저는 토큰의 claim으로 만들어지므로 조회하지 않습니다.
+    AUTH_QUERY_BUDGET = QUERY_BUDGET + 1
+
+    def count_queries(self, url, **extra):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path=url, **extra)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def add_articles(self, count):
+        for author in User.objects.all():
+            Article.objects.bulk_create(
+                Article(author=author, title=f"제목{i}", content="내용")
+                for i in range(count)
+            )
+
+    def test_article_list(self):
+        url = reverse("article_view")
+        before = self.count_queries(url)
+        self.add_articles(15)
+        self.assertEqual(self.count_queries(url), before)
+        self.assertLessEqual(before, self.QUERY_BUDGET)
+
+    def test_like_status(self):
+        """
+        is_liked, is_bookmarked는 게시글 수와 관계없이 한 번에 조회된다.
+        """
+        url = reverse("article_view")
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+        before = self.count_queries(url, **auth)
+        self.add_articles(15)
+        liked = Article.objects.order_by("-created_at", "-id")[:3]
+        self.user.like_articles.add(*liked)
+        self.user.bookmarked_articles.add(liked[0])
+        self.assertEqual(self.count_queries(url, **auth), before)
+        self.assertLessEqual(before, self.AUTH_QUERY_BUDGET)
+
+        results = self.client.get(path=url, **auth).data["results"]
+        self.assertEqual(
+            [a["is_liked"] for a in results[:4]], [True, True, True, False]
+        )
+        self.assertEqual([a["is_bookmarked"] for a in results[:2]], [True, False])
+
+        anonymous = self.client.get(path=url).data["results"]
+        self.assertFalse(any(a["is_liked"] for a in anonymous))
+
+    def test_profile_article_list(self):
+        url = reverse("profile_aticle", args=[self.user.id])
+        before = self.count_queries(url)
+        self.add_articles(15)
+        self.assertEqual(self.count_queries(url), before)
+        # 작성자 조회 1개가 추가됩니다.
+        self.assertLessEqual(before, self.QUERY_BUDGET + 1)
+
+    def test_feed_and_bookmark_list(self):
+        other = User.objects.create_user(
+            username="qwertyasdf_", email="qwer@naver.com", password="asdf1234!!"
+        )
+        self.user.followings.add(other)
+        Article.objects.create(author=other, title="제목", content="내용")
+        self.user.bookmarked_articles.add(self.article)
+        call_command("rebuild_feeds", stdout=StringIO())
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+        # 피드는 fan-out-on-read로 가져올 작성자 조회 1개가 추가됩니다.
+        budgets = {
+            reverse("feed"): self.AUTH_QUERY_BUDGET + 1,
+            reverse("bookmark_list_view"): self.AUTH_QUERY_BUDGET,
+        }
+        for url, budget in budgets.items():
+            before = self.count_queries(url, **auth)
+            self.add_articles(15)
+            self.user.bookmarked_articles.add(*Article.objects.all())
+            call_command("rebuild_feeds", stdout=StringIO())
+            self.assertEqual(self.count_queries(url, **auth), before)
+            self.assertLessEqual(before, budget)
+
+
+# 값의 수는 맞지만 (created_at, id)의 형식이 아닌 cursor들입니다.
+INVALID_CURSORS = [
+    encode_cursor(values)
+    for values in [
+        [1, 2],
+        ["abc", "x"],
+        ["2020-01-01", {"a": 1}],
+        ["2020-01-01T00:00:00+00:00", "1"],
+        ["2020-13-45T00:00:00+00:00", 1],
+        ["2020-01-01T00:00:00+00:00", 2**64],
+        ["2020-01-01T00:00:00+00:00"],
+    ]
+]
+
+
+class ArticleCursorPaginationTestCase(ArticleBaseTestCase):
+    """
+    cursor param으로 opt-in하는 keyset pagination을 검증하는 케이스
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        Article.objects.bulk_create(
+            Article(author=cls.user, title=f"제목{i}", content="내용")
+            for i in range(24)
+        )
+
+    def test_cursor_pages(self):
+        """
+        next url을 따라가면 모든 게시글을 최신순으로 중복 없이 한 번씩 받는다.
+        """
+        url = reverse("article_view") + "?cursor="
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            seen += [article["id"] for article in response.data["results"]]
+            url = response.data["next"]
+        expected = list(
+            Article.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_page_number_default(self):
+        """
+        cursor param이 없으면 기존처럼 페이지 번호를 사용한다.
+        """
+        response = self.client.get(reverse("article_view"), {"page": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 25)
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_invalid_cursor(self):
+        """
+        형식이 맞지 않는 cursor는 쿼리를 실행하지 않고 404를 반환한다.
+        """
+        response = self.client.get(reverse("article_view"), {"cursor": "invalid"})
+        self.assertEqual(response.status_code, 404)
+        for cursor in INVALID_CURSORS:
+            response = self.client.get(reverse("article_view"), {"cursor": cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+
+class FeedTestCase(ArticleBaseTestCase):
+    """
+    미리 저장해두는 피드(FeedEntry)를 검증하는 케이스
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.other = User.objects.create_user(
+            username="qwertyasdf_", email="qwer@naver.com", password="asdf1234!!"
+        )
+        cls.other_data = {"username": "qwertyasdf_", "password": "asdf1234!!"}
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.other_access = self.client.post(reverse("token"), self.other_data).data[
+            "access"
+        ]
+
+    def follow(self):
+        return self.client.post(
+            path=reverse("follow", args=[self.user.id]),
+            HTTP_AUTHORIZATION=f"Bearer {self.other_access}",
+        )
+
+    def get_feed_ids(self):
+        response = self.client.get(
+            path=reverse("feed"), HTTP_AUTHORIZATION=f"Bearer {self.other_access}"
+        )
+        self.assertEqual(response.status_code, 200)
+        return [article["id"] for article in response.data["results"]]
+
+    def write_article(self):
+        response = self.client.post(
+            path=reverse("article_view"),
+            HTTP_AUTHORIZATION=f"Bearer {self.access}",
+            data={"title": "새 글", "content": "내용"},
+        )
+        self.assertEqual(response.status_code, 201)
+        return Article.objects.latest("id")
+
+    def test_follow_backfill_and_unfollow_prune(self):
+        self.follow()
+        self.assertEqual(self.get_feed_ids(), [self.article.id])
+
+        self.follow()
+        self.assertEqual(self.get_feed_ids(), [])
+        self.assertFalse(FeedEntry.objects.filter(owner=self.other).exists())
+
+    def test_fan_out_on_write(self):
+        self.follow()
+        article = self.write_article()
+        self.assertTrue(
+            FeedEntry.objects.filter(owner=self.other, article=article).exists()
+        )
+        self.assertEqual(self.get_feed_ids(), [article.id, self.article.id])
+
+    def test_cursor_and_stream(self):
+        """
+        FeedEntry의 (created_at, article_id)로 나눈 페이지와 스트리밍이 게시글 최신순과 같다.
+        """
+        self.follow()
+        Article.objects.bulk_create(
+            Article(author=self.user, title=f"제목{i}", content="내용")
+            for i in range(14)
+        )
+        Article.objects.filter(id__lte=self.article.id + 7).update(
+            created_at=self.article.created_at
+        )
+        FeedEntry.objects.all().delete()
+        set_follow(self.other, self.user)
+        set_follow(self.other, self.user)
+        expected = list(
+            Article.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.other_access}"}
+        seen = []
+        url = reverse("feed") + "?cursor="
+        while url:
+            response = self.client.get(url, **auth)
+            self.assertEqual(response.status_code, 200)
+            seen += [article["id"] for article in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(seen, expected)
+
+        response = self.client.get(reverse("feed") + "?stream=1", **auth)
+        articles = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([article["id"] for article in articles], expected)
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=0)
+    def test_fan_out_on_read(self):
+        """
+        팔로워가 많은 작성자의 게시글은 저장하지 않고 조회 시 함께 가져온다.
+        """
+        self.follow()
+        article = self.write_article()
+        self.assertFalse(FeedEntry.objects.exists())
+        self.assertEqual(self.get_feed_ids(), [article.id, self.article.id])
+
+    @override_settings(FEED_FANOUT_MAX_FOLLOWERS=1)
+    def test_fan_out_limit_crossing(self):
+        """
+        팔로워가 제한을 넘었다가 다시 줄어도 그동안 작성한 게시글이 피드에서 사라지지 않는다.
+        """
+        self.follow()
+        third = User.objects.create_user(
+            username="third", email="third@naver.com", password="pw"
+        )
+        set_follow(third, self.user, True)
+        article = self.write_article()
+        self.assertFalse(FeedEntry.objects.filter(article=article).exists())
+
+        set_follow(third, self.user, False)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.followers_count, 1)
+        self.assertTrue(self.user.feed_fanout_on_read)
+        self.assertEqual(self.get_feed_ids(), [article.id, self.article.id])
+
+        apply_batch(
+            third.id,
+            [{"action": "follow", "target_id": self.user.id, "desired_state": True}],
+        )
+        self.assertEqual(
+            list(
+                feed_queryset(third)
+                .order_by("-created_at", "-id")
+                .values_list("id", flat=True)
+            ),
+            [article.id, self.article.id],
+        )
+
+
+class LikeConcurrencyTestCase(TransactionTestCase):
+    """
+    여러 스레드가 한 게시글에 동시에 좋아요를 눌러도 likes와 likes_count가 맞는지 검증하는 케이스
+    """
+
+    THREADS = 8
+
+    def setUp(self) -> None:
+        self.users = [
+            User.objects.create_user(
+                username=f"concurrent{i}", email=f"c{i}@naver.com", password="pw"
+            )
+            for i in range(self.THREADS)
+        ]
+        self.article = Article.objects.create(
+            author=self.users[0], title="제목", content="내용"
+        )
+
+    def run_threads(self, func, args_list):
+        def target(args):
+            # 테스트용 in-memory SQLite는 동시에 쓰면 기다리지 않고 바로 locked 에러를 내므로 다시 시도합니다.
+            # 실패한 시도는 트랜잭션이 롤백되므로 결과에는 영향이 없습니다.
+            try:
+                while True:
+                    try:
+                        return func(*args)
+                    except OperationalError as error:
+                        if "locked" not in str(error):
+                            raise
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.THREADS) as executor:
+            return list(executor.map(target, args_list))
+
+    def test_concurrent_likes(self):
+        args = [(self.article.id, user.id, True) for user in self.users] * 3
+        self.run_threads(set_like, args)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes.count(), self.THREADS)
+        self.assertEqual(self.article.likes_count, self.THREADS)
+
+    def test_concurrent_double_click(self):
+        """
+        한 유저가 같은 좋아요를 동시에 여러 번 요청해도 좋아요는 하나만 남는다.
+        """
+        user = self.users[1]
+        self.run_threads(set_like, [(self.article.id, user.id, True)] * self.THREADS)
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.likes.count(), 1)
+        self.assertEqual(self.article.likes_count, 1)
+
+    def test_immediate_transaction(self):
+        """
+        좋아요는 BEGIN IMMEDIATE로 시작하는 트랜잭션에서 저장되고, 연결에는 SQLITE_PRAGMAS가 적용된다.
+        """
+        with CaptureQueriesContext(connection) as context:
+            set_like(self.article.id, self.users[1].id)
+        self.assertEqual(context.captured_queries[0]["sql"], "BEGIN IMMEDIATE")
+
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            # 1은 NORMAL입니다.
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+
+class ArticleDetailCacheTestCase(ArticleBaseTestCase):
+    """
+    게시글 상세 조회 캐시와 무효화를 검증하는 케이스
+    """
+
+    def get_detail(self):
+        url = reverse("article_detail_view", args=[self.article.id])
+        response = self.client.get(path=url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_cached(self):
+        self.get_detail()
+        with self.assertNumQueries(0):
+            self.get_detail()
+
+    def test_process_local_cache_with_workers(self):
+        """
+        locmem 캐시는 무효화가 다른 worker에 반영되지 않으므로 worker가 여럿이면 사용하지 않는다.
+        """
+        self.get_detail()
+        self.assertEqual(check_response_cache(None), [])
+        with self.settings(WEB_CONCURRENCY=4):
+            with CaptureQueriesContext(connection) as context:
+                self.get_detail()
+            self.assertTrue(context.captured_queries)
+            errors = check_response_cache(None)
+        self.assertEqual([error.id for error in errors], ["article.W002"])
+
+    def test_missing_article(self):
+        url = reverse("article_detail_view", args=[self.article.id + 100])
+        self.assertEqual(self.client.get(path=url).status_code, 404)
+
+    def test_invalidate_on_like_and_comment(self):
+        self.assertEqual(self.get_detail()["likes_count"], 0)
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse("like_view", args=[self.article.id]), **auth)
+        self.assertEqual(self.get_detail()["likes_count"], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("comment_view", args=[self.article.id]),
+                {"content": "댓글"},
+                **auth,
+            )
+        self.assertEqual(self.get_detail()["comment_count"], 1)
+
+    def test_invalidate_on_put_and_username(self):
+        self.get_detail()
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(
+                reverse("article_detail_view", args=[self.article.id]),
+                {"title": "수정", "content": "수정"},
+                **auth,
+            )
+        self.assertEqual(self.get_detail()["title"], "수정")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = "renamed_user"
+            self.user.save()
+        self.assertEqual(self.get_detail()["author"], "renamed_user")
+
+
+class CacheStampedeTestCase(SimpleTestCase):
+    """
+    비어 있는 캐시에 동시에 요청이 몰려도 값은 한 번만 만들어지는지 검증하는 케이스
+    """
+
+    def test_single_build(self):
+        cache.clear()
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": 1}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(
+                executor.map(lambda _: get_or_build("stampede", build), range(8))
+            )
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"value": 1}] * 8)
+
+
+class ConditionalGetTestCase(ArticleBaseTestCase):
+    """
+    ETag/Last-Modified를 이용한 조건부 GET을 검증하는 케이스
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        use_shared_cache(self)
+
+    def assert_not_modified(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        return etag
+
+    def test_detail(self):
+        url = reverse("article_detail_view", args=[self.article.id])
+        etag = self.assert_not_modified(url)
+        last_modified = self.client.get(url)["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            set_like(self.article.id, self.user.id)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["likes_count"], 1)
+
+    def test_list(self):
+        url = reverse("article_view")
+        etag = self.assert_not_modified(url)
+        set_like(self.article.id, self.user.id)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # cursor 요청도 페이지의 행으로 ETag를 만듭니다.
+        cursor_url = response.data["next"] or f"{url}?cursor="
+        self.assert_not_modified(cursor_url)
+
+    def test_list_scoped_to_page(self):
+        """
+        ETag는 응답할 페이지의 행으로 만들므로 다른 페이지의 게시글이 바뀌어도 304를 반환한다.
+        """
+        Article.objects.bulk_create(
+            Article(author=self.user, title=f"제목{i}", content="내용")
+            for i in range(10)
+        )
+        url = reverse("article_view")
+        etag = self.assert_not_modified(url)
+        set_like(self.article.id, self.user.id)
+        response = self.client.get(url, {"page": 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["likes_count"], 1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # 로그인한 유저의 좋아요 여부도 ETag에 포함됩니다.
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+        etag = self.client.get(url, {"page": 2}, **auth)["ETag"]
+        set_like(self.article.id, self.user.id, False)
+        Article.objects.filter(id=self.article.id).update(likes_count=1)
+        response = self.client.get(url, {"page": 2}, HTTP_IF_NONE_MATCH=etag, **auth)
+        self.assertEqual(response.status_code, 200)
+
+    def test_list_skips_serialization(self):
+        """
+        304는 ETag를 만들 때 읽은 페이지 외에 쿼리를 실행하지 않고 직렬화하지 않는다.
+        """
+        url = reverse("article_view")
+        etag = self.client.get(url)["ETag"]
+        with patch.object(ArticleListSerializer, "to_representation") as serialize:
+            with self.assertNumQueries(ArticleListQueryTestCase.QUERY_BUDGET):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        serialize.assert_not_called()
+
+    def test_process_local_cache(self):
+        """
+        다른 프로세스가 새로 발급한 버전을 볼 수 없는 locmem 캐시에서는 상세 조회에 ETag를 보내지 않는다.
+        """
+        self.assertEqual(check_conditional_get(None), [])
+        backend = "django.core.cache.backends.locmem.LocMemCache"
+        with self.settings(CACHES={"default": {"BACKEND": backend}}):
+            url = reverse("article_detail_view", args=[self.article.id])
+            response = self.client.get(url)
+            errors = check_conditional_get(None)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertEqual([error.id for error in errors], ["article.W001"])
+
+    def test_comments(self):
+        url = reverse("comment_view", args=[self.article.id])
+        etag = self.assert_not_modified(url)
+        Comment.objects.create(author=self.user, article=self.article, content="댓글")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class CommentListTestCase(ArticleBaseTestCase):
+    """
+    댓글 목록의 cursor pagination을 검증하는 케이스
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        Comment.objects.bulk_create(
+            Comment(author=cls.user, article=cls.article, content=f"댓글{i}")
+            for i in range(25)
+        )
+
+    def test_pages(self):
+        url = reverse("comment_view", args=[self.article.id])
+        seen = []
+        while url:
+            with self.assertNumQueries(3):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [comment["content"] for comment in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(seen, [f"댓글{i}" for i in range(25)])
+
+    def test_newest(self):
+        url = reverse("comment_view", args=[self.article.id])
+        response = self.client.get(url, {"newest": 3})
+        contents = [comment["content"] for comment in response.data["results"]]
+        self.assertEqual(contents, ["댓글24", "댓글23", "댓글22"])
+        response = self.client.get(response.data["next"])
+        contents = [comment["content"] for comment in response.data["results"]]
+        self.assertEqual(contents, ["댓글21", "댓글20", "댓글19"])
+
+    def test_missing_article(self):
+        url = reverse("comment_view", args=[self.article.id + 100])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_invalid_cursor(self):
+        url = reverse("comment_view", args=[self.article.id])
+        for cursor in INVALID_CURSORS:
+            response = self.client.get(url, {"cursor": cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+
+
+class ArticleSearchTestCase(ArticleBaseTestCase):
+    """
+    게시글 검색을 검증하는 케이스
+    """
+
+    def create(self, title, content):
+        return Article.objects.create(author=self.user, title=title, content=content)
+
+    def search(self, **params):
+        response = self.client.get(reverse("article_search"), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_rank_and_prefix(self):
+        in_content = self.create("일상", "오늘 장고 공부를 했습니다")
+        in_title = self.create("장고 게시글을 작성", "내용")
+        self.create("파이썬", "관련 없는 글")
+        ids = [a["id"] for a in self.search(q="장고").data["results"]]
+        self.assertEqual(ids, [in_title.id, in_content.id])
+        ids = [a["id"] for a in self.search(q="게시글").data["results"]]
+        self.assertEqual(ids, [in_title.id])
+
+    def test_update_and_delete_sync(self):
+        article = self.create("장고", "내용")
+        article.title = "파이썬"
+        article.save()
+        self.assertEqual(self.search(q="장고").data["results"], [])
+        self.assertEqual(len(self.search(q="파이썬").data["results"]), 1)
+        article.delete()
+        self.assertEqual(self.search(q="파이썬").data["results"], [])
+
+    def test_cursor(self):
+        created = {self.create(f"장고 {i}", "내용").id for i in range(25)}
+        seen = []
+        response = self.search(q="장고")
+        while True:
+            seen += [a["id"] for a in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(set(seen), created)
+
+    def test_empty_query(self):
+        response = self.client.get(reverse("article_search"), {"q": " "})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_cursor(self):
+        """
+        검색의 cursor는 (article_id, score)이다.
+        """
+        cursors = [[1, "abc"], ["1", 0.5], [1, float("nan")], [1, 2, 3]]
+        for values in cursors:
+            params = {"q": "장고", "cursor": encode_cursor(values)}
+            response = self.client.get(reverse("article_search"), params)
+            self.assertEqual(response.status_code, 404, values)
+
+
+class BatchTestCase(ArticleBaseTestCase):
+    """
+    좋아요/북마크/팔로우 일괄 처리를 검증하는 케이스
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        cls.other = User.objects.create_user(
+            username="qwertyasdf_", email="qwer@naver.com", password="asdf1234!!"
+        )
+        cls.other_article = Article.objects.create(
+            author=cls.other, title="제목", content="내용"
+        )
+
+    def batch(self, operations):
+        return self.client.post(
+            path=reverse("batch"),
+            data={"operations": operations},
+            format="json",
+            HTTP_AUTHORIZATION=f"Bearer {self.access}",
+        )
+
+    def op(self, action, target_id, state):
+        return {"action": action, "target_id": target_id, "desired_state": state}
+
+    def test_apply(self):
+        self.user.like_articles.add(self.article)
+        Article.objects.filter(id=self.article.id).update(likes_count=1)
+        operations = [
+            self.op("like", self.other_article.id, True),
+            self.op("like", self.article.id, False),
+            self.op("bookmark", self.article.id, False),
+            self.op("follow", self.other.id, True),
+            self.op("like", 9999, True),
+            self.op("follow", self.user.id, True),
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.batch(operations)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r.get("state", r.get("error")) for r in response.data["results"]],
+            [True, False, False, True, "not_found", "self_follow"],
+        )
+        self.assertEqual(
+            [r.get("changed") for r in response.data["results"]],
+            [True, True, False, True, None, None],
+        )
+
+        self.other_article.refresh_from_db()
+        self.article.refresh_from_db()
+        self.assertEqual(self.other_article.likes_count, 1)
+        self.assertEqual(self.article.likes_count, 0)
+        self.other.refresh_from_db()
+        self.assertEqual(self.other.followers_count, 1)
+        feed = FeedEntry.objects.filter(owner=self.user)
+        feed_ids = list(feed.values_list("article", flat=True))
+        self.assertEqual(feed_ids, [self.other_article.id])
+
+        response = self.batch([self.op("follow", self.other.id, False)])
+        self.assertTrue(response.data["results"][0]["changed"])
+        self.assertFalse(FeedEntry.objects.filter(owner=self.user).exists())
+
+    def test_counts_use_deltas(self):
+        """
+        저장된 수를 다시 세지 않고 실제로 추가/삭제한 행만큼 더하거나 뺀다.
+        """
+        Article.objects.filter(id=self.other_article.id).update(likes_count=5)
+        # 동시에 들어온 다른 요청이 먼저 추가한 행은 세지 않습니다.
+        through = Article.likes.through
+        added = _insert_rows(
+            through, "user_id", self.user.id, "article_id", [self.other_article.id]
+        )
+        self.assertEqual(added, [self.other_article.id])
+        added = _insert_rows(
+            through,
+            "user_id",
+            self.user.id,
+            "article_id",
+            [self.article.id, self.other_article.id],
+        )
+        self.assertEqual(added, [self.article.id])
+
+        response = self.batch([self.op("like", self.other_article.id, False)])
+        self.assertTrue(response.data["results"][0]["changed"])
+        self.other_article.refresh_from_db()
+        self.assertEqual(self.other_article.likes_count, 4)
+
+    def test_query_count(self):
+        """
+        쿼리 수는 작업 수와 관계없이 일정하다.
+        """
+        Article.objects.bulk_create(
+            Article(author=self.other, title=f"제목{i}", content="내용")
+            for i in range(200)
+        )
+        article_ids = list(Article.objects.values_list("id", flat=True))
+
+        def count_queries(ids, state):
+            operations = [
+                self.op(action, article_id, state)
+                for article_id in ids
+                for action in ("like", "bookmark")
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = self.batch(operations)
+            self.assertEqual(response.status_code, 200)
+            return len(context.captured_queries)
+
+        self.assertEqual(
+            count_queries(article_ids[:10], True), count_queries(article_ids, True)
+        )
+        self.assertEqual(
+            count_queries(article_ids[:10], False), count_queries(article_ids, False)
+        )
+        self.assertEqual(self.user.like_articles.count(), 0)
+
+    def test_invalid(self):
+        response = self.batch([self.op("share", 1, True)])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.batch([]).status_code, 400)
+
+
+class ArticleTransferTestCase(ArticleBaseTestCase):
+    """
+    게시글/댓글 내보내기와 가져오기를 검증하는 케이스
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        Comment.objects.create(author=cls.user, article=cls.article, content="댓글")
+        created_at = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        Article.objects.update(created_at=created_at, updated_at=created_at)
+
+    def export(self, kind, path):
+        call_command("export_articles", kind, path, stdout=StringIO())
+
+    def test_command_round_trip(self):
+        with TemporaryDirectory() as directory:
+            articles = os.path.join(directory, "article.jsonl")
+            comments = os.path.join(directory, "comment.csv")
+            self.export("article", articles)
+            self.export("comment", comments)
+            Article.objects.all().delete()
+
+            for kind, path in (("article", articles), ("comment", comments)):
+                out = StringIO()
+                args = ("import_articles", kind, path, "--batch-size", "1")
+                call_command(*args, stdout=out)
+                self.assertIn("1개의 행을", out.getvalue())
+
+        article = Article.objects.get()
+        self.assertEqual(
+            (article.id, article.title, article.comment_count),
+            (self.article.id, "제목", 1),
+        )
+        self.assertEqual(article.created_at, datetime(2020, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(article.comment_set.get().content, "댓글")
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.articles_count, 1)
+
+    def test_skip_unknown_author(self):
+        rows = '{"author": "nobody", "title": "제목", "content": "내용"}\n'
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "article.jsonl")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(rows)
+            out = StringIO()
+            call_command("import_articles", "article", path, stdout=out)
+        self.assertIn("건너뜀 1개", out.getvalue())
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_import_updates_imported_rows_only(self):
+        """
+        가져온 게시글만 피드와 검색 인덱스에 반영하고, 나머지는 다시 만들지 않는다.
+        """
+        follower = User.objects.create_user(
+            username="follower", email="follower@naver.com", password="asdf1234!!"
+        )
+        set_follow(follower, self.user)
+        FeedEntry.objects.filter(article=self.article).delete()
+
+        rows = '{"author": "zxcvbnasdf_", "title": "장고", "content": "내용"}\n'
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "article.jsonl")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(rows)
+            call_command("import_articles", "article", path, stdout=StringIO())
+
+        imported = Article.objects.get(title="장고")
+        self.assertEqual(
+            list(FeedEntry.objects.values_list("owner_id", "article_id")),
+            [(follower.id, imported.id)],
+        )
+        response = self.client.get(reverse("article_search"), {"q": "장고"})
+        self.assertEqual([a["id"] for a in response.data["results"]], [imported.id])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.articles_count, 2)
+
+    def test_admin_endpoint(self):
+        url = reverse("article_transfer", args=["article"])
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+        self.assertEqual(self.client.get(path=url, **auth).status_code, 403)
+
+        User.objects.filter(id=self.user.id).update(is_admin=True)
+        response = self.client.get(path=f"{url}?type=csv", **auth)
+        self.assertEqual(response.status_code, 200)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,author,title,content,created_at,updated_at")
+        self.assertEqual(len(lines), 2)
+
+        row = '{"author": "zxcvbnasdf_", "title": "새 글", "content": "내용"}\n'
+        upload = SimpleUploadedFile("article.jsonl", row.encode())
+        response = self.client.post(path=url, data={"file": upload}, **auth)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"created": 1, "skipped": 0})
+        self.assertTrue(Article.objects.filter(title="새 글").exists())
+
+    def test_import_in_batches(self):
+        """
+        여러 batch로 나누어 가져와도 batch마다 저장된 수를 갱신하고, 앞의 batch와 겹치는 id를 찾는다.
+        """
+        User.objects.filter(id=self.user.id).update(is_admin=True)
+        url = reverse("article_transfer", args=["article"]) + "?batch_size=2"
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+        rows = "".join(
+            '{"author": "zxcvbnasdf_", "title": "새 글", "content": "내용", "id": %d}\n'
+            % (100 + i)
+            for i in range(5)
+        )
+        upload = SimpleUploadedFile("article.jsonl", rows.encode())
+        response = self.client.post(path=url, data={"file": upload}, **auth)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data, {"created": 5, "skipped": 0})
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.articles_count, 6)
+
+        rows = (
+            '{"author": "zxcvbnasdf_", "title": "다른 글", "content": "", "id": %d}\n'
+        )
+        rows = "".join(rows % pk for pk in (200, 201, 200))
+        upload = SimpleUploadedFile("article.jsonl", rows.encode())
+        response = self.client.post(path=url, data={"file": upload}, **auth)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["line"], 3)
+        self.assertFalse(Article.objects.filter(title="다른 글").exists())
+
+    def test_invalid_rows(self):
+        """
+        잘못된 행이 있으면 그 줄 번호와 함께 400을 반환하고 앞의 batch도 저장하지 않는다.
+        """
+        User.objects.filter(id=self.user.id).update(is_admin=True)
+        url = reverse("article_transfer", args=["article"]) + "?batch_size=1"
+        valid = '{"author": "zxcvbnasdf_", "title": "새 글", "content": "내용"}'
+        invalid_rows = [
+            '{"author": "zxcvbnasdf_", "title": "새 글"}',
+            '{"author": "zxcvbnasdf_", "title": "새 글", "content": "", "id": "a"}',
+            '{"author": "zxcvbnasdf_", "title": "새 글", "content": "",'
+            ' "created_at": "어제"}',
+            '{"author": "zxcvbnasdf_", "title": "새 글", "content": "", "id": %d}'
+            % self.article.id,
+            "[1, 2]",
+            "{",
+        ]
+        for invalid in invalid_rows:
+            rows = "\n".join([valid, "", invalid, valid]).encode()
+            upload = SimpleUploadedFile("article.jsonl", rows)
+            response = self.client.post(
+                path=url,
+                data={"file": upload},
+                HTTP_AUTHORIZATION=f"Bearer {self.access}",
+            )
+            self.assertEqual(response.status_code, 400, invalid)
+            self.assertEqual(response.data["line"], 3)
+            self.assertFalse(Article.objects.filter(title="새 글").exists())
+
+        rows = "id,article,author,content,created_at,updated_at\n"
+        rows += "5,1,zxcvbnasdf_,댓글,,\n5,1,zxcvbnasdf_,댓글,,\n"
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, "comment.csv")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(rows)
+            with self.assertRaisesMessage(CommandError, "3번째 줄"):
+                call_command("import_articles", "comment", path, stdout=StringIO())
+        self.assertFalse(Comment.objects.filter(id=5).exists())
+
+
+class StreamingListTestCase(ArticleBaseTestCase):
+    """
+    pagination 없이 목록 전체를 스트리밍하는 응답을 검증하는 케이스
+    """
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_json_stream(self):
+        Article.objects.bulk_create(
+            Article(author=self.user, title=f"제목{i}", content="내용")
+            for i in range(30)
+        )
+        self.user.like_articles.add(self.article)
+        with patch.object(ArticleView, "stream_chunk_size", 7):
+            response = self.client.get(
+                path=reverse("article_view") + "?stream=1",
+                HTTP_AUTHORIZATION=f"Bearer {self.access}",
+            )
+            articles = json.loads(self.read(response))
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(len(articles), 31)
+        expected = Article.objects.order_by("-created_at", "-id")
+        self.assertEqual(
+            [a["id"] for a in articles], list(expected.values_list("id", flat=True))
+        )
+        self.assertEqual(
+            [a["id"] for a in articles if a["is_liked"]], [self.article.id]
+        )
+
+    def test_ndjson_comments(self):
+        Comment.objects.bulk_create(
+            Comment(author=self.user, article=self.article, content=f"댓글{i}")
+            for i in range(25)
+        )
+        url = reverse("comment_view", args=[self.article.id])
+        response = self.client.get(path=url, HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = self.read(response).splitlines()
+        self.assertEqual(
+            [json.loads(line)["content"] for line in lines],
+            [f"댓글{i}" for i in range(25)],
+        )
+
+        # 스트리밍 여부에 따라 ETag가 달라집니다.
+        etag = response["ETag"]
+        self.assertNotEqual(self.client.get(path=url)["ETag"], etag)
+
+
+class MetricsMiddlewareTestCase(ArticleBaseTestCase):
+    """
+    요청별 측정 미들웨어와 /metrics/를 검증하는 케이스
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        registry.clear()
+        profile_keeper.slowest.clear()
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.profile_dir = directory.name
+
+    def test_metrics(self):
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+        with self.settings(
+            METRICS_ENABLED=True,
+            METRICS_PROFILE_SAMPLE_RATE=1,
+            METRICS_PROFILE_DIR=self.profile_dir,
+            METRICS_PROFILE_KEEP=1,
+        ):
+            # 미들웨어는 client의 첫 요청에서 불러오므로 설정을 바꾼 뒤 새로 만듭니다.
+            self.client = self.client_class()
+            for _ in range(2):
+                response = self.client.get(path=reverse("article_view"))
+                self.assertEqual(response.status_code, 200)
+            self.assertEqual(self.client.get("/metrics/", **auth).status_code, 403)
+
+            User.objects.filter(id=self.user.id).update(is_admin=True)
+            response = self.client.get("/metrics/", **auth)
+        self.assertEqual(response.status_code, 200)
+        text = response.content.decode()
+        labels = 'view="article_view",method="GET"'
+        self.assertIn(f"drf_http_request_duration_seconds_count{{{labels}}} 2", text)
+        queries = ArticleListQueryTestCase.QUERY_BUDGET * 2
+        self.assertIn(f"drf_db_queries_sum{{{labels}}} {queries}", text)
+        self.assertIn(f'drf_response_size_bytes_bucket{{{labels},le="+Inf"}} 2', text)
+        self.assertIn(f"drf_serializer_duration_seconds_count{{{labels}}} 2", text)
+
+        profiles = os.listdir(self.profile_dir)
+        self.assertEqual(
+            len([name for name in profiles if name.startswith("article_view-")]), 1
+        )
+
+    def test_disabled(self):
+        self.client.get(path=reverse("article_view"))
+        self.assertEqual(registry.histograms, {})
+
+
+class QueryCheckTestCase(ArticleBaseTestCase):
+    """
+    N+1 쿼리와 view의 query_budget 검사를 검증하는 케이스
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        super().setUpTestData()
+        for i in range(3):
+            author = User.objects.create_user(
+                username=f"querycheck{i}",
+                email=f"querycheck{i}@naver.com",
+                password="asdf1234!!",
+            )
+            Comment.objects.create(author=author, article=cls.article, content="댓글")
+
+    def test_query_shape(self):
+        self.assertEqual(
+            query_shape("SELECT * FROM a WHERE id IN (%s, %s, %s) LIMIT 10"),
+            query_shape("SELECT * FROM a WHERE id IN (%s) LIMIT 20"),
+        )
+
+    def test_n_plus_one(self):
+        with self.assertRaises(QueryCheckError) as raised:
+            with check_queries():
+                CommentSerializer(Comment.objects.all(), many=True).data
+        self.assertIn("CommentSerializer.author", str(raised.exception))
+
+        with check_queries():
+            CommentSerializer(Comment.objects.select_related("author"), many=True).data
+
+    def test_budget(self):
+        # 테스트는 TestRunner로 실행되어 모든 요청을 검사합니다.
+        self.assertEqual(settings.QUERY_CHECK, "raise")
+        self.assertEqual(self.client.get(reverse("article_view")).status_code, 200)
+        with patch.object(ArticleView, "query_budget", {"GET": 1}):
+            with self.assertRaises(QueryCheckError) as raised:
+                self.client.get(reverse("article_view"))
+        self.assertIn("query_budget 1개", str(raised.exception))
+
+
+class ReplicaRoutingTestCase(ArticleBaseTestCase):
+    """
+    replica 라우팅과 쓰기 후 primary 고정을 검증하는 케이스
+    """
+
+    def route(self, method, view_class, user):
+        """
+        view_class를 처리하는 요청 안에서 게시글 조회가 향하는 DB alias를 반환합니다.
+        """
+        router = ReplicaRouter()
+
+        def get_response(request):
+            middleware.process_view(request, view_class.as_view(), (), {})
+            # DRF가 view 안에서 인증한 뒤처럼 request.user를 설정합니다.
+            request.user = user
+            return HttpResponse(router.db_for_read(Article) or "default")
+
+        middleware = ReplicaMiddleware(get_response)
+        request = getattr(RequestFactory(), method)("/")
+        return middleware(request).content.decode()
+
+    def test_routing(self):
+        self.assertIsNone(ReplicaRouter().db_for_read(Article))
+        with self.settings(DATABASE_REPLICAS=["replica0"]):
+            self.assertEqual(
+                self.route("get", ArticleView, AnonymousUser()), "replica0"
+            )
+            self.assertEqual(self.route("get", ArticleView, self.user), "replica0")
+            self.assertEqual(self.route("get", LikeView, self.user), "default")
+            # 캐시에 저장할 프로필은 replica가 아닌 primary에서 만듭니다.
+            self.assertEqual(self.route("get", ProfileView, AnonymousUser()), "default")
+            self.assertEqual(self.route("post", ArticleView, self.user), "default")
+
+            # 쓰기 요청을 보낸 유저만 REPLICA_STICKY_SECONDS 동안 primary에서 읽습니다.
+            self.assertEqual(self.route("get", ArticleView, self.user), "default")
+            self.assertEqual(
+                self.route("get", ArticleView, AnonymousUser()), "replica0"
+            )
+
+
+class AsyncViewTestCase(ArticleBaseTestCase):
+    """
+    async view가 같은 이름의 동기 view와 같은 응답을 반환하는지 검증하는 케이스
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.other = User.objects.create_user(
+            username="asyncauthor", email="async@naver.com", password="asdf1234!!"
+        )
+        set_follow(self.user, self.other)
+        for i in range(12):
+            Article.objects.create(author=self.other, title=f"제목{i}", content="내용")
+        set_like(self.article.id, self.user.id)
+        Comment.objects.create(author=self.other, article=self.article, content="댓글")
+        self.auth = {"headers": {"authorization": f"Bearer {self.access}"}}
+
+    def test_async_middleware(self):
+        """
+        미들웨어가 모두 async로 동작하므로 ASGI 요청을 sync thread로 옮기지 않는다.
+        """
+        with self.settings(DEBUG=True, METRICS_ENABLED=True):
+            # DEBUG에서는 sync 미들웨어를 감쌀 때 "... adapted for ..."를 기록합니다.
+            with self.assertLogs("django.request", "DEBUG") as logs:
+                ASGIHandler()
+        self.assertFalse([line for line in logs.output if "adapted" in line])
+
+    async def test_query_budget(self):
+        """
+        async ORM의 쿼리도 query_budget으로 검사한다.
+        """
+        with patch.object(AsyncArticleView, "query_budget", 1):
+            with self.assertRaises(QueryCheckError):
+                await self.async_client.get(reverse("async_article_view"))
+
+    async def test_detail_build(self):
+        """
+        캐시가 비어 있으면 async view도 동기 view와 같은 값을 만든다.
+        """
+        kwargs = {"article_id": self.article.id}
+        await sync_to_async(cache.clear)()
+        response = await self.async_client.get(
+            reverse("async_article_detail_view", kwargs=kwargs)
+        )
+        await sync_to_async(cache.clear)()
+        expected = await sync_to_async(self.client.get)(
+            reverse("article_detail_view", kwargs=kwargs)
+        )
+        self.assertEqual(json.loads(response.content), json.loads(expected.content))
+
+    async def assert_same(self, name, async_name, kwargs=None, data=None, **extra):
+        expected = await sync_to_async(self.client.get)(
+            reverse(name, kwargs=kwargs), data, **extra
+        )
+        response = await self.async_client.get(
+            reverse(async_name, kwargs=kwargs), data, **extra
+        )
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(
+            json.loads(response.content.decode().replace("/async", "")),
+            json.loads(expected.content),
+        )
+
+    async def test_same_responses(self):
+        article = {"article_id": self.article.id}
+        await self.assert_same("article_view", "async_article_view", **self.auth)
+        await self.assert_same(
+            "article_view", "async_article_view", data={"page": 2}, **self.auth
+        )
+        await self.assert_same("article_view", "async_article_view", data={"page": 9})
+        await self.assert_same(
+            "article_view", "async_article_view", data={"cursor": ""}, **self.auth
+        )
+        await self.assert_same("feed", "async_feed", **self.auth)
+        await self.assert_same("feed", "async_feed")
+        await self.assert_same(
+            "article_detail_view", "async_article_detail_view", article
+        )
+        await self.assert_same(
+            "article_detail_view", "async_article_detail_view", {"article_id": 0}
+        )
+        await self.assert_same("comment_view", "async_comment_view", article)
+
+    async def test_invalid_cursor(self):
+        article = {"article_id": self.article.id}
+        for name, kwargs in [
+            ("async_article_view", None),
+            ("async_comment_view", article),
+        ]:
+            for cursor in INVALID_CURSORS:
+                response = await self.async_client.get(
+                    reverse(name, kwargs=kwargs), {"cursor": cursor}
+                )
+                self.assertEqual(response.status_code, 404, cursor)
+
+
+class MediaServeTestCase(SimpleTestCase):
+    """
+    파일 응답의 캐시 헤더, Range, 조건부 요청, 웹 서버로 전송 위임을 검증하는 케이스
+    """
+
+    HASHED = "profile/1/0123456789abcdef0123456789abcdef.jpg"
+    CONTENT = bytes(range(256)) * 40
+
+    def setUp(self) -> None:
+        root = TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        self.root = root.name
+        for name in (self.HASHED, "legacy.txt"):
+            path = os.path.join(self.root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as file:
+                file.write(self.CONTENT)
+
+    def get(self, name=HASHED, **headers):
+        request = RequestFactory().get(f"/media/{name}", **headers)
+        response = media.serve(request, name, document_root=self.root)
+        body = b""
+        if response.streaming:
+            body = b"".join(response.streaming_content)
+            response.close()
+        return response, body
+
+    def test_full_and_cache_headers(self):
+        response, body = self.get()
+        self.assertEqual((response.status_code, body), (200, self.CONTENT))
+        self.assertEqual(response["Content-Length"], str(len(self.CONTENT)))
+        self.assertEqual(response["Cache-Control"], media.IMMUTABLE_CACHE_CONTROL)
+        response, _ = self.get("legacy.txt")
+        self.assertEqual(response["Cache-Control"], media.REVALIDATE_CACHE_CONTROL)
+
+        etag = response["ETag"]
+        response, body = self.get("legacy.txt", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, body), (304, b""))
+        with self.assertRaises(Http404):
+            self.get("../tests.py")
+
+    def test_range(self):
+        size = len(self.CONTENT)
+        response, body = self.get(HTTP_RANGE="bytes=10-19")
+        self.assertEqual((response.status_code, body), (206, self.CONTENT[10:20]))
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{size}")
+        self.assertEqual(self.get(HTTP_RANGE="bytes=-5")[1], self.CONTENT[-5:])
+        self.assertEqual(self.get(HTTP_RANGE="bytes=9000-")[1], self.CONTENT[9000:])
+
+        response, _ = self.get(HTTP_RANGE=f"bytes={size}-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{size}")
+        # 여러 구간이나 파일이 바뀐 경우(If-Range 불일치)에는 전체를 보냅니다.
+        response, body = self.get(HTTP_RANGE="bytes=0-1,5-6")
+        self.assertEqual((response.status_code, body), (200, self.CONTENT))
+        response, body = self.get(HTTP_RANGE="bytes=0-1", HTTP_IF_RANGE='"old"')
+        self.assertEqual((response.status_code, body), (200, self.CONTENT))
+
+    @override_settings(MEDIA_OFFLOAD_HEADER="X-Accel-Redirect")
+    def test_offload(self):
+        response, body = self.get()
+        self.assertEqual((response.status_code, response.content), (200, b""))
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected/media/{self.HASHED}"
+        )
+        with self.settings(MEDIA_OFFLOAD_HEADER="X-Sendfile"):
+            response, _ = self.get()
+        self.assertEqual(response["X-Sendfile"], os.path.join(self.root, self.HASHED))
+
+
+class ThrottleTestCase(ArticleBaseTestCase):
+    """
+    토글, 댓글 작성, 로그인의 반복 요청이 유저/IP/username마다 제한되는지 검증하는 케이스
+    """
+
+    def rates(self, **rates):
+        rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": rates}
+        return self.settings(REST_FRAMEWORK=rest_framework)
+
+    def like(self, access=None):
+        url = reverse("like_view", args=[self.article.id])
+        return self.client.put(
+            path=url, HTTP_AUTHORIZATION=f"Bearer {access or self.access}"
+        )
+
+    def test_user_and_ip(self):
+        other = User.objects.create_user(
+            username="qwertyasdf_", email="qwer@naver.com", password="asdf1234!!"
+        )
+        other_access = self.client.post(
+            reverse("token"), {"username": "qwertyasdf_", "password": "asdf1234!!"}
+        ).data["access"]
+        with self.rates(**{"toggle.user": "2/min", "toggle.ip": "4/min"}):
+            self.assertEqual([self.like().status_code for _ in range(2)], [200, 200])
+            response = self.like()
+            self.assertEqual(response.status_code, 429)
+            self.assertTrue(0 < int(response["Retry-After"]) <= 30)
+            # 조회는 제한하지 않습니다.
+            url = reverse("comment_view", args=[self.article.id])
+            self.assertEqual(self.client.get(path=url).status_code, 200)
+
+            # 다른 유저는 유저 제한이 남아 있지만 같은 IP의 제한에 걸립니다.
+            # 유저 제한에 걸린 요청은 IP의 요청 수에 포함되지 않습니다.
+            codes = [self.like(other_access).status_code for _ in "abc"]
+            self.assertEqual(codes, [200, 200, 429])
+
+    def test_rejected_request_spends_nothing(self):
+        """
+        뒤의 throttle이 거절한 요청은 앞의 throttle의 token도 쓰지 않는다.
+        """
+        for store in ("local", "cache"):
+            reset_throttles()
+            cache.clear()
+            with self.settings(THROTTLE_STORE=store):
+                with self.rates(**{"toggle.user": "3/min", "toggle.ip": "2/min"}):
+                    codes = [self.like().status_code for _ in "abc"]
+                    self.assertEqual(codes, [200, 200, 429], store)
+                    # IP 제한에 걸린 요청이 유저의 token을 쓰지 않았으므로 다른 IP에서는 한 번 더 요청할 수 있습니다.
+                    url = reverse("like_view", args=[self.article.id])
+                    codes = [
+                        self.client.put(
+                            path=url,
+                            HTTP_AUTHORIZATION=f"Bearer {self.access}",
+                            REMOTE_ADDR="10.0.0.1",
+                        ).status_code
+                        for _ in "ab"
+                    ]
+                    self.assertEqual(codes, [200, 429], store)
+
+    def test_login_username(self):
+        data = {"username": "zxcvbnasdf_", "password": "wrong"}
+        with self.rates(**{"login.username": "2/min"}):
+            url = reverse("token")
+            codes = [self.client.post(url, data).status_code for _ in "abc"]
+            self.assertEqual(codes, [401, 401, 429])
+            data["username"] = "ZXCVBNASDF_"
+            self.assertEqual(self.client.post(reverse("token"), data).status_code, 429)
+            # 다른 IP에서는 같은 username으로 로그인할 수 있습니다.
+            data = {"username": "zxcvbnasdf_", "password": "asdf1234!!"}
+            response = self.client.post(url, data, REMOTE_ADDR="10.0.0.1")
+            self.assertEqual(response.status_code, 200)
+
+    def test_spoofed_forwarded_for(self):
+        """
+        NUM_PROXIES만큼의 proxy가 붙인 주소만 사용하므로 X-Forwarded-For를 바꿔도 IP 제한을 피할 수 없다.
+        """
+        url = reverse("token")
+        data = {"username": "nobody", "password": "wrong"}
+        with self.rates(**{"login.ip": "2/min"}):
+            codes = [
+                self.client.post(
+                    url, data, HTTP_X_FORWARDED_FOR=f"10.0.0.{i}"
+                ).status_code
+                for i in range(3)
+            ]
+            self.assertEqual(codes, [401, 401, 429])
+
+        reset_throttles()
+        rest_framework = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"login.ip": "2/min"},
+            "NUM_PROXIES": 1,
+        }
+        with self.settings(REST_FRAMEWORK=rest_framework):
+            # proxy가 붙인 마지막 주소가 client의 IP입니다.
+            forwarded = ["1.1.1.1, 10.0.0.1", "1.1.1.1, 10.0.0.1", "1.1.1.1, 10.0.0.2"]
+            codes = [
+                self.client.post(url, data, HTTP_X_FORWARDED_FOR=value).status_code
+                for value in forwarded
+            ]
+            self.assertEqual(codes, [401, 401, 401])
+            response = self.client.post(url, data, HTTP_X_FORWARDED_FOR="10.0.0.1")
+            self.assertEqual(response.status_code, 429)
+
+    def test_batch_cost(self):
+        """
+        일괄 처리는 작업 수만큼 token을 쓴다.
+        """
+        operations = [
+            {"action": action, "target_id": self.article.id, "desired_state": True}
+            for action in ("like", "bookmark")
+        ]
+
+        def batch():
+            return self.client.post(
+                path=reverse("batch"),
+                data={"operations": operations},
+                format="json",
+                HTTP_AUTHORIZATION=f"Bearer {self.access}",
+            ).status_code
+
+        for store in ("local", "cache"):
+            reset_throttles()
+            cache.clear()
+            with self.settings(THROTTLE_STORE=store):
+                with self.rates(**{"batch.user": "3/min"}):
+                    self.assertEqual([batch(), batch()], [200, 429], store)
+
+    def test_cache_store(self):
+        with self.settings(THROTTLE_STORE="cache"):
+            with self.rates(**{"toggle.user": "2/min"}):
+                codes = [self.like().status_code for _ in "abc"]
+                self.assertEqual(codes, [200, 200, 429])
+
+    def test_token_bucket(self):
+        store = LocalBucketStore()
+        self.assertEqual([store.consume("k", 2, 60, 0) for _ in "abc"], [0, 0, 30])
+        # 30초마다 token 하나가 다시 채워집니다.
+        self.assertEqual(store.consume("k", 2, 60, 30), 0)
+        self.assertEqual(store.consume("k", 2, 60, 45), 15)
+        store.refund("k", 2, 60, 45)
+        self.assertEqual(store.consume("k", 2, 60, 45), 0)
+
+    def test_bucket_eviction(self):
+        """
+        bucket 수가 최대를 넘으면 가장 오래 요청이 없던 bucket 하나만 지운다.
+        """
+        store = LocalBucketStore()
+        with patch("DRF_Community_WebSite_Project.throttling.LOCAL_MAX_BUCKETS", 2):
+            store.consume("a", 1, 60, 0)
+            store.consume("b", 1, 60, 1)
+            # "a"에 다시 요청하면 "b"가 가장 오래된 bucket이 됩니다.
+            self.assertEqual(store.consume("a", 1, 60, 2), 58)
+            store.consume("c", 1, 60, 3)
+        self.assertEqual(list(store.buckets), ["a", "c"])
@@ -0,0 +1,282 @@
+"""
+게시글과 댓글을 JSONL/CSV로 내보내고 가져오는 함수들입니다. (export_articles, import_articles 명령어, article/transfer/)
+내보내기는 .iterator(chunk_size)로 읽어 한 줄씩 만들기 때문에 행 수와 관계없이 메모리 사용량이 일정합니다.
+가져오기는 batch_size개씩 작성자를 username으로 찾아 bulk_create합니다.
+bulk_create는 signal을 보내지 않으므로 저장된 수, 피드, 검색 인덱스는 finish_import에서 batch마다 가져온 행에 대해서만 반영합니다.
+"""
+
+import csv
+import io
+import json
+
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection
+from django.utils.dateparse import parse_datetime
+
+from article.cache import invalidate_article_detail, invalidate_profile
+from article.counters import rebuild_article_counts, rebuild_user_counts
+from article.feeds import fan_out_articles
+from article.models import Article, Comment
+from article.search import get_search_backend
+from user.models import User
+from DRF_Community_WebSite_Project.transactions import write_atomic
+
+FORMATS = ("jsonl", "csv")
+DEFAULT_CHUNK_SIZE = 2000
+DEFAULT_BATCH_SIZE = 1000
+
+MODELS = {"article": Article, "comment": Comment}
+
+# 종류별로 주고받는 컬럼입니다. author는 id 대신 username을 사용합니다.
+FIELDS = {
+    "article": ("id", "author", "title", "content", "created_at", "updated_at"),
+    "comment": ("id", "article", "author", "content", "created_at", "updated_at"),
+}
+LOOKUPS = {"author": "author__username", "article": "article_id"}
+TIMESTAMPS = ("created_at", "updated_at")
+
+
+def guess_format(path, default="jsonl"):
+    for fmt in FORMATS:
+        if str(path).endswith(f".{fmt}"):
+            return fmt
+    return default
+
+
+def export_rows(kind, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    kind의 행을 id 순서로 하나씩 dict로 반환합니다.
+    """
+    fields = FIELDS[kind]
+    rows = (
+        MODELS[kind]
+        .objects.order_by("id")
+        .values_list(*[LOOKUPS.get(field, field) for field in fields])
+        .iterator(chunk_size=chunk_size)
+    )
+    for row in rows:
+        yield dict(zip(fields, row))
+
+
+def encode_rows(kind, rows, fmt):
+    """
+    dict 행을 fmt 형식의 문자열로 한 줄씩 바꿉니다. csv는 header 줄을 먼저 반환합니다.
+    """
+    if fmt == "jsonl":
+        for row in rows:
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS[kind])
+    writer.writeheader()
+    yield buffer.getvalue()
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+class ImportRowError(ValueError):
+    """
+    가져올 수 없는 행이 있을 때 발생합니다. line은 파일에서 그 행의 줄 번호입니다.
+    """
+
+    def __init__(self, line, message):
+        super().__init__(f"{line}번째 줄: {message}")
+        self.line = line
+        self.message = message
+
+
+def decode_rows(lines, fmt):
+    """
+    fmt 형식의 줄들을 (줄 번호, dict 행)으로 하나씩 바꿉니다.
+    """
+    if fmt == "jsonl":
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                raise ImportRowError(number, "JSON 형식이 아닙니다.")
+            if not isinstance(row, dict):
+                raise ImportRowError(number, "JSON 객체가 아닙니다.")
+            yield number, row
+        return
+    reader = csv.DictReader(lines)
+    try:
+        for row in reader:
+            yield reader.line_num, row
+    except csv.Error as error:
+        raise ImportRowError(reader.line_num, str(error))
+
+
+def _parse_id(value):
+    """
+    1 이상의 정수 또는 숫자 문자열을 int로 바꿉니다. 바꿀 수 없으면 None입니다.
+    """
+    if isinstance(value, str) and value.strip().isdigit():
+        value = int(value)
+    if isinstance(value, int) and not isinstance(value, bool) and 0 < value < 2**63:
+        return value
+    return None
+
+
+def _build(kind, line, row, author_id):
+    """
+    행을 검사하여 (인스턴스, 원래 작성/수정 시간)을 만듭니다. 잘못된 값이 있으면 ImportRowError를 발생시킵니다.
+    """
+    model = MODELS[kind]
+    values = {"author_id": author_id}
+    for name in ("title", "content") if kind == "article" else ("content",):
+        value = row.get(name)
+        if not isinstance(value, str):
+            raise ImportRowError(line, f"{name}가 없습니다.")
+        field = model._meta.get_field(name)
+        if field.get_internal_type() == "CharField" and len(value) > field.max_length:
+            raise ImportRowError(
+                line, f"{name}는 {field.max_length}자 이하여야 합니다."
+            )
+        values[name] = value
+    if kind == "comment":
+        values["article_id"] = _parse_id(row.get("article"))
+        if values["article_id"] is None:
+            raise ImportRowError(line, "article은 게시글 id여야 합니다.")
+    if row.get("id") not in (None, ""):
+        values["id"] = _parse_id(row["id"])
+        if values["id"] is None:
+            raise ImportRowError(line, "id는 1 이상의 정수여야 합니다.")
+
+    timestamps = {}
+    for name in TIMESTAMPS:
+        value = row.get(name)
+        if value in (None, ""):
+            continue
+        try:
+            parsed = parse_datetime(value) if isinstance(value, str) else None
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ImportRowError(line, f"{name}가 올바른 시간이 아닙니다.")
+        timestamps[name] = parsed
+    return model(**values), timestamps
+
+
+def _save_batch(kind, batch):
+    """
+    (줄 번호, 인스턴스, 원래 작성/수정 시간) 목록을 저장하고 저장한 인스턴스 목록을 반환합니다.
+    id가 batch 안에서 겹치거나 이미 저장된 행(앞의 batch 포함)과 겹치면 ImportRowError를 발생시킵니다.
+    created_at/updated_at은 auto_now(_add) 때문에 bulk_create에서 현재 시간으로 바뀌므로,
+    값이 주어진 행만 bulk_update로 원래 시간을 다시 저장합니다.
+    """
+    model = MODELS[kind]
+    lines = {}
+    for line, instance, _ in batch:
+        if not instance.id:
+            continue
+        if instance.id in lines:
+            raise ImportRowError(line, f"id가 {lines[instance.id]}번째 줄과 겹칩니다.")
+        lines[instance.id] = line
+    if lines:
+        existing = model.objects.filter(id__in=lines).values_list("id", flat=True)
+        for pk in existing[:1]:
+            raise ImportRowError(lines[pk], f"id {pk}는 이미 있습니다.")
+    instances = [instance for _, instance, _ in batch]
+    model.objects.bulk_create(instances)
+    dated = []
+    for _, instance, timestamps in batch:
+        if timestamps:
+            for field, value in timestamps.items():
+                setattr(instance, field, value)
+            dated.append(instance)
+    if dated:
+        model.objects.bulk_update(dated, TIMESTAMPS)
+    return instances
+
+
+def import_rows(kind, rows, batch_size=DEFAULT_BATCH_SIZE, finish=True):
+    """
+    (줄 번호, dict 행)들을 batch_size개씩 저장하고 (저장한 수, 건너뛴 수)를 반환합니다.
+    작성자가 없거나 댓글의 게시글이 없는 행은 건너뜁니다.
+    작성자 조회, id 중복 확인, finish_import를 batch마다 수행하므로 행 수와 관계없이 메모리 사용량이 일정합니다.
+    (finish가 False면 finish_import를 생략합니다.)
+    전체를 한 트랜잭션으로 저장하므로, 잘못된 행이 있으면 ImportRowError를 발생시키고 아무것도 저장하지 않습니다.
+    """
+    created = skipped = 0
+    batch = []
+
+    def flush():
+        nonlocal created, skipped
+        usernames = {row["author"] for _, row in batch}
+        authors = dict(
+            User.objects.filter(username__in=usernames).values_list("username", "id")
+        )
+        built = []
+        for line, row in batch:
+            author_id = authors.get(row["author"])
+            if author_id is None:
+                skipped += 1
+                continue
+            built.append((line, *_build(kind, line, row, author_id)))
+        if kind == "comment":
+            article_ids = {instance.article_id for _, instance, _ in built}
+            existing = set(
+                Article.objects.filter(id__in=article_ids).values_list("id", flat=True)
+            )
+            kept = [item for item in built if item[1].article_id in existing]
+            skipped += len(built) - len(kept)
+        else:
+            kept = built
+        instances = _save_batch(kind, kept)
+        created += len(instances)
+        batch.clear()
+        if finish and instances:
+            finish_import(
+                kind,
+                {
+                    instance.id if kind == "article" else instance.article_id
+                    for instance in instances
+                },
+            )
+
+    with write_atomic():
+        for line, row in rows:
+            if not isinstance(row.get("author"), str):
+                raise ImportRowError(line, "author는 username이어야 합니다.")
+            batch.append((line, row))
+            if len(batch) >= batch_size:
+                flush()
+        if batch:
+            flush()
+
+    # id를 지정해 넣은 경우 PostgreSQL 등의 sequence가 뒤처지지 않도록 맞춥니다.
+    statements = connection.ops.sequence_reset_sql(no_style(), [MODELS[kind]])
+    if statements:
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    return created, skipped
+
+
+def finish_import(kind, related_ids):
+    """
+    bulk_create로 건너뛴 작업을 가져온 행에 대해서만 수행합니다.
+    게시글: 작성자의 articles_count, 작성자 팔로워의 피드, 검색 인덱스 / 댓글: 게시글의 comment_count
+    """
+    related_ids = sorted(related_ids)
+    for i in range(0, len(related_ids), DEFAULT_BATCH_SIZE):
+        ids = related_ids[i : i + DEFAULT_BATCH_SIZE]
+        if kind == "article":
+            author_ids = set(
+                Article.objects.filter(id__in=ids).values_list("author_id", flat=True)
+            )
+            rebuild_user_counts(User.objects.filter(id__in=author_ids))
+            fan_out_articles(ids)
+            get_search_backend().index_many(ids)
+            invalidate_profile(*author_ids)
+        else:
+            rebuild_article_counts(Article.objects.filter(id__in=ids))
+            invalidate_article_detail(*ids)
@@ -1,5 +1,5 @@
 from django.urls import path
-from article import views
+from article import async_views, views
 
 urlpatterns = [
     
@@ -11,6 +11,26 @@ urlpatterns = [
     ),
  
     path("feed/", views.FeedView.as_view(), name="feed"),
+    path("search/", views.ArticleSearchView.as_view(), name="article_search"),
+    path("batch/", views.BatchView.as_view(), name="batch"),
+    path(
+        "transfer/<str:kind>/",
+        views.ArticleTransferView.as_view(),
+        name="article_transfer",
+    ),
+    # 같은 응답을 async ORM으로 조회하는 view입니다. ASGI(asgi.py)로 실행할 때 사용합니다.
+    path("async/", async_views.AsyncArticleView.as_view(), name="async_article_view"),
+    path(
+        "async/<int:article_id>/",
+        async_views.AsyncArticleDetailView.as_view(),
+        name="async_article_detail_view",
+    ),
+    path("async/feed/", async_views.AsyncFeedView.as_view(), name="async_feed"),
+    path(
+        "async/<int:article_id>/comment/",
+        async_views.AsyncCommentView.as_view(),
+        name="async_comment_view",
+    ),
     path("<int:article_id>/like/", views.LikeView.as_view(), name="like_view"),
     path(
         "<int:article_id>/bookmark/", views.BookmarkView.as_view(), name="bookmark_view"
@@ -3,24 +3,80 @@ from rest_framework.decorators import APIView
 from rest_framework.response import Response
 from rest_framework import generics
 from rest_framework.exceptions import NotFound
-from article.models import Article, Comment
+from rest_framework.utils.urls import replace_query_param
+from article.models import Article, Comment, FeedEntry
 from article.serializers import (
     ArticleSerializer,
     ArticleListSerializer,
     ArticleCreateSerializer,
     CommentCreateSerializer,
     CommentSerializer,
+    BatchSerializer,
 )
 from article.permissions import IsOwnerOrReadOnly
-from article.paginations import ArticlePagination
+from article.paginations import (
+    ArticlePagination,
+    CommentPagination,
+    FeedPagination,
+    decode_cursor,
+    encode_cursor,
+    parse_cursor_float,
+    parse_cursor_int,
+)
+from article.search import get_search_backend
+from article.streaming import (
+    NDJSONRenderer,
+    StreamingListMixin,
+    get_stream_format,
+    streaming_response,
+)
+from rest_framework.settings import api_settings
+from article.transfer import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CHUNK_SIZE,
+    FORMATS,
+    MODELS,
+    ImportRowError,
+    decode_rows,
+    encode_rows,
+    export_rows,
+    guess_format,
+    import_rows,
+)
+from article.feeds import feed_queryset
+from article.relations import apply_batch, set_like, set_bookmark
+from article.cache import (
+    article_detail_key,
+    get_or_build,
+    invalidate_article_detail,
+    invalidate_profile,
+)
+from article.conditional import (
+    ArticleListValidatorsMixin,
+    conditional_get,
+    make_etag,
+    version_validators,
+)
+import io
+from django.conf import settings
+from django.db.models import F, Count, Max
 from django.db.models.query_utils import Q
+from django.http import StreamingHttpResponse
+from user.models import User
 from user.serializers import UserSerializer
+from DRF_Community_WebSite_Project.throttling import (
+    IPBucketThrottle,
+    UserBucketThrottle,
+)
+from DRF_Community_WebSite_Project.transactions import write_atomic
 
 
 # Create your views here.
 
 
-class ArticleView(generics.ListCreateAPIView):
+class ArticleView(
+    ArticleListValidatorsMixin, StreamingListMixin, generics.ListCreateAPIView
+):
     """
     APIview에서는 페이지네이션 기능을 사용할 수 없었습니다, 그렇기에 generics를 사용했습니다.
     ListCreateAPIView는 GET요청일 때 조회, POST요청일 때 새로운 데이터를 생성하는 역할을 합니다.
@@ -28,12 +84,19 @@ class ArticleView(generics.ListCreateAPIView):
     queryset을 통해 article의 내용을 가져옵니다.
     필요한 것을 명시해주면 간단히 get 요청을 구현할 수 있습니다.
     order_by를 이용하여 최신 게시글을 가장 먼저 출력합니다.
+    for_listing()을 사용하여 게시글 수와 관계없이 쿼리 수가 일정합니다.
     """
 
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    paginations_class = ArticlePagination
+    pagination_class = ArticlePagination
     serializer_class = ArticleListSerializer
-    queryset = Article.objects.all().order_by("-created_at")
+    queryset = Article.objects.for_listing().order_by("-created_at", "-id")
+    read_from_replica = True
+    query_budget = {"GET": 3, "POST": 8}
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         """
@@ -69,14 +132,36 @@ class ArticleDetailView(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
+    exact_last_modified = True
+    query_budget = {"GET": 3, "PUT": 5, "DELETE": 9}
+
+    def build_detail(self, article_id):
+        try:
+            article = Article.objects.select_related("author").get(id=article_id)
+        except Article.DoesNotExist:
+            raise NotFound(detail="작성한 글이 없습니다.", code=status.HTTP_404_NOT_FOUND)
+        return dict(ArticleSerializer(article).data)
+
+    def get_validators(self, request, article_id):
+        """
+        상세 조회 캐시의 버전은 게시글과 관련된 정보가 바뀔 때마다 새로 발급되므로
+        DB를 조회하지 않고 버전으로 ETag와 Last-Modified를 만듭니다.
+        """
+        return version_validators(article_detail_key(article_id), "article", article_id)
 
+    @conditional_get
     def get(self, request, article_id):
         """
         get 방식으로 접근 시 제시한 article_id의 게시글을 보여줍니다.
+        직렬화한 결과를 캐시에 저장해두고, 게시글/좋아요/북마크/댓글/작성자 정보가 바뀌면 무효화합니다.
+        If-None-Match/If-Modified-Since가 현재 버전과 같다면 304를 반환합니다.
         """
-        article = Article.objects.get(id=article_id)
-        serializer = ArticleSerializer(article)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        data = get_or_build(
+            article_detail_key(article_id),
+            lambda: self.build_detail(article_id),
+            settings.ARTICLE_DETAIL_CACHE_TIMEOUT,
+        )
+        return Response(data, status=status.HTTP_200_OK)
 
     def put(self, request, article_id):
         """
@@ -89,6 +174,7 @@ class ArticleDetailView(APIView):
         self.check_object_permissions(self.request, article)
         if serializer.is_valid():
             serializer.save()
+            invalidate_article_detail(article_id)
             return Response({"message": "수정완료"}, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -99,32 +185,106 @@ class ArticleDetailView(APIView):
         게시글 작성자와 요청자를 비교하여 같다면 delete권한을 부여합니다.
         권한이 없을 경우 권한이 없습니다 메시지가 출력됩니다.
         삭제가 완료되면 삭제완료 메시지와 상태메시지 204가 출력됩니다.
+        저장된 좋아요/댓글/북마크 수는 게시글 행에 있으므로 따로 갱신할 필요 없이 함께 삭제됩니다.
+        작성자의 articles_count는 함께 내립니다.
         """
         article = Article.objects.get(id=article_id)
         self.check_object_permissions(self.request, article)
-        article.delete()
+        with write_atomic():
+            article.delete()
+            User.objects.filter(id=article.author_id).update(
+                articles_count=F("articles_count") - 1
+            )
+        invalidate_article_detail(article_id)
+        invalidate_profile(article.author_id)
         return Response({"message": "삭제완료"}, status=status.HTTP_204_NO_CONTENT)
 
 
-class FeedView(generics.ListAPIView):
+class FeedView(ArticleListValidatorsMixin, StreamingListMixin, generics.ListAPIView):
+    """
+    팔로우한 유저들의 게시글을 최신순으로 보여줍니다.
+    게시글 작성/팔로우 시 미리 저장해둔 FeedEntry를 조회합니다. (article/feeds.py)
+    """
+
     permission_classes = [permissions.IsAuthenticated]
-    paginations_class = ArticlePagination
+    pagination_class = FeedPagination
     serializer_class = ArticleListSerializer
+    read_from_replica = True
+    query_budget = 4
 
     def get_queryset(self):
-        articles = Article.objects.select_related("author").filter(
-            author__in=self.request.user.followings.all()
+        return feed_queryset(self.request.user)
+
+    def get_stream_field(self, queryset):
+        return "article" if queryset.model is FeedEntry else None
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
+
+
+class ArticleSearchView(APIView):
+    """
+    게시글 제목과 내용을 검색합니다. (article/search.py)
+    ex)http://127.0.0.1:8000/article/search/?q=검색어
+    관련도가 높은 순으로 page_size개씩 보여주며, 응답의 next url로 다음 결과를 받습니다.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    page_size = 10
+    query_param = "q"
+    cursor_query_param = "cursor"
+    query_budget = 2
+
+    def get(self, request):
+        query = request.query_params.get(self.query_param, "").strip()
+        if not query:
+            return Response(
+                {"message": "검색어를 입력해주세요."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        cursor = request.query_params.get(self.cursor_query_param)
+        after = (
+            decode_cursor(cursor, (parse_cursor_int, parse_cursor_float))
+            if cursor
+            else None
+        )
+
+        results = get_search_backend().search(query, after, self.page_size + 1)
+        has_next = len(results) > self.page_size
+        results = results[: self.page_size]
+
+        articles = Article.objects.for_listing().in_bulk(
+            [article_id for article_id, _ in results]
+        )
+        ranked = [
+            articles[article_id] for article_id, _ in results if article_id in articles
+        ]
+        serializer = ArticleListSerializer(
+            ranked, many=True, context={"request": request}
+        )
+
+        next_url = None
+        if has_next:
+            next_url = replace_query_param(
+                request.build_absolute_uri(),
+                self.cursor_query_param,
+                encode_cursor(results[-1]),
+            )
+        return Response(
+            {"next": next_url, "results": serializer.data}, status=status.HTTP_200_OK
         )
-        return articles.order_by("-created_at")
 
 
 class LikeView(APIView):
     """
     LikeView에서는 게시글 좋아요 기능을 수행합니다.
-    article_id를 이용하여 대상을 지정하여 POST 메서드를 통해 기능을 동작합니다.
+    article_id를 이용하여 대상을 지정하여 POST 메서드(토글), PUT(좋아요), DELETE(좋아요 취소) 메서드를 통해 기능을 동작합니다.
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [UserBucketThrottle, IPBucketThrottle]
+    throttle_scope = "toggle"
+    query_budget = 5
 
     def get_object(self, article_id):
         """
@@ -132,32 +292,51 @@ class LikeView(APIView):
         작성한 게시글이 없다면 예외처리 됩니다.
         """
         try:
-            return Article.objects.get(id=article_id)
+            return Article.objects.only("id").get(id=article_id)
         except Article.DoesNotExist:
             raise NotFound(detail="작성한 글이 없습니다.", code=status.HTTP_404_NOT_FOUND)
 
+    def respond(self, liked):
+        if liked:
+            return Response({"message": "like했습니다."}, status=status.HTTP_200_OK)
+        return Response({"message": "unlike했습니다."}, status=status.HTTP_200_OK)
+
     def post(self, request, article_id):
         """
-        article_id에 해당하는 게시글을 가져오고, 해당 게시글의 likes 필드에 현재 요청한 유저가 이미 좋아요를 눌렀는지 확인합니다.
-        만약 좋아요를 눌렀다면 likes 필드에서 해당 유저를 삭제하고, 좋아요를 누르지 않았다면 likes 필드에 해당 유저를 추가합니다.
+        article_id에 해당하는 게시글에 현재 요청한 유저가 이미 좋아요를 눌렀는지 확인합니다.
+        만약 좋아요를 눌렀다면 좋아요를 취소하고, 좋아요를 누르지 않았다면 좋아요를 추가합니다.
         그리고 해당 동작에 대한 메시지와 함께 적절한 HTTP 응답 상태 코드를 반환합니다.
+        likes 전체를 불러오지 않고 through 테이블의 행 하나만 삭제/추가하며,
+        저장된 likes_count도 같은 트랜잭션 안에서 함께 갱신합니다. (article/relations.py)
         """
         article = self.get_object(article_id)
-        if request.user in article.likes.all():
-            article.likes.remove(request.user)
-            return Response({"message": "unlike했습니다."}, status=status.HTTP_200_OK)
-        else:
-            article.likes.add(request.user)
-            return Response({"message": "like했습니다."}, status=status.HTTP_200_OK)
+        return self.respond(set_like(article.id, request.user.id))
+
+    def put(self, request, article_id):
+        """
+        여러 번 요청해도 결과가 같은 좋아요입니다. 이미 좋아요 상태라면 아무것도 바꾸지 않습니다.
+        """
+        article = self.get_object(article_id)
+        return self.respond(set_like(article.id, request.user.id, True))
+
+    def delete(self, request, article_id):
+        """
+        여러 번 요청해도 결과가 같은 좋아요 취소입니다.
+        """
+        article = self.get_object(article_id)
+        return self.respond(set_like(article.id, request.user.id, False))
 
 
 class BookmarkView(APIView):
     """
     BookmarkView에서는 게시글 북마크 기능을 수행합니다.
-    article_id를 이용하여 대상을 지정하여 POST 메서드를 통해 기능을 동작합니다.
+    article_id를 이용하여 대상을 지정하여 POST 메서드(토글), PUT(북마크), DELETE(북마크 해제) 메서드를 통해 기능을 동작합니다.
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [UserBucketThrottle, IPBucketThrottle]
+    throttle_scope = "toggle"
+    query_budget = 5
 
     def get_object(self, article_id):
         """
@@ -165,61 +344,224 @@ class BookmarkView(APIView):
         북마크한 게시글이 없다면 예외처리 됩니다.
         """
         try:
-            return Article.objects.get(id=article_id)
+            return Article.objects.only("id").get(id=article_id)
         except Article.DoesNotExist:
             raise NotFound(detail="작성한 글이 없습니다.", code=status.HTTP_404_NOT_FOUND)
 
+    def respond(self, bookmarked):
+        if bookmarked:
+            return Response({"message": "북마크가 추가되었습니다."}, status=status.HTTP_200_OK)
+        return Response({"message": "북마크가 해제되었습니다."}, status=status.HTTP_200_OK)
+
     def post(self, request, article_id):
         """
-        article_id에 해당하는 게시글을 가져오고, 해당 게시글의 bookmark 필드에 현재 요청한 유저가 이미 북마크를 눌렀는지 확인합니다.
-        만약 북마크를 눌렀다면 bookmark 필드에서 해당 유저를 삭제하고, 북마크를 누르지 않았다면 bookmark 필드에 해당 유저를 추가합니다.
+        article_id에 해당하는 게시글에 현재 요청한 유저가 이미 북마크를 눌렀는지 확인합니다.
+        만약 북마크를 눌렀다면 북마크를 해제하고, 북마크를 누르지 않았다면 북마크를 추가합니다.
         그리고 해당 동작에 대한 메시지와 함께 적절한 HTTP 응답 상태 코드를 반환합니다.
+        bookmarks 전체를 불러오지 않고 through 테이블의 행 하나만 삭제/추가하며,
+        저장된 bookmark_count도 같은 트랜잭션 안에서 함께 갱신합니다. (article/relations.py)
         """
         article = self.get_object(article_id)
-        if request.user in article.bookmarks.all():
-            article.bookmarks.remove(request.user)
-            return Response({"message": "북마크가 해제되었습니다."}, status=status.HTTP_200_OK)
-        else:
-            article.bookmarks.add(request.user)
-            return Response({"message": "북마크가 추가되었습니다."}, status=status.HTTP_200_OK)
+        return self.respond(set_bookmark(article.id, request.user.id))
+
+    def put(self, request, article_id):
+        """
+        여러 번 요청해도 결과가 같은 북마크 추가입니다.
+        """
+        article = self.get_object(article_id)
+        return self.respond(set_bookmark(article.id, request.user.id, True))
+
+    def delete(self, request, article_id):
+        """
+        여러 번 요청해도 결과가 같은 북마크 해제입니다.
+        """
+        article = self.get_object(article_id)
+        return self.respond(set_bookmark(article.id, request.user.id, False))
 
 
-class BookmarkListView(generics.ListAPIView):
+class BatchView(APIView):
+    """
+    오프라인에서 쌓인 좋아요/북마크/팔로우 작업을 요청 한 번으로 적용합니다.
+    {"operations": [{"action": "like", "target_id": 1, "desired_state": true}, ...]}
+    항목마다 적용 후 상태(state)와 실제로 바뀌었는지(changed), 또는 실패 이유(error)를 순서대로 반환합니다.
+    (not_found: 게시글/유저가 없음, self_follow: 자기 자신 팔로우)
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [UserBucketThrottle, IPBucketThrottle]
+    throttle_scope = "batch"
+    query_budget = 21
+
+    def get_throttle_cost(self, request):
+        """
+        작업마다 token 하나를 사용하여 토글 제한을 일괄 처리로 피하지 못하도록 합니다.
+        """
+        data = request.data
+        operations = data.get("operations") if hasattr(data, "get") else None
+        return len(operations) if isinstance(operations, list) and operations else 1
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        if serializer.is_valid():
+            results = apply_batch(
+                request.user.id, serializer.validated_data["operations"]
+            )
+            return Response({"results": results}, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ArticleTransferView(APIView):
+    """
+    관리자가 게시글/댓글(kind)을 JSONL/CSV로 내보내거나(GET) 가져옵니다(POST). (article/transfer.py)
+    GET은 행을 한 줄씩 만들어 StreamingHttpResponse로 내려보내므로 행 수와 관계없이 메모리 사용량이 일정합니다.
+    POST는 file 필드로 받은 파일을 batch_size개씩 bulk_create하며 batch마다 가져온 행의 저장된 수/피드/검색 인덱스를 갱신합니다.
+    잘못된 행이 있으면 아무것도 저장하지 않고 그 행의 줄 번호(line)와 함께 400을 반환합니다.
+    형식은 type param(jsonl, csv)으로 정하며, 생략하면 jsonl(POST는 파일 확장자)을 사용합니다.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    content_types = {"jsonl": "application/x-ndjson", "csv": "text/csv"}
+    query_budget = {"GET": 1}
+    # POST는 batch마다 같은 쿼리를 실행하여 쿼리 수가 파일의 batch 수에 비례하므로 검사하지 않습니다.
+    query_check_exempt_methods = ("POST",)
+
+    def check_kind(self, kind):
+        if kind not in MODELS:
+            raise NotFound(detail="article 또는 comment만 가능합니다.")
+
+    def get_int_param(self, request, name, default):
+        try:
+            return max(int(request.query_params.get(name, default)), 1)
+        except ValueError:
+            return default
+
+    def get(self, request, kind):
+        self.check_kind(kind)
+        fmt = request.query_params.get("type", "jsonl")
+        if fmt not in FORMATS:
+            return Response(
+                {"message": "jsonl 또는 csv만 가능합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        chunk_size = self.get_int_param(request, "chunk_size", DEFAULT_CHUNK_SIZE)
+        response = StreamingHttpResponse(
+            encode_rows(kind, export_rows(kind, chunk_size), fmt),
+            content_type=self.content_types[fmt],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{kind}.{fmt}"'
+        return response
+
+    def post(self, request, kind):
+        self.check_kind(kind)
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"message": "file을 첨부해주세요."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        fmt = request.query_params.get("type") or guess_format(upload.name)
+        if fmt not in FORMATS:
+            return Response(
+                {"message": "jsonl 또는 csv만 가능합니다."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        batch_size = self.get_int_param(request, "batch_size", DEFAULT_BATCH_SIZE)
+        lines = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        try:
+            created, skipped = import_rows(kind, decode_rows(lines, fmt), batch_size)
+        except ImportRowError as error:
+            return Response(
+                {"message": error.message, "line": error.line},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            {"created": created, "skipped": skipped}, status=status.HTTP_201_CREATED
+        )
+
+
+class BookmarkListView(
+    ArticleListValidatorsMixin, StreamingListMixin, generics.ListAPIView
+):
     """
     BookmarkListView에서는 사용자가 북마크한 게시물을 가져와서 제공하는 기능을 수행합니다.
     """
 
     permission_classes = [permissions.IsAuthenticated]
-    paginations_class = ArticlePagination
+    pagination_class = ArticlePagination
     serializer_class = ArticleListSerializer
+    query_budget = 3
 
     def get_queryset(self):
-        articles = self.request.user.bookmarked_articles.all()
-        return articles.order_by("-created_at")
+        articles = Article.objects.for_listing().filter(
+            bookmarks=self.request.user.id
+        )
+        return articles.order_by("-created_at", "-id")
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
 
 
 class CommentView(APIView):
     """
     댓글을 작성하는 공간입니다.
     GET 요청을 처리하여 특정 게시물의 댓글 데이터를 반환하는 기능을 담당합니다.
-    get() 메소드는 특정 게시물에 대한 댓글 데이터를 조회하여 시리얼라이즈한 후,
-    해당 데이터를 JSON 형식으로 응답으로 반환합니다.
+    get() 메소드는 특정 게시물에 대한 댓글 데이터를 cursor pagination으로 나누어 조회하여 시리얼라이즈한 후,
+    해당 데이터를 JSON 형식({"next": 다음 페이지 url, "results": 댓글 목록})으로 응답으로 반환합니다.
+    post() 메소드는 댓글을 저장하면서 게시글의 comment_count를 함께 올립니다.
     """
 
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+    read_from_replica = True
+    throttle_classes = [UserBucketThrottle, IPBucketThrottle]
+    throttle_scope = "comment"
+    query_budget = 3
+
+    def get_validators(self, request, article_id):
+        summary = Comment.objects.filter(article_id=article_id).aggregate(
+            last_modified=Max("updated_at"), count=Count("id")
+        )
+        etag = make_etag(
+            request.get_full_path(),
+            article_id,
+            summary["last_modified"],
+            summary["count"],
+        )
+        return etag, summary["last_modified"]
 
+    @conditional_get
     def get(self, request, article_id):
-        article = Article.objects.get(id=article_id)
-        comments = article.comment_set.all()
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        """
+        댓글을 작성순으로 CommentPagination의 page_size개씩 보여줍니다.
+        newest param을 주면 최신 댓글부터 보여줍니다.
+        작성자를 join하여 가져오므로 댓글 수와 관계없이 쿼리 수가 일정합니다.
+        stream param이나 Accept: application/x-ndjson을 주면 pagination 없이 전체 댓글을 스트리밍합니다.
+        """
+        if not Article.objects.filter(id=article_id).exists():
+            raise NotFound(detail="작성한 글이 없습니다.", code=status.HTTP_404_NOT_FOUND)
+        comments = Comment.objects.select_related("author").filter(
+            article_id=article_id
+        )
+        if get_stream_format(request):
+            return streaming_response(
+                request, comments.order_by("created_at", "id"), CommentSerializer
+            )
+        paginator = CommentPagination()
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = CommentSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request, article_id):
         serializer = CommentCreateSerializer(
             data=request.data, context={"request": request}
         )
         if serializer.is_valid():
-            serializer.save(author=request.user, article_id=article_id)
+            with write_atomic():
+                serializer.save(author=request.user, article_id=article_id)
+                Article.objects.filter(id=article_id).update(
+                    comment_count=F("comment_count") + 1
+                )
+            invalidate_article_detail(article_id)
             return Response(
                 {"message": "작성완료"},
                 status=status.HTTP_201_CREATED,
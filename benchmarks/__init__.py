@@ -0,0 +1,77 @@
+"""
+API 성능 측정용 스크립트 모음입니다.
+python -m benchmarks.<이름> 형태로 프로젝트 루트에서 실행합니다.
+실행할 때마다 임시 테스트 DB를 만들어 사용하므로 개발 DB(db.sqlite3)에는 영향이 없습니다.
+"""
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+
+def setup_django():
+    """
+    manage.py와 같은 설정으로 django를 초기화합니다.
+    """
+    os.environ.setdefault(
+        "DJANGO_SETTINGS_MODULE", "DRF_Community_WebSite_Project.settings"
+    )
+    os.environ.setdefault("SECRET_KEY", "benchmark")
+    # 개발용 N+1 검사(QUERY_CHECK)는 측정값에 섞이지 않도록 끕니다.
+    os.environ.setdefault("QUERY_CHECK", "")
+    # 적은 수의 유저로 반복 요청하므로 throttle도 끕니다.
+    os.environ.setdefault("THROTTLE_ENABLED", "0")
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def test_database(verbosity=0, name=None):
+    """
+    테스트 러너와 같은 방식으로 임시 DB를 만들고, 끝나면 삭제합니다.
+    name을 주면 그 파일에 DB를 만들어 다른 프로세스에서도 같은 DB를 사용할 수 있습니다.
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    if name is not None:
+        connection.settings_dict["TEST"]["NAME"] = str(name)
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=verbosity)
+        teardown_test_environment()
+
+
+def measure(func, repeat):
+    """
+    func를 repeat번 실행하고 각 실행 시간(초) 목록을 반환합니다.
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def summarize(samples):
+    """
+    실행 시간 목록을 ms 단위의 p50/p95/p99/평균으로 요약합니다.
+    """
+    ordered = sorted(samples)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000
+
+    return {
+        "count": len(ordered),
+        "p50_ms": round(percentile(50), 3),
+        "p95_ms": round(percentile(95), 3),
+        "p99_ms": round(percentile(99), 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+    }
@@ -0,0 +1,355 @@
+"""
+합성 데이터(benchmarks.data) 위에서 주요 API 시나리오를 반복 요청하여 p50/p95/p99, 처리량, 요청당 쿼리 수를 잽니다.
+--mode inprocess는 django test Client로 한 프로세스 안에서, --mode server는 runserver를 --workers개 띄워 HTTP로 요청합니다.
+결과는 JSON으로 출력되며 --output으로 저장해두고 다른 커밋에서 --compare로 비교할 수 있습니다.
+ex) python -m benchmarks.api --mode server --workers 4 --concurrency 8 --output baseline.json
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks import data, setup_django, summarize, test_database
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+# 시나리오 이름: (method, URL 이름, 로그인 필요 여부)
+# URL 이름은 /metrics/의 view label과 같으며 server 모드의 쿼리 수를 찾는 데 사용합니다.
+SCENARIOS = {
+    "article_list": ("GET", "article_view", False),
+    "feed": ("GET", "feed", True),
+    "article_detail": ("GET", "article_detail_view", False),
+    "comment_list": ("GET", "comment_view", False),
+    "like_toggle": ("POST", "like_view", True),
+    "login": ("POST", "token", False),
+}
+
+
+def build_requests(scenario, count, rng, fixture):
+    """
+    시나리오의 요청 (path, body, token) 목록을 만듭니다. 같은 seed면 같은 순서로 요청합니다.
+    """
+    from django.urls import reverse
+
+    _, url_name, needs_token = SCENARIOS[scenario]
+    requests = []
+    for _ in range(count):
+        user_id = rng.choice(fixture["user_ids"])
+        token = fixture["tokens"][user_id] if needs_token else None
+        body = None
+        if scenario in ("article_detail", "comment_list", "like_toggle"):
+            path = reverse(
+                url_name, kwargs={"article_id": rng.choice(fixture["article_ids"])}
+            )
+        else:
+            path = reverse(url_name)
+        if scenario == "article_list":
+            path += f"?page={rng.randint(1, 5)}"
+        if scenario == "login":
+            body = {
+                "username": fixture["usernames"][user_id],
+                "password": data.PASSWORD,
+            }
+        requests.append((path, body, token))
+    return requests
+
+
+def build_fixture():
+    from article.models import Article
+    from user.models import User
+    from user.serializers import MyTokenObtainSerializer
+
+    users = list(User.objects.order_by("id").values_list("id", "username"))
+    tokens = {
+        user.id: str(MyTokenObtainSerializer.get_token(user).access_token)
+        for user in User.objects.all()
+    }
+    admin = User.objects.create_superuser(
+        username="benchadmin", email="benchadmin@example.com", password=data.PASSWORD
+    )
+    return {
+        "user_ids": [user_id for user_id, _ in users],
+        "usernames": dict(users),
+        "article_ids": list(Article.objects.values_list("id", flat=True)),
+        "tokens": tokens,
+        "admin_token": str(MyTokenObtainSerializer.get_token(admin).access_token),
+    }
+
+
+def run_inprocess(requests, method):
+    """
+    test Client로 순서대로 요청하며 (응답 시간 목록, 전체 시간, 요청당 쿼리 수, 실패 수)를 반환합니다.
+    """
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    samples = []
+    queries = 0
+    errors = 0
+    started = time.perf_counter()
+    for path, body, token in requests:
+        extra = {"HTTP_AUTHORIZATION": f"Bearer {token}"} if token else {}
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = client.generic(
+                method,
+                path,
+                json.dumps(body) if body else "",
+                content_type="application/json",
+                **extra,
+            )
+            if response.streaming:
+                b"".join(response.streaming_content)
+            samples.append(time.perf_counter() - start)
+        queries += len(captured)
+        errors += response.status_code >= 400
+    elapsed = time.perf_counter() - started
+    return samples, elapsed, queries / len(requests), errors
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _send(url, method, body=None, token=None, timeout=30):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode() if body else None,
+        method=method,
+        headers={"Content-Type": "application/json"},
+    )
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read()
+
+
+class Servers:
+    """
+    같은 DB 파일을 사용하는 runserver 프로세스를 workers개 띄웁니다.
+    runserver는 --nothreading으로 한 번에 한 요청만 처리하므로 프로세스 수가 곧 worker 수입니다.
+    캐시는 CACHE_BACKEND를 지정하지 않으면 프로세스마다 따로 사용하며, 이때 응답 캐시는 사용하지 않습니다. (WEB_CONCURRENCY)
+    """
+
+    def __init__(self, workers, db_name):
+        self.ports = [_free_port() for _ in range(workers)]
+        env = {
+            **os.environ,
+            "SQLITE_NAME": str(db_name),
+            "WEB_CONCURRENCY": str(workers),
+            "METRICS_ENABLED": "1",
+            "METRICS_PROFILE_SAMPLE_RATE": "0",
+        }
+        self.processes = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "manage.py",
+                    "runserver",
+                    "--noreload",
+                    "--nothreading",
+                    "--skip-checks",
+                    f"127.0.0.1:{port}",
+                ],
+                cwd=BASE_DIR,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            for port in self.ports
+        ]
+        self.urls = itertools.cycle(self.base_urls)
+        self.lock = threading.Lock()
+
+    @property
+    def base_urls(self):
+        return [f"http://127.0.0.1:{port}" for port in self.ports]
+
+    def wait(self, timeout=30):
+        deadline = time.monotonic() + timeout
+        for port in self.ports:
+            while True:
+                try:
+                    with socket.create_connection(("127.0.0.1", port)):
+                        break
+                except OSError:
+                    if time.monotonic() > deadline:
+                        raise RuntimeError(f"{port} 포트의 서버가 시작되지 않았습니다.")
+                    time.sleep(0.1)
+
+    def next_url(self):
+        with self.lock:
+            return next(self.urls)
+
+    def queries_per_request(self, url_name, method, admin_token):
+        """
+        모든 worker의 /metrics/에서 url_name의 db_queries 합계와 개수를 모아 평균을 구합니다.
+        """
+        total = count = 0
+        labels = f'{{view="{url_name}",method="{method}"}}'
+        for base_url in self.base_urls:
+            _, body = _send(f"{base_url}/metrics/", "GET", token=admin_token)
+            for line in body.decode().splitlines():
+                if line.startswith(f"drf_db_queries_sum{labels} "):
+                    total += float(line.split()[-1])
+                elif line.startswith(f"drf_db_queries_count{labels} "):
+                    count += float(line.split()[-1])
+        return total / count if count else None
+
+    def close(self):
+        for process in self.processes:
+            process.terminate()
+        for process in self.processes:
+            process.wait()
+
+
+def run_server(servers, requests, method, concurrency):
+    """
+    concurrency개의 thread로 worker들에게 번갈아 요청하며 (응답 시간 목록, 전체 시간, 실패 수)를 반환합니다.
+    """
+
+    def send(request):
+        path, body, token = request
+        start = time.perf_counter()
+        status, _ = _send(servers.next_url() + path, method, body, token)
+        return time.perf_counter() - start, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(send, requests))
+    elapsed = time.perf_counter() - started
+    samples = [duration for duration, _ in results]
+    errors = sum(status >= 400 for _, status in results)
+    return samples, elapsed, errors
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current):
+    """
+    시나리오별로 baseline 대비 p50/p95/p99, 처리량, 요청당 쿼리 수의 변화율(%)을 계산합니다.
+    """
+    keys = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "queries_per_request")
+    changes = {}
+    for name, result in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        changes[name] = {
+            key: round((result[key] - before[key]) / before[key] * 100, 1)
+            for key in keys
+            if before.get(key) and result.get(key) is not None
+        }
+    return changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    data.add_arguments(parser)
+    parser.add_argument("--mode", choices=("inprocess", "server"), default="inprocess")
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 요청 수")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--scenario", action="append", choices=SCENARIOS, help="여러 번 지정 가능"
+    )
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    options = parser.parse_args()
+    scenarios = options.scenario or list(SCENARIOS)
+
+    setup_django()
+    rng = random.Random(options.seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        # server 모드는 다른 프로세스가 같은 DB를 열 수 있도록 파일에 DB를 만듭니다.
+        db_name = Path(directory) / "benchmark.sqlite3"
+        with test_database(name=db_name if options.mode == "server" else None):
+            counts = data.generate(options)
+            fixture = build_fixture()
+            servers = None
+            if options.mode == "server":
+                servers = Servers(options.workers, db_name)
+            try:
+                if servers:
+                    servers.wait()
+                for scenario in scenarios:
+                    method, url_name, _ = SCENARIOS[scenario]
+                    warmup = build_requests(scenario, options.warmup, rng, fixture)
+                    requests = build_requests(scenario, options.requests, rng, fixture)
+                    if servers:
+                        run_server(servers, warmup, method, options.concurrency)
+                        samples, elapsed, errors = run_server(
+                            servers, requests, method, options.concurrency
+                        )
+                        queries = servers.queries_per_request(
+                            url_name, method, fixture["admin_token"]
+                        )
+                    else:
+                        run_inprocess(warmup, method)
+                        samples, elapsed, queries, errors = run_inprocess(
+                            requests, method
+                        )
+                    results[scenario] = {
+                        **summarize(samples),
+                        "throughput_rps": round(len(samples) / elapsed, 2),
+                        "queries_per_request": (
+                            None if queries is None else round(queries, 2)
+                        ),
+                        "errors": errors,
+                    }
+            finally:
+                if servers:
+                    servers.close()
+
+    report = {
+        "commit": git_commit(),
+        "mode": options.mode,
+        "workers": options.workers if options.mode == "server" else 1,
+        "concurrency": options.concurrency if options.mode == "server" else 1,
+        "data": counts,
+        "scenarios": results,
+    }
+    if options.compare:
+        with open(options.compare) as file:
+            report["compare"] = compare(json.load(file), report)
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if options.output:
+        with open(options.output, "w") as file:
+            file.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+합성 데이터(benchmarks.data) 위에서 동시 요청 수(--concurrency)별로 WSGI와 ASGI의 처리량과 p50/p95/p99를 비교합니다.
+wsgi는 thread마다 요청을 하나씩 처리하는 WSGIHandler, asgi_sync는 ASGIHandler로 동기 view를,
+asgi_async는 ASGIHandler로 async view(article/async_views.py)를 요청합니다.
+서버 프로세스 없이 django test Client/AsyncClient로 각 handler를 직접 호출하므로 네트워크 비용은 포함되지 않습니다.
+ex) python -m benchmarks.asgi --concurrency 1 --concurrency 16 --requests 400
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks import api, data, setup_django, summarize, test_database
+
+# 시나리오 이름: 같은 응답을 반환하는 async view의 URL 이름
+ASYNC_URL_NAMES = {
+    "article_list": "async_article_view",
+    "feed": "async_feed",
+    "article_detail": "async_article_detail_view",
+    "comment_list": "async_comment_view",
+}
+MODES = ("wsgi", "asgi_sync", "asgi_async")
+
+
+def to_async_requests(scenario, requests):
+    """
+    동기 view의 요청 목록을 같은 인자의 async view 요청 목록으로 바꿉니다.
+    """
+    from django.urls import resolve, reverse
+
+    converted = []
+    for path, body, token in requests:
+        path, _, query = path.partition("?")
+        match = resolve(path)
+        path = reverse(ASYNC_URL_NAMES[scenario], kwargs=match.kwargs)
+        converted.append((f"{path}?{query}" if query else path, body, token))
+    return converted
+
+
+def _headers(token):
+    return {"authorization": f"Bearer {token}"} if token else {}
+
+
+def run_wsgi(requests, concurrency):
+    """
+    concurrency개의 thread가 각자의 test Client로 요청합니다. (thread worker를 사용하는 WSGI 서버와 같습니다.)
+    """
+    from django.db import connections
+    from django.test import Client
+
+    local = threading.local()
+
+    def send(request):
+        path, _, token = request
+        if not hasattr(local, "client"):
+            local.client = Client()
+        start = time.perf_counter()
+        response = local.client.get(path, headers=_headers(token))
+        return time.perf_counter() - start, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(send, requests))
+        # thread마다 열린 DB 연결을 닫습니다.
+        list(executor.map(lambda _: connections.close_all(), range(concurrency)))
+    return results, time.perf_counter() - started
+
+
+def run_asgi(requests, concurrency):
+    """
+    이벤트 루프 하나에서 최대 concurrency개의 요청을 동시에 진행합니다.
+    """
+    from django.test import AsyncClient
+
+    async def main():
+        client = AsyncClient()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def send(request):
+            path, _, token = request
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(path, headers=_headers(token))
+                return time.perf_counter() - start, response.status_code
+
+        return await asyncio.gather(*(send(request) for request in requests))
+
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    return results, time.perf_counter() - started
+
+
+def run(mode, requests, concurrency):
+    if mode == "wsgi":
+        results, elapsed = run_wsgi(requests, concurrency)
+    else:
+        results, elapsed = run_asgi(requests, concurrency)
+    samples = [duration for duration, _ in results]
+    return {
+        **summarize(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2),
+        "errors": sum(status >= 400 for _, status in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    data.add_arguments(parser)
+    parser.add_argument("--requests", type=int, default=200, help="시나리오별 요청 수")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument(
+        "--concurrency", type=int, action="append", help="여러 번 지정 가능"
+    )
+    parser.add_argument(
+        "--scenario", action="append", choices=ASYNC_URL_NAMES, help="여러 번 지정 가능"
+    )
+    parser.add_argument("--mode", action="append", choices=MODES)
+    options = parser.parse_args()
+    concurrencies = options.concurrency or [1, 8, 32]
+    scenarios = options.scenario or list(ASYNC_URL_NAMES)
+    modes = options.mode or list(MODES)
+
+    setup_django()
+    rng = random.Random(options.seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        # thread마다 따로 연결하므로 메모리 DB가 아닌 파일에 DB를 만듭니다.
+        with test_database(name=Path(directory) / "asgi.sqlite3"):
+            counts = data.generate(options)
+            fixture = api.build_fixture()
+            for scenario in scenarios:
+                warmup = api.build_requests(scenario, options.warmup, rng, fixture)
+                requests = api.build_requests(scenario, options.requests, rng, fixture)
+                urls = {
+                    "wsgi": (warmup, requests),
+                    "asgi_sync": (warmup, requests),
+                    "asgi_async": (
+                        to_async_requests(scenario, warmup),
+                        to_async_requests(scenario, requests),
+                    ),
+                }
+                results[scenario] = {}
+                for concurrency in concurrencies:
+                    for mode in modes:
+                        run(mode, urls[mode][0], concurrency)
+                        results[scenario][f"{mode}@{concurrency}"] = run(
+                            mode, urls[mode][1], concurrency
+                        )
+
+    report = {"data": counts, "scenarios": results}
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
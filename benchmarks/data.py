@@ -0,0 +1,162 @@
+"""
+벤치마크용 합성 데이터(유저, 팔로우, 게시글, 댓글, 좋아요)를 만듭니다.
+팔로우 수는 멱법칙을 따르도록 소수의 유저가 많은 팔로워를 갖게 만들며, 같은 seed면 항상 같은 데이터가 만들어집니다.
+bulk_create로 넣은 뒤 저장된 수, 피드, 검색 인덱스를 한 번에 다시 만듭니다.
+ex) python -m benchmarks.data --users 1000 --articles 20000  (생성에 걸린 시간만 출력합니다)
+"""
+
+import argparse
+import itertools
+import json
+import random
+import time
+
+from benchmarks import setup_django, test_database
+
+PASSWORD = "benchmark1234!!"
+BATCH_SIZE = 5000
+WORDS = (
+    "장고 파이썬 게시판 커뮤니티 개발 공부 질문 답변 리뷰 여행 음식 운동 "
+    "django python rest api cache index query database server client"
+).split()
+
+
+def add_arguments(parser):
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--comments", type=int, default=50000)
+    parser.add_argument("--likes", type=int, default=50000)
+    parser.add_argument(
+        "--follow-exponent",
+        type=float,
+        default=1.2,
+        help="팔로우 대상 선택 확률이 순위^-exponent에 비례합니다.",
+    )
+    parser.add_argument("--mean-followings", type=int, default=20)
+
+
+def _text(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def _bulk_create(model, rows):
+    """
+    rows를 BATCH_SIZE개씩 나누어 저장합니다. 중복은 무시합니다.
+    """
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, BATCH_SIZE))
+        if not batch:
+            return
+        model.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def _power_law_weights(count, exponent):
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def generate(options):
+    """
+    options(add_arguments의 인자)에 맞는 데이터를 만들고 만든 개수를 반환합니다.
+    """
+    from django.contrib.auth.hashers import make_password
+    from article.counters import rebuild_article_counts, rebuild_user_counts
+    from article.feeds import rebuild_feed_entries
+    from article.models import Article, Comment, FeedEntry
+    from article.search import get_search_backend
+    from user.models import Profile, User
+
+    rng = random.Random(options.seed)
+    # 해시는 느리므로 한 번만 계산해 모든 유저가 같은 비밀번호 해시를 사용합니다.
+    password = make_password(PASSWORD)
+    _bulk_create(
+        User,
+        (
+            User(
+                username=f"bench{i:06d}",
+                email=f"bench{i}@example.com",
+                password=password,
+            )
+            for i in range(options.users)
+        ),
+    )
+    user_ids = list(User.objects.order_by("id").values_list("id", flat=True))
+    _bulk_create(Profile, (Profile(username_id=user_id) for user_id in user_ids))
+
+    # 앞 순위의 유저일수록 많이 팔로우되며, 유저마다 팔로우하는 수는 지수분포를 따릅니다.
+    weights = _power_law_weights(len(user_ids), options.follow_exponent)
+    follow = User.followings.through
+    follows = set()
+    for user_id in user_ids:
+        count = min(
+            int(rng.expovariate(1 / options.mean_followings)), len(user_ids) - 1
+        )
+        for target in rng.choices(user_ids, weights, k=count):
+            if target != user_id:
+                follows.add((user_id, target))
+    _bulk_create(
+        follow,
+        (follow(from_user_id=source, to_user_id=target) for source, target in follows),
+    )
+
+    # 게시글 작성자도 팔로워가 많은 유저에게 치우치게 뽑습니다.
+    authors = rng.choices(user_ids, weights, k=options.articles)
+    _bulk_create(
+        Article,
+        (
+            Article(author_id=author, title=_text(rng, 3), content=_text(rng, 40))
+            for author in authors
+        ),
+    )
+    article_ids = list(Article.objects.values_list("id", flat=True))
+    _bulk_create(
+        Comment,
+        (
+            Comment(
+                author_id=rng.choice(user_ids),
+                article_id=rng.choice(article_ids),
+                content=_text(rng, 5),
+            )
+            for _ in range(options.comments)
+        ),
+    )
+    likes = Article.likes.through
+    _bulk_create(
+        likes,
+        (
+            likes(article_id=rng.choice(article_ids), user_id=rng.choice(user_ids))
+            for _ in range(options.likes)
+        ),
+    )
+
+    rebuild_article_counts()
+    rebuild_user_counts()
+    rebuild_feed_entries()
+    get_search_backend().rebuild()
+    return {
+        "seed": options.seed,
+        "users": len(user_ids),
+        "follows": len(follows),
+        "articles": len(article_ids),
+        "comments": Comment.objects.count(),
+        "likes": likes.objects.count(),
+        "feed_entries": FeedEntry.objects.count(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_arguments(parser)
+    options = parser.parse_args()
+
+    setup_django()
+    with test_database():
+        start = time.perf_counter()
+        counts = generate(options)
+        counts["seconds"] = round(time.perf_counter() - start, 2)
+    print(json.dumps(counts, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+비밀번호 hash 설정별로 로그인(/user/token/) 처리량을 잽니다.
+--threads개의 thread가 동시에 로그인하며, hash를 요청 thread에서 계산할 때(workers=0)와
+process pool(--workers)에서 계산할 때를 비교합니다. per_core는 계산에 사용한 core 수로 나눈 초당 로그인 수입니다.
+argon2-cffi, bcrypt가 설치되지 않았다면 해당 알고리즘은 건너뜁니다.
+ex) python -m benchmarks.hashers --threads 8 --workers 4 --requests 200
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from benchmarks import setup_django, summarize, test_database
+
+PASSWORD = "benchmark1234!!"
+# 알고리즘: (hasher, 필요한 패키지)
+ALGORITHMS = {
+    "pbkdf2": ("user.hashers.PBKDF2PasswordHasher", None),
+    "scrypt": ("user.hashers.ScryptPasswordHasher", None),
+    "argon2": ("user.hashers.Argon2PasswordHasher", "argon2"),
+    "bcrypt": ("user.hashers.BCryptSHA256PasswordHasher", "bcrypt"),
+}
+
+
+def hasher_settings(hasher):
+    """
+    hasher를 PASSWORD_HASHERS의 첫 번째(새 hash에 사용할 알고리즘)로 옮깁니다.
+    """
+    from django.conf import settings
+
+    others = [path for path in settings.PASSWORD_HASHERS if path != hasher]
+    return {"PASSWORD_HASHERS": [hasher, *others]}
+
+
+def run(usernames, requests, threads):
+    from django.db import connections
+    from django.test import Client
+    from django.urls import reverse
+
+    url = reverse("token")
+    local = threading.local()
+
+    def login(i):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        start = time.perf_counter()
+        response = local.client.post(
+            url, {"username": usernames[i % len(usernames)], "password": PASSWORD}
+        )
+        return time.perf_counter() - start, response.status_code
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        results = list(executor.map(login, range(requests)))
+        list(executor.map(lambda _: connections.close_all(), range(threads)))
+    elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--algorithm", action="append", choices=ALGORITHMS)
+    options = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.hashers import make_password
+    from django.test import override_settings
+
+    from user.models import User
+
+    cores = os.cpu_count() or 1
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        # thread마다 따로 연결하므로 메모리 DB가 아닌 파일에 DB를 만듭니다.
+        with test_database(name=Path(directory) / "hashers.sqlite3"):
+            User.objects.bulk_create(
+                User(username=f"login{i}", email=f"login{i}@example.com")
+                for i in range(options.users)
+            )
+            usernames = [f"login{i}" for i in range(options.users)]
+            for algorithm in options.algorithm or list(ALGORITHMS):
+                hasher, package = ALGORITHMS[algorithm]
+                if package and importlib.util.find_spec(package) is None:
+                    results[algorithm] = f"{package} 패키지가 없어 건너뜁니다."
+                    continue
+                results[algorithm] = {}
+                with override_settings(**hasher_settings(hasher)):
+                    # 모든 유저가 같은 hash를 쓰므로 한 번만 계산합니다.
+                    User.objects.update(password=make_password(PASSWORD))
+                    for workers in (0, options.workers):
+                        with override_settings(PASSWORD_HASH_WORKERS=workers):
+                            run(usernames, options.threads, options.threads)
+                            samples, elapsed = run(
+                                usernames, options.requests, options.threads
+                            )
+                        logins = len(samples) / elapsed
+                        used = min(workers or options.threads, cores)
+                        results[algorithm][f"workers={workers}"] = {
+                            **summarize([duration for duration, _ in samples]),
+                            "logins_per_s": round(logins, 2),
+                            "per_core": round(logins / used, 2),
+                            "errors": sum(code != 200 for _, code in samples),
+                        }
+
+    report = {"threads": options.threads, "cores": cores, "algorithms": results}
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+이미지 파일 요청의 처리량(requests/s)과 전송량(MB/s)을 파일 응답 방식별로 비교합니다.
+django_static은 기존의 django.views.static.serve, media는 DRF_Community_WebSite_Project/media.py,
+offload는 media에 MEDIA_OFFLOAD_HEADER=X-Accel-Redirect를 설정하여 본문 전송을 웹 서버에 맡긴 경우입니다.
+django test Client를 --concurrency개의 thread에서 사용하며, offload의 MB/s는 웹 서버가 보낼 양을 기준으로 셉니다.
+django_static은 Range를 지원하지 않으므로 range 시나리오에서도 파일 전체를 보냅니다.
+ex) python -m benchmarks.media --concurrency 8 --requests 500
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks import setup_django, summarize
+
+# 시나리오 이름: (파일 이름, 파일 크기, 요청 헤더)
+SCENARIOS = {
+    "thumbnail": ("profile/1/0123456789abcdef0123456789abcdef.webp", 16 * 1024, {}),
+    "original": ("profile/1/fedcba9876543210fedcba9876543210.jpg", 4 * 1024**2, {}),
+    "range": (
+        "profile/1/fedcba9876543210fedcba9876543210.jpg",
+        4 * 1024**2,
+        {"HTTP_RANGE": "bytes=1048576-1310719"},
+    ),
+}
+MODES = ("django_static", "media", "offload")
+
+
+def _urlpatterns():
+    from django.conf import settings
+    from django.urls import re_path
+    from django.views.static import serve as django_serve
+
+    from DRF_Community_WebSite_Project import media
+
+    root = {"document_root": settings.MEDIA_ROOT}
+    return [
+        re_path(r"^django_static/(?P<path>.*)$", django_serve, root),
+        re_path(r"^(?:media|offload)/(?P<path>.*)$", media.serve, root),
+    ]
+
+
+def create_files(root):
+    for name, size, _ in SCENARIOS.values():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(os.urandom(size))
+
+
+def run(mode, path, headers, body_size, requests, concurrency):
+    from django.conf import settings
+    from django.test import Client
+
+    settings.MEDIA_OFFLOAD_HEADER = "X-Accel-Redirect" if mode == "offload" else ""
+    local = threading.local()
+
+    def send(_):
+        if not hasattr(local, "client"):
+            local.client = Client()
+        start = time.perf_counter()
+        response = local.client.get(f"/{mode}/{path}", **headers)
+        if response.streaming:
+            size = sum(len(chunk) for chunk in response.streaming_content)
+            response.close()
+        else:
+            size = body_size if mode == "offload" else len(response.content)
+        return time.perf_counter() - start, response.status_code, size
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(send, range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        **summarize([duration for duration, _, _ in results]),
+        "throughput_rps": round(requests / elapsed, 2),
+        "throughput_mb_s": round(sum(size for *_, size in results) / elapsed / 1e6, 2),
+        "errors": sum(status >= 400 for _, status, _ in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS)
+    parser.add_argument("--mode", action="append", choices=MODES)
+    options = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from DRF_Community_WebSite_Project.media import parse_range
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        settings.MEDIA_ROOT = directory
+        settings.ROOT_URLCONF = __name__
+        settings.ALLOWED_HOSTS = ["testserver"]
+        create_files(directory)
+        for scenario in options.scenario or list(SCENARIOS):
+            path, size, headers = SCENARIOS[scenario]
+            if "HTTP_RANGE" in headers:
+                start, end = parse_range(headers["HTTP_RANGE"], size)
+                size = end - start + 1
+            results[scenario] = {}
+            for mode in options.mode or list(MODES):
+                args = (mode, path, headers, size)
+                run(*args, 10, options.concurrency)
+                results[scenario][mode] = run(
+                    *args, options.requests, options.concurrency
+                )
+
+    report = {"concurrency": options.concurrency, "scenarios": results}
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+
+def __getattr__(name):
+    # ROOT_URLCONF로 사용할 때 MEDIA_ROOT를 바꾼 뒤에 URL을 만들도록 처음 접근할 때 만듭니다.
+    if name == "urlpatterns":
+        return _urlpatterns()
+    raise AttributeError(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+게시글 목록의 페이지 번호 방식과 cursor 방식을 1페이지/깊은 페이지에서 비교합니다.
+ex) python -m benchmarks.pagination --page 10000 --repeat 20
+"""
+
+import argparse
+import json
+
+from benchmarks import measure, setup_django, summarize, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--page", type=int, default=10000, help="비교할 깊은 페이지 번호"
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from django.urls import reverse
+    from article.models import Article
+    from article.paginations import ArticlePagination, encode_cursor
+    from user.models import User
+
+    page_size = ArticlePagination.page_size
+    total = args.page * page_size
+
+    with test_database():
+        author = User.objects.create_user(
+            username="benchmark", email="benchmark@example.com", password="pw"
+        )
+        for start in range(0, total, 5000):
+            Article.objects.bulk_create(
+                Article(author=author, title=f"title {i}", content="content")
+                for i in range(start, min(total, start + 5000))
+            )
+
+        url = reverse("article_view")
+        # 깊은 페이지 직전 페이지의 마지막 게시글이 cursor가 됩니다.
+        last = Article.objects.order_by("-created_at", "-id").values_list(
+            "created_at", "id"
+        )[(args.page - 1) * page_size - 1]
+        requests = {
+            "page_number_first": {"page": 1},
+            "page_number_deep": {"page": args.page},
+            "cursor_first": {"cursor": ""},
+            "cursor_deep": {"cursor": encode_cursor(last)},
+        }
+
+        client = Client()
+        results = {"articles": total, "deep_page": args.page}
+        for name, params in requests.items():
+            response = client.get(url, params)
+            assert response.status_code == 200, response.content
+            samples = measure(lambda: client.get(url, params), args.repeat)
+            results[name] = summarize(samples)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+FTS 인덱스를 사용하는 검색과 icontains로 전체를 훑는 검색의 응답 시간을 비교합니다.
+합성 게시글을 만든 뒤 같은 검색어로 두 backend를 각각 실행합니다.
+icontains는 관련도 없이 앞에서부터 10개를 찾으면 멈추므로 흔한 단어에서는 빠르지만,
+드문 단어에서는 테이블 전체를 훑게 됩니다. FTS는 일치하는 게시글 전체의 bm25를 계산해 정렬합니다.
+ex) python -m benchmarks.search --articles 1000000 --repeat 10
+"""
+
+import argparse
+import json
+import random
+
+from benchmarks import measure, setup_django, summarize, test_database
+
+WORDS = (
+    "장고 파이썬 게시판 커뮤니티 개발 공부 질문 답변 리뷰 여행 음식 운동 음악 영화 "
+    "django python rest api cache index query database server client deploy"
+).split()
+RARE_WORDS = ["희귀검색어", "needle"]
+
+
+def make_text(rng, length):
+    return " ".join(rng.choice(WORDS) for _ in range(length))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    setup_django()
+    from article.models import Article
+    from article.search import (
+        IcontainsSearchBackend,
+        get_search_backend,
+    )
+    from user.models import User
+
+    rng = random.Random(0)
+    with test_database():
+        author = User.objects.create_user(
+            username="benchmark", email="benchmark@example.com", password="pw"
+        )
+        for start in range(0, args.articles, args.batch_size):
+            batch = []
+            for i in range(start, min(args.articles, start + args.batch_size)):
+                content = make_text(rng, 40)
+                if i % 1000 == 0:
+                    content += " " + rng.choice(RARE_WORDS)
+                batch.append(
+                    Article(author=author, title=make_text(rng, 4), content=content)
+                )
+            Article.objects.bulk_create(batch)
+        # bulk_create는 signal을 보내지 않으므로 인덱스를 한 번에 만듭니다.
+        indexed = get_search_backend()
+        indexed.rebuild()
+
+        backends = {
+            type(indexed).__name__: indexed,
+            "IcontainsSearchBackend": IcontainsSearchBackend(),
+        }
+        results = {"articles": args.articles}
+        for query in ("장고", "희귀검색어", "python cache"):
+            for name, backend in backends.items():
+                samples = measure(lambda: backend.search(query, None, 10), args.repeat)
+                results[f"{name} q={query}"] = summarize(samples)
+
+    print(json.dumps(results, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
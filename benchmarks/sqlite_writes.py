@@ -0,0 +1,142 @@
+"""
+여러 thread가 동시에 좋아요 토글과 댓글 작성을 요청할 때 SQLite 설정별 실패("database is locked") 비율과 처리량을 비교합니다.
+default는 Django 기본 설정이고, tuned는 settings의 SQLITE_PRAGMAS, SQLITE_BUSY_TIMEOUT, SQLITE_IMMEDIATE_WRITES입니다.
+ex) python -m benchmarks.sqlite_writes --threads 16 --requests 200
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks import setup_django, summarize, test_database
+
+# Django 기본 SQLite 설정입니다. (rollback journal, BEGIN DEFERRED, 5초 timeout)
+DEFAULT_CONFIG = ({"journal_mode": "delete", "synchronous": "full"}, False, 5)
+
+
+def configure(pragmas, immediate, timeout):
+    """
+    이후에 만들어지는 연결이 주어진 설정을 사용하도록 바꿉니다.
+    연결은 thread마다 따로 만들어지므로 새로 시작하는 thread부터 적용됩니다.
+    """
+    from django.conf import settings
+    from django.db import connections
+
+    settings.SQLITE_PRAGMAS = pragmas
+    settings.SQLITE_IMMEDIATE_WRITES = immediate
+    connections.settings["default"]["OPTIONS"]["timeout"] = timeout
+    connections.close_all()
+
+
+def worker(requests, token, article_ids, seed, results):
+    from django.db import connection
+    from django.test import Client
+    from django.urls import reverse
+
+    client = Client(raise_request_exception=False)
+    rng = random.Random(seed)
+    auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+    samples = []
+    errors = 0
+    try:
+        for i in range(requests):
+            article_id = rng.choice(article_ids)
+            start = time.perf_counter()
+            if i % 2:
+                url = reverse("comment_view", kwargs={"article_id": article_id})
+                response = client.post(url, {"content": "댓글"}, **auth)
+            else:
+                url = reverse("like_view", kwargs={"article_id": article_id})
+                response = client.post(url, **auth)
+            samples.append(time.perf_counter() - start)
+            errors += response.status_code >= 500
+    finally:
+        connection.close()
+    results.append((samples, errors))
+
+
+def run(args, tokens, article_ids):
+    results = []
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(args.requests, token, article_ids, args.seed + i, results),
+        )
+        for i, token in enumerate(tokens)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for thread_samples, _ in results for sample in thread_samples]
+    errors = sum(thread_errors for _, thread_errors in results)
+    return {
+        **summarize(samples),
+        "throughput_rps": round(len(samples) / elapsed, 2),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="thread별 요청 수")
+    parser.add_argument("--articles", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    import logging
+
+    from django.conf import settings
+    from django.db import connections
+    from article.models import Article
+    from user.models import User
+    from user.serializers import MyTokenObtainSerializer
+
+    # 실패한 요청마다 출력되는 traceback 로그를 끕니다.
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+    configs = {
+        "default": DEFAULT_CONFIG,
+        "tuned": (
+            settings.SQLITE_PRAGMAS,
+            settings.SQLITE_IMMEDIATE_WRITES,
+            connections.settings["default"]["OPTIONS"]["timeout"],
+        ),
+    }
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        # thread마다 따로 연결하므로 메모리 DB가 아닌 파일에 DB를 만듭니다.
+        with test_database(name=Path(directory) / "writes.sqlite3"):
+            users = [
+                User.objects.create_user(
+                    username=f"writer{i}", email=f"writer{i}@example.com", password="pw"
+                )
+                for i in range(args.threads)
+            ]
+            tokens = [
+                str(MyTokenObtainSerializer.get_token(user).access_token)
+                for user in users
+            ]
+            article_ids = [
+                Article.objects.create(author=users[0], title="제목", content="내용").id
+                for _ in range(args.articles)
+            ]
+            for name, config in configs.items():
+                configure(*config)
+                results[name] = run(args, tokens, article_ids)
+
+    print(json.dumps({"threads": args.threads, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+게시글 전체 목록을 한 번에 직렬화하는 응답과 스트리밍 응답의 첫 바이트까지의 시간, 전체 시간, 최대 메모리를 비교합니다.
+ex) python -m benchmarks.streaming --articles 100000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+
+from benchmarks import setup_django, test_database
+
+
+def run(func):
+    """
+    func가 반환한 bytes 조각들을 끝까지 읽으며 (첫 조각까지의 시간, 전체 시간, 최대 메모리)를 잽니다.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    first = None
+    for _ in func():
+        if first is None:
+            first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "ttfb_ms": round(first * 1000, 3),
+        "total_ms": round(total * 1000, 3),
+        "peak_mb": round(peak / 2**20, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=100000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from django.urls import reverse
+    from rest_framework.renderers import JSONRenderer
+    from article.models import Article
+    from article.serializers import ArticleListSerializer
+    from user.models import User
+
+    with test_database():
+        author = User.objects.create_user(
+            username="benchmark", email="benchmark@example.com", password="pw"
+        )
+        for start in range(0, args.articles, 5000):
+            Article.objects.bulk_create(
+                Article(author=author, title=f"title {i}", content="content")
+                for i in range(start, min(args.articles, start + 5000))
+            )
+
+        queryset = Article.objects.for_listing().order_by("-created_at", "-id")
+        client = Client()
+        url = reverse("article_view")
+
+        def buffered():
+            # pagination 없이 serializer.data 전체를 만든 뒤 한 번에 렌더링하는 기존 방식입니다.
+            data = ArticleListSerializer(queryset, many=True).data
+            yield JSONRenderer().render(data)
+
+        def streaming():
+            response = client.get(url, {"stream": "1"})
+            assert response.status_code == 200
+            yield from response.streaming_content
+
+        results = {
+            "articles": args.articles,
+            "buffered": run(buffered),
+            "streaming": run(streaming),
+        }
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+throttle(DRF_Community_WebSite_Project/throttling.py)이 요청마다 더하는 시간을 store별로 잽니다.
+좋아요 토글 요청 하나에 적용되는 UserBucketThrottle과 IPBucketThrottle의 allow_request를 --users명이 번갈아 호출하며,
+--threads를 주면 여러 thread가 동시에 호출할 때(local store의 lock 경쟁)도 함께 잽니다.
+ex) python -m benchmarks.throttling --requests 100000 --threads 8
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from benchmarks import measure, setup_django
+
+
+def build_requests(users):
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from user.authentication import TokenUser
+
+    factory = APIRequestFactory()
+    requests = []
+    for i in range(users):
+        request = Request(factory.put("/", REMOTE_ADDR=f"10.0.{i // 250}.{i % 250}"))
+        request.user = TokenUser({"user_id": i + 1, "username": f"user{i}"})
+        requests.append(request)
+    return requests
+
+
+def check(requests, repeat):
+    from article.views import LikeView
+
+    view = LikeView()
+    throttles = [throttle() for throttle in LikeView.throttle_classes]
+    for i in range(repeat):
+        request = requests[i % len(requests)]
+        for throttle in throttles:
+            throttle.allow_request(request, view)
+
+
+def run(requests, repeat, threads):
+    # 한 번 호출할 때의 시간을 µs 단위로 요약합니다.
+    samples = measure(lambda: check(requests, 1), repeat)
+    ordered = sorted(samples)
+    result = {
+        "p50_us": round(ordered[len(ordered) // 2] * 1e6, 3),
+        "p99_us": round(ordered[int(len(ordered) * 0.99)] * 1e6, 3),
+        "mean_us": round(sum(samples) / len(samples) * 1e6, 3),
+    }
+    if threads > 1:
+        workers = [
+            threading.Thread(target=check, args=(requests, repeat // threads))
+            for _ in range(threads)
+        ]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+        result[f"checks_per_s@{threads}"] = round(repeat / elapsed)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=1)
+    options = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+
+    from DRF_Community_WebSite_Project.throttling import reset_throttles
+
+    settings.THROTTLE_ENABLED = True
+    # 제한에 걸리지 않는 비율로 판단에 드는 시간만 잽니다.
+    settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"].update(
+        {"toggle.user": "1000000/s", "toggle.ip": "1000000/s"}
+    )
+    requests = build_requests(options.users)
+    results = {}
+    for store in ("local", "cache"):
+        settings.THROTTLE_STORE = store
+        reset_throttles()
+        results[store] = run(requests, options.requests, options.threads)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
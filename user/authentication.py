@@ -0,0 +1,156 @@
+"""
+DB 조회 없이 access token의 claim만으로 request.user를 만드는 인증 클래스입니다.
+MyTokenObtainSerializer가 토큰에 username, email을 넣어두므로 읽기 요청은 대부분 User를 불러올 필요가 없고,
+그 외의 필드가 필요해지면 그때 User를 한 번 불러옵니다.
+탈퇴한 유저의 토큰은 프로세스 안의 비활성화 캐시로 막으며, 쓰기 요청은 기존처럼 DB에서 User를 확인합니다.
+"""
+
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from rest_framework import permissions
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+_deactivated = {}
+_deactivated_lock = threading.Lock()
+
+
+def get_deactivation_ttl():
+    """
+    탈퇴한 유저를 기억하는 시간(초)입니다.
+    기본값은 access token 수명이며, 그 뒤에는 이전에 발급된 access token도 모두 만료됩니다.
+    """
+    return getattr(
+        settings,
+        "TOKEN_DEACTIVATION_TTL",
+        api_settings.ACCESS_TOKEN_LIFETIME.total_seconds(),
+    )
+
+
+def deactivate_user(user_id):
+    """
+    user_id의 토큰을 TTL 동안 거부하도록 기록합니다.
+    프로세스 안에만 저장되므로 다른 프로세스의 읽기 요청은 토큰이 만료될 때까지 통과할 수 있습니다.
+    """
+    with _deactivated_lock:
+        _deactivated[user_id] = time.monotonic() + get_deactivation_ttl()
+
+
+def is_deactivated(user_id):
+    expires_at = _deactivated.get(user_id)
+    if expires_at is None:
+        return False
+    if expires_at > time.monotonic():
+        return True
+    with _deactivated_lock:
+        if _deactivated.get(user_id) == expires_at:
+            del _deactivated[user_id]
+    return False
+
+
+def clear_deactivated():
+    with _deactivated_lock:
+        _deactivated.clear()
+
+
+class TokenUser(SimpleLazyObject):
+    """
+    토큰의 claim으로 id, pk, username, email을 제공하는 User 대신 쓰는 객체입니다.
+    claim에 없는 속성에 접근하거나 User 인스턴스로 다뤄지면(isinstance, ==, ORM 인자 등) User를 불러옵니다.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, token):
+        self.__dict__["token"] = token
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: self.load_user(user_id))
+
+    def __bool__(self):
+        # permission 클래스의 bool(request.user) 검사로 User를 불러오지 않도록 합니다.
+        return True
+
+    @staticmethod
+    def load_user(user_id):
+        try:
+            return get_user_model().objects.get(**{api_settings.USER_ID_FIELD: user_id})
+        except get_user_model().DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    def _claim(self, name):
+        if name in self.token:
+            return self.token[name]
+        if self._wrapped is empty:
+            self._setup()
+        return getattr(self._wrapped, name)
+
+    @property
+    def id(self):
+        return self.token[api_settings.USER_ID_CLAIM]
+
+    @property
+    def pk(self):
+        return self.id
+
+    @property
+    def username(self):
+        return self._claim("username")
+
+    @property
+    def email(self):
+        return self._claim("email")
+
+    @property
+    def is_active(self):
+        if self._wrapped is not empty:
+            return self._wrapped.is_active
+        return not is_deactivated(self.id)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    GET, HEAD, OPTIONS 요청에는 TokenUser를, 그 외의 요청에는 DB에서 불러온 User를 request.user로 설정합니다.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in permissions.SAFE_METHODS:
+            return self.get_token_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_token_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = TokenUser(validated_token)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+class AsyncClaimsJWTAuthentication(ClaimsJWTAuthentication):
+    """
+    async view(article/async_views.py)에서 사용하는 인증 클래스입니다.
+    GET, HEAD, OPTIONS 요청은 DB를 조회하지 않으므로 바로 인증하고, 그 외의 요청은 thread에서 User를 불러옵니다.
+    """
+
+    async def authenticate(self, request):
+        if request.method in permissions.SAFE_METHODS:
+            return super().authenticate(request)
+        return await sync_to_async(super().authenticate)(request)
@@ -0,0 +1,144 @@
+"""
+비밀번호 hash 설정과 hash 계산을 process pool에서 실행하는 함수입니다.
+PASSWORD_HASHER로 고른 알고리즘(pbkdf2, argon2, bcrypt, scrypt)이 PASSWORD_HASHERS의 첫 번째가 되며,
+각 hasher의 비용은 PASSWORD_HASH_COST에서 정합니다. 알고리즘이나 비용을 바꾸면 저장된 hash는 다음 로그인에서
+새 설정으로 다시 저장됩니다. (django의 check_password가 must_update로 판단합니다.)
+hash 계산은 PASSWORD_HASH_WORKERS개의 process pool에서 실행하여 로그인이 몰려도 web thread가 CPU를 붙잡지 않고,
+동시에 계산하는 수가 worker 수로 제한됩니다. 0(기본값)이면 요청 thread에서 바로 계산합니다.
+이 모듈은 pool의 worker process에서도 import되지만 worker에서는 django.setup()이 실행되지 않습니다.
+그래서 worker에서 실행되는 함수(_encode 등)와 hasher의 계산은 django 설정이나 model을 읽지 않아야 하며,
+PASSWORD_HASH_COST는 요청 process에서 CostMixin이 hasher의 속성으로 복사하여 함께 보냅니다.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+
+class CostMixin:
+    """
+    PASSWORD_HASH_COST[cost_key]의 값을 인스턴스 속성으로 덮어씁니다.
+    속성은 process pool로 보낼 때 함께 전달되므로 worker는 django 설정을 읽지 않습니다.
+    """
+
+    cost_key = None
+
+    def __init__(self):
+        for name, value in settings.PASSWORD_HASH_COST.get(self.cost_key, {}).items():
+            setattr(self, name, value)
+
+
+class PBKDF2PasswordHasher(CostMixin, hashers.PBKDF2PasswordHasher):
+    cost_key = "pbkdf2"
+
+
+class Argon2PasswordHasher(CostMixin, hashers.Argon2PasswordHasher):
+    cost_key = "argon2"
+
+
+class BCryptSHA256PasswordHasher(CostMixin, hashers.BCryptSHA256PasswordHasher):
+    cost_key = "bcrypt"
+
+
+class ScryptPasswordHasher(CostMixin, hashers.ScryptPasswordHasher):
+    cost_key = "scrypt"
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # thread를 사용하는 web 서버 process를 fork하지 않도록 spawn으로 worker를 만듭니다.
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def _reset_executor(executor=None):
+    """
+    pool을 닫고 다음 요청에서 새로 만들도록 합니다. executor를 주면 그 pool이 현재 pool일 때만 닫습니다.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None and executor in (None, _executor):
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+@receiver(setting_changed)
+def reset_hashers(setting, **kwargs):
+    if setting == "PASSWORD_HASH_COST":
+        hashers.get_hashers.cache_clear()
+        hashers.get_hashers_by_algorithm.cache_clear()
+    elif setting == "PASSWORD_HASH_WORKERS":
+        _reset_executor()
+
+
+def _run(func, *args):
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return func(*args)
+    executor = _get_executor()
+    try:
+        return executor.submit(func, *args).result()
+    except BrokenProcessPool:
+        # worker가 비정상 종료되면(OOM kill 등) pool을 다시 사용할 수 없으므로 새로 만들어 한 번 더 실행합니다.
+        _reset_executor(executor)
+        return _get_executor().submit(func, *args).result()
+
+
+def _encode(hasher, password, salt):
+    return hasher.encode(password, salt)
+
+
+def _verify(hasher, password, encoded):
+    return hasher.verify(password, encoded)
+
+
+def _harden_runtime(hasher, password, encoded):
+    hasher.harden_runtime(password, encoded)
+
+
+def make_password(password):
+    """
+    django의 make_password와 같으며 hash 계산을 pool에서 실행합니다.
+    """
+    if password is None or not isinstance(password, (bytes, str)):
+        return hashers.make_password(password)
+    hasher = hashers.get_hasher("default")
+    return _run(_encode, hasher, password, hasher.salt())
+
+
+def check_password(password, encoded, setter=None):
+    """
+    django의 check_password와 같으며 hash 계산을 pool에서 실행합니다.
+    비밀번호가 맞고 알고리즘이나 비용이 바뀌었다면 setter로 새 hash를 저장합니다.
+    """
+    if password is None or not hashers.is_password_usable(encoded):
+        return False
+    preferred = hashers.get_hasher("default")
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+
+    hasher_changed = hasher.algorithm != preferred.algorithm
+    must_update = hasher_changed or preferred.must_update(encoded)
+    is_correct = _run(_verify, hasher, password, encoded)
+    # 비용이 낮은 hash와 응답 시간이 달라 비밀번호가 틀렸는지 추측할 수 없도록 차이만큼 더 계산합니다.
+    if not is_correct and not hasher_changed and must_update:
+        _run(_harden_runtime, hasher, password, encoded)
+    if setter and is_correct and must_update:
+        setter(password)
+    return is_correct
@@ -0,0 +1,185 @@
+"""
+프로필 이미지의 썸네일을 요청 thread가 아닌 background thread에서 만듭니다.
+업로드된 원본은 요청 안에서 임시 이름(user/models.py의 profile_image_path)으로 저장만 하고, 커밋된 뒤에 worker가
+원본에서 EXIF와 GPS 등의 메타데이터를 지워 다시 저장하고, PROFILE_IMAGE_SIZES의 정사각형 썸네일을
+PROFILE_IMAGE_FORMATS 형식으로 만들어 모두 profile/<user_id>/<내용의 hash>.<확장자>에 저장합니다.
+파일 이름이 내용으로 정해지므로 같은 이미지를 다시 올리면 파일을 다시 쓰지 않고, 이름이 바뀌면 URL도 바뀝니다.
+임시 원본과 이전 원본, 썸네일도 worker가 삭제합니다.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from PIL import Image, ImageOps
+
+from article.cache import invalidate_profile
+from user.models import Profile
+
+logger = logging.getLogger(__name__)
+
+# PIL의 format 이름과 확장자, 투명도를 지원하는지 여부
+FORMATS = {
+    "webp": ("WEBP", "webp", True),
+    "jpeg": ("JPEG", "jpg", False),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.PROFILE_IMAGE_WORKERS,
+                thread_name_prefix="profile-image",
+            )
+        return _executor
+
+
+def _encode(image, image_format):
+    """
+    image를 image_format으로 인코딩한 bytes를 반환합니다.
+    save에 exif를 넘기지 않으므로 EXIF와 GPS 등의 메타데이터는 저장되지 않습니다.
+    """
+    pil_format, _, transparency = FORMATS[image_format]
+    if image.mode not in ("RGB", "RGBA") or (image.mode == "RGBA" and not transparency):
+        background = Image.new("RGB", image.size, "white")
+        converted = image.convert("RGBA")
+        background.paste(converted, mask=converted.getchannel("A"))
+        image = background
+    buffer = BytesIO()
+    if pil_format == "JPEG":
+        image.save(
+            buffer,
+            pil_format,
+            quality=settings.PROFILE_IMAGE_QUALITY,
+            optimize=True,
+            progressive=True,
+        )
+    else:
+        image.save(buffer, pil_format, quality=settings.PROFILE_IMAGE_QUALITY)
+    return buffer.getvalue()
+
+
+def _save_hashed(user_id, content, extension):
+    digest = hashlib.sha256(content).hexdigest()[:32]
+    name = f"profile/{user_id}/{digest}.{extension}"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(content))
+    return name
+
+
+def _strip_metadata(image, pil_format):
+    """
+    image를 pil_format으로 다시 인코딩한 bytes를 반환합니다. exif를 넘기지 않으므로 메타데이터는 저장되지 않습니다.
+    """
+    buffer = BytesIO()
+    if pil_format == "JPEG":
+        image.save(buffer, pil_format, quality=95)
+    else:
+        image.save(buffer, pil_format)
+    return buffer.getvalue()
+
+
+def build_images(user_id, name):
+    """
+    임시로 저장된 원본 name에서 메타데이터를 지운 원본과 썸네일을 만들어 저장하고
+    (원본 파일 이름, {크기: {형식: 파일 이름}})을 반환합니다.
+    """
+    with default_storage.open(name, "rb") as file:
+        with Image.open(file) as uploaded:
+            pil_format = uploaded.format
+            # 휴대폰 사진은 EXIF의 방향 정보로 회전하므로 EXIF를 버리기 전에 적용합니다.
+            original = ImageOps.exif_transpose(uploaded)
+            extension = os.path.splitext(name)[1].lstrip(".")
+            original_name = _save_hashed(
+                user_id, _strip_metadata(original, pil_format), extension
+            )
+            if original.mode not in ("RGB", "RGBA"):
+                original = original.convert("RGBA")
+            variants = {}
+            for label, size in settings.PROFILE_IMAGE_SIZES.items():
+                resized = ImageOps.fit(original, (size, size), Image.LANCZOS)
+                variants[label] = {
+                    image_format: _save_hashed(
+                        user_id,
+                        _encode(resized, image_format),
+                        FORMATS[image_format][1],
+                    )
+                    for image_format in settings.PROFILE_IMAGE_FORMATS
+                }
+    return original_name, variants
+
+
+def _variant_names(variants):
+    return {name for formats in variants.values() for name in formats.values()}
+
+
+def process_profile_image(user_id, name, old_name="", old_variants=None):
+    """
+    worker에서 실행됩니다. 임시 원본 name을 메타데이터를 지운 원본으로 바꾸고 썸네일을 만들어 프로필에 저장한 뒤,
+    임시 원본과 이전 원본, 썸네일을 삭제합니다.
+    처리하는 동안 다른 이미지가 올라왔다면 결과를 저장하지 않고, 만든 파일 중 현재 프로필이 사용하지 않는 것을 삭제합니다.
+    (같은 내용의 파일은 이름이 같으므로 현재 프로필의 파일과 겹치는 파일은 남겨둡니다.)
+    """
+    try:
+        original_name, variants = build_images(user_id, name)
+        updated = Profile.objects.filter(username=user_id, image=name).update(
+            image=original_name, image_variants=variants
+        )
+        stale = {name, old_name} - {"", original_name}
+        if updated:
+            invalidate_profile(user_id)
+            stale |= _variant_names(old_variants or {}) - _variant_names(variants)
+        else:
+            current = (
+                Profile.objects.filter(username=user_id)
+                .values_list("image", "image_variants")
+                .first()
+            )
+            current_image, current_variants = current or ("", {})
+            stale |= {original_name} - {current_image}
+            stale |= _variant_names(variants) - _variant_names(current_variants)
+        for stale_name in stale:
+            default_storage.delete(stale_name)
+    except Exception:
+        logger.exception("프로필 이미지 처리에 실패했습니다. (user_id=%s)", user_id)
+    finally:
+        connection.close()
+
+
+def schedule_profile_image(profile, old_name="", old_variants=None):
+    """
+    현재 트랜잭션이 커밋되면 profile.image의 썸네일 생성을 worker에 맡깁니다.
+    """
+
+    def submit():
+        future = _get_executor().submit(
+            process_profile_image,
+            profile.username_id,
+            profile.image.name,
+            old_name,
+            old_variants,
+        )
+        _pending.add(future)
+        future.add_done_callback(_pending.discard)
+
+    transaction.on_commit(submit)
+
+
+def wait_for_images(timeout=None):
+    """
+    지금까지 맡긴 작업이 끝날 때까지 기다립니다. 테스트와 벤치마크에서 사용합니다.
+    """
+    wait(list(_pending), timeout=timeout)
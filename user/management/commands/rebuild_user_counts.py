@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from article.counters import rebuild_user_counts
+from user.models import User
+
+
+class Command(BaseCommand):
+    """
+    저장된 팔로워/팔로잉/게시글 수를 팔로우 테이블과 게시글 테이블 기준으로 다시 계산합니다.
+    ex) python manage.py rebuild_user_counts
+        python manage.py rebuild_user_counts --user 1 --user 2
+    """
+
+    help = "User의 followers_count, followings_count, articles_count를 다시 계산합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            type=int,
+            dest="user_ids",
+            help="다시 계산할 유저 id (여러 번 지정 가능, 생략 시 전체)",
+        )
+
+    def handle(self, *args, **options):
+        queryset = User.objects.all()
+        if options["user_ids"]:
+            queryset = queryset.filter(id__in=options["user_ids"])
+        updated = rebuild_user_counts(queryset)
+        self.stdout.write(
+            self.style.SUCCESS(f"{updated}명의 유저를 다시 계산했습니다.")
+        )
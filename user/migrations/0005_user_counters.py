@@ -0,0 +1,57 @@
+# Generated by Django 4.2.1 on 2026-10-18 10:24
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(model, fk_name):
+    counts = (
+        model.objects.filter(**{fk_name: OuterRef("pk")})
+        .order_by()
+        .values(fk_name)
+        .annotate(count=Count("*"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def fill_counts(apps, schema_editor):
+    """
+    이후 바뀌는 article/counters.py에 영향을 받지 않도록 이 시점의 모델로 저장된 수를 계산합니다.
+    """
+    User = apps.get_model("user", "User")
+    Article = apps.get_model("article", "Article")
+    follow_model = User.followings.through
+    User.objects.update(
+        followers_count=count_subquery(follow_model, "to_user_id"),
+        followings_count=count_subquery(follow_model, "from_user_id"),
+        articles_count=count_subquery(Article, "author_id"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("article", "0001_initial"),
+        ("user", "0004_delete_userbookmark"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="articles_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="followers_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="followings_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.1 on 2026-10-18 11:08
+
+from django.db import migrations, models
+import user.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0006_profile_image_variants"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="image",
+            field=models.ImageField(
+                blank=True, upload_to=user.models.profile_image_path
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.1 on 2026-10-18 12:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def mark_fanout_on_read(apps, schema_editor):
+    User = apps.get_model("user", "User")
+    limit = getattr(settings, "FEED_FANOUT_MAX_FOLLOWERS", 5000)
+    User.objects.filter(followers_count__gt=limit).update(feed_fanout_on_read=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0007_profile_image_hashed_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="feed_fanout_on_read",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_fanout_on_read, migrations.RunPython.noop),
+    ]
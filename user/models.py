@@ -1,6 +1,11 @@
+import os
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import BaseUserManager, AbstractBaseUser
 
+from user.hashers import check_password, make_password
+
 
 # Create your models here.
 class UserManager(BaseUserManager):
@@ -36,7 +41,7 @@ class User(AbstractBaseUser):
     """
     커스텀 유저 모델입니다.
     username(아이디), email(이메일,필수,unique), password, is_active, is_admin을 필드로 가진다.
-    팔로우/팔로워 필드를 가진다.
+    팔로우/팔로워 필드와 팔로워/팔로잉/작성한 게시글 수를 가진다.
     """
 
     username = models.CharField(
@@ -56,6 +61,13 @@ class User(AbstractBaseUser):
         related_name="followers",
         blank=True,
     )
+    # 팔로우/게시글 작성 시 F()로 갱신하는 수입니다. (python manage.py rebuild_user_counts)
+    followers_count = models.PositiveIntegerField(default=0)
+    followings_count = models.PositiveIntegerField(default=0)
+    articles_count = models.PositiveIntegerField(default=0)
+    # 팔로워가 FEED_FANOUT_MAX_FOLLOWERS명을 넘은 적이 있는 유저입니다. (article/feeds.py)
+    # 팔로워가 다시 줄어도 피드에 저장되지 않은 게시글이 사라지지 않도록 계속 조회 시 가져옵니다.
+    feed_fanout_on_read = models.BooleanField(default=False)
 
     objects = UserManager()
 
@@ -67,6 +79,25 @@ class User(AbstractBaseUser):
     def __str__(self):
         return f"{self.username}"
 
+    def set_password(self, raw_password):
+        """
+        hash 계산을 process pool에서 실행합니다. (user/hashers.py)
+        """
+        self.password = make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        hash 계산을 process pool에서 실행하며, 설정이 바뀐 hash는 새 설정으로 다시 저장합니다.
+        """
+
+        def setter(raw_password):
+            self.set_password(raw_password)
+            self._password = None
+            self.save(update_fields=["password"])
+
+        return check_password(raw_password, self.password, setter)
+
     def has_perm(self, perm, obj=None):
         "Does the user have a specific permission?"
         # Simplest possible answer: Yes, always
@@ -84,10 +115,21 @@ class User(AbstractBaseUser):
         return self.is_admin
 
 
+def profile_image_path(instance, filename):
+    """
+    업로드한 프로필 이미지를 profile/<user_id>/upload-<임의의 값>.<확장자>에 임시로 저장합니다.
+    요청 thread는 파일을 읽지 않고 저장만 하며, 커밋된 뒤 user/images.py의 worker가 메타데이터를 지우고
+    내용의 hash로 이름을 바꿉니다. 이름이 내용으로 정해지므로 파일 서버(DRF_Community_WebSite_Project/media.py)가 오래 캐시할 수 있습니다.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    return f"profile/{instance.username_id}/upload-{uuid.uuid4().hex}{extension}"
+
+
 class Profile(models.Model):
     """
     프로필 모델입니다.
     이미지와 bio, 작성시간과 수정시간을 필드로 가진다.
+    image_variants는 image를 줄여 만든 썸네일의 {크기: {형식: 파일 이름}}이며 user/images.py에서 채운다.
     User와 1대1관계
     """
 
@@ -95,7 +137,8 @@ class Profile(models.Model):
         db_table = "profile"
 
     username = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
-    image = models.ImageField(blank=True, upload_to="%Y/%m/")
+    image = models.ImageField(blank=True, upload_to=profile_image_path)
+    image_variants = models.JSONField(default=dict, blank=True)
     bio = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
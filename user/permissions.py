@@ -27,4 +27,4 @@ class IsMeOrReadOnly(permissions.BasePermission):
             return True
 
         # Instance must have an attribute named `owner`.
-        return obj.username == request.user
+        return obj.username_id == request.user.id
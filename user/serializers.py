@@ -1,5 +1,7 @@
+from django.core.files.storage import default_storage
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from .images import schedule_profile_image
 from .models import User, Profile
 import re
 
@@ -160,24 +162,35 @@ class UserEditSerializer(serializers.ModelSerializer):
 class ProfileSerializer(serializers.ModelSerializer):
     """
     프로필을 조회하기 위한 시리얼라이저
-    역참조를 통해 작성한 글들과 이메일을 불러온다.
-    팔로우/팔로워 수를 보여준다.
+    username과 이메일은 select_related로 함께 불러온 User에서 가져온다.
+    팔로우/팔로워 수와 작성한 게시글 수는 User에 저장된 값을 보여준다.
     """
 
     username = serializers.StringRelatedField()
-    email = serializers.SerializerMethodField()
+    email = serializers.CharField(source="username.email", read_only=True)
 
-    followers = serializers.SerializerMethodField()
-    following = serializers.SerializerMethodField()
-
-    def get_email(self, obj):
-        return obj.username.email
-
-    def get_followers(self, obj):
-        return obj.username.followers.count()
+    followers = serializers.IntegerField(
+        source="username.followers_count", read_only=True
+    )
+    following = serializers.IntegerField(
+        source="username.followings_count", read_only=True
+    )
+    articles_count = serializers.IntegerField(
+        source="username.articles_count", read_only=True
+    )
+    image_variants = serializers.SerializerMethodField()
 
-    def get_following(self, obj):
-        return obj.username.followings.count()
+    def get_image_variants(self, obj):
+        """
+        썸네일의 {크기: {형식: URL}}입니다. 업로드 직후 썸네일을 만드는 동안에는 비어 있으므로 image를 사용합니다.
+        """
+        return {
+            label: {
+                image_format: default_storage.url(name)
+                for image_format, name in formats.items()
+            }
+            for label, formats in obj.image_variants.items()
+        }
 
     class Meta:
         model = Profile
@@ -185,14 +198,20 @@ class ProfileSerializer(serializers.ModelSerializer):
 
 
 class ProfileEditSerializer(serializers.ModelSerializer):
+    """
+    업로드된 이미지는 임시 이름으로 저장만 하고 바로 응답합니다.
+    메타데이터 제거와 이름 변경, 썸네일 생성, 이전 이미지 삭제는 커밋된 뒤 user/images.py의 worker가 처리합니다.
+    """
+
     class Meta:
         model = Profile
         fields = ("bio", "image")
 
-    # def update(self, instance, validated_data):
-    #     if validated_data.get("image",None) ==
-    #     pass
     def update(self, instance, validated_data):
-        if validated_data.get("image", None):
-            instance.image.delete(save=False)
-        return super().update(instance, validated_data)
+        if not validated_data.get("image", None):
+            return super().update(instance, validated_data)
+        old_name, old_variants = instance.image.name, instance.image_variants
+        instance.image_variants = {}
+        instance = super().update(instance, validated_data)
+        schedule_profile_image(instance, old_name, old_variants)
+        return instance
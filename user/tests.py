@@ -1,9 +1,22 @@
-from django.test import TestCase
+import os
+from io import BytesIO
+from tempfile import TemporaryDirectory
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APIRequestFactory, APITransactionTestCase
 from rest_framework import status
 from collections import defaultdict
-from user.models import User
+from user.models import User, Profile
+from article.relations import set_follow
+from user.authentication import ClaimsJWTAuthentication, TokenUser, clear_deactivated
+from user import hashers
+from user.images import process_profile_image, wait_for_images
+from DRF_Community_WebSite_Project.testing import use_shared_cache
+from DRF_Community_WebSite_Project.throttling import reset_throttles
+from PIL import Image
 
 
 # Create your tests here.
@@ -22,6 +35,9 @@ class UserBaseTestCase(APITestCase):
         cls.user_data = {"username": "zxcvbnasdf_", "password": "asdf1234!!"}
 
     def setUp(self) -> None:
+        cache.clear()
+        clear_deactivated()
+        reset_throttles()
         self.access = self.client.post(reverse("token"), self.user_data).data["access"]
 
 
@@ -191,3 +207,260 @@ class UserGetTestCase(UserBaseTestCase):
             HTTP_AUTHORIZATION=f"Bearer {self.access[:-3]}123",
         )
         self.assertEqual(response.status_code, 401)
+
+
+class ProfileConditionalGetTestCase(UserBaseTestCase):
+    """
+    프로필 조회의 ETag를 검증하는 케이스
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        use_shared_cache(self)
+
+    def test_not_modified(self):
+        Profile.objects.create(username=self.user)
+        url = reverse("profile", args=[self.user.id])
+        response = self.client.get(path=url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        response = self.client.get(path=url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        other = User.objects.create_user(
+            username="qwertyasdf_", email="qwer@naver.com", password="asdf1234!!"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            set_follow(other, self.user)
+        response = self.client.get(path=url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["followers"], 1)
+
+
+class ClaimsJWTAuthenticationTestCase(UserBaseTestCase):
+    """
+    토큰의 claim으로 request.user를 만드는 인증을 검증하는 케이스
+    """
+
+    def authenticate(self, method):
+        request = getattr(APIRequestFactory(), method)(
+            "/", HTTP_AUTHORIZATION=f"Bearer {self.access}"
+        )
+        return ClaimsJWTAuthentication().authenticate(request)[0]
+
+    def test_read_without_user_query(self):
+        with self.assertNumQueries(0):
+            user = self.authenticate("get")
+            self.assertIsInstance(user, TokenUser)
+            self.assertEqual(
+                (user.id, user.pk, user.username, user.email),
+                (self.user.id, self.user.id, "zxcvbnasdf_", "abcd@naver.com"),
+            )
+            self.assertTrue(user.is_authenticated)
+
+        # claim에 없는 속성은 처음 접근할 때 한 번만 불러옵니다.
+        with self.assertNumQueries(1):
+            self.assertEqual(user.last_login, self.user.last_login)
+            self.assertFalse(user.is_admin)
+
+    def test_write_loads_user(self):
+        with self.assertNumQueries(1):
+            self.assertIsInstance(self.authenticate("post"), User)
+
+    def test_signed_out_token(self):
+        url = reverse("signup/out")
+        auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+        response = self.client.put(path=url, data=self.user_data, **auth)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(path=reverse("feed"), **auth)
+        self.assertEqual(response.status_code, 401)
+
+
+class ProfileCacheTestCase(UserBaseTestCase):
+    """
+    저장된 팔로워/팔로잉/게시글 수와 프로필 조회 캐시를 검증하는 케이스
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        Profile.objects.create(username=self.user)
+        self.url = reverse("profile", args=[self.user.id])
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {self.access}"}
+
+    def get_profile(self):
+        response = self.client.get(path=self.url)
+        return response.status_code, response.data
+
+    def test_counts_and_cache(self):
+        with self.assertNumQueries(1):
+            code, data = self.get_profile()
+        self.assertEqual(code, 200)
+        self.assertEqual(
+            (data["followers"], data["following"], data["articles_count"]), (0, 0, 0)
+        )
+        with self.assertNumQueries(0):
+            self.get_profile()
+
+        other = User.objects.create_user(
+            username="qwertyasdf_", email="qwer@naver.com", password="asdf1234!!"
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                path=reverse("follow", args=[other.id]), **self.auth
+            )
+            self.assertEqual(response.status_code, 200)
+            response = self.client.post(
+                path=reverse("article_view"),
+                data={"title": "제목", "content": "내용"},
+                **self.auth,
+            )
+            self.assertEqual(response.status_code, 201)
+        data = self.get_profile()[1]
+        self.assertEqual((data["following"], data["articles_count"]), (1, 1))
+        other.refresh_from_db()
+        self.assertEqual(other.followers_count, 1)
+
+        article_id = self.user.article_set.get().id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(
+                path=reverse("article_detail_view", args=[article_id]), **self.auth
+            )
+            self.client.put(path=self.url, data={"bio": "소개"}, **self.auth)
+        data = self.get_profile()[1]
+        self.assertEqual((data["articles_count"], data["bio"]), (0, "소개"))
+
+    def test_signed_out(self):
+        self.assertEqual(self.get_profile()[0], 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            url = reverse("signup/out")
+            self.client.put(path=url, data=self.user_data, **self.auth)
+        self.assertEqual(self.get_profile(), (404, {"message": "탈퇴한 사용자입니다"}))
+
+
+class ProfileImageTestCase(APITransactionTestCase):
+    """
+    프로필 이미지의 썸네일을 worker thread에서 만드는지 검증하는 케이스
+    worker는 다른 DB 연결을 사용하므로 트랜잭션으로 감싸지 않는 TransactionTestCase를 사용합니다.
+    """
+
+    def setUp(self) -> None:
+        cache.clear()
+        reset_throttles()
+        media = TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.media_root = media.name
+        user = User.objects.create_user(
+            username="zxcvbnasdf_", email="abcd@naver.com", password="asdf1234!!"
+        )
+        Profile.objects.create(username=user)
+        self.url = reverse("profile", args=[user.id])
+        access = self.client.post(
+            reverse("token"), {"username": "zxcvbnasdf_", "password": "asdf1234!!"}
+        ).data["access"]
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {access}"}
+
+    def upload(self, color):
+        image = Image.new("RGB", (1200, 800), color)
+        exif = Image.Exif()
+        exif[0x010F] = "phone"  # Make
+        buffer = BytesIO()
+        image.save(buffer, "JPEG", exif=exif)
+        file = SimpleUploadedFile("photo.jpg", buffer.getvalue(), "image/jpeg")
+        response = self.client.put(
+            path=self.url, data={"image": file}, format="multipart", **self.auth
+        )
+        self.assertEqual(response.status_code, 200)
+        wait_for_images()
+        return self.client.get(path=self.url).data
+
+    def path(self, url):
+        return os.path.join(self.media_root, url.removeprefix("/media/"))
+
+    def test_variants(self):
+        data = self.upload("red")
+        # 원본은 worker가 EXIF를 지우고 내용의 hash로 이름을 바꿉니다.
+        self.assertNotIn("upload-", data["image"])
+        with Image.open(self.path(data["image"])) as original:
+            self.assertEqual(original.size, (1200, 800))
+            self.assertEqual(len(original.getexif()), 0)
+        directory = os.path.dirname(self.path(data["image"]))
+        self.assertFalse(any(n.startswith("upload-") for n in os.listdir(directory)))
+        variants = data["image_variants"]
+        self.assertEqual(set(variants), {"small", "medium", "large"})
+        with Image.open(self.path(variants["small"]["jpeg"])) as small:
+            self.assertEqual(small.size, (64, 64))
+            self.assertEqual(len(small.getexif()), 0)
+        with Image.open(self.path(variants["large"]["webp"])) as large:
+            self.assertEqual((large.format, large.size), ("WEBP", (640, 640)))
+
+        # 새 이미지를 올리면 이전 원본과 썸네일은 삭제됩니다.
+        old_files = [data["image"]] + [
+            url for formats in variants.values() for url in formats.values()
+        ]
+        new_variants = self.upload("blue")["image_variants"]
+        self.assertNotEqual(new_variants, variants)
+        for url in old_files:
+            self.assertFalse(os.path.exists(self.path(url)), url)
+
+    def test_replaced_while_processing(self):
+        """
+        처리하는 동안 다른 이미지가 올라왔다면 그 작업의 임시 원본과 만든 파일은 삭제되고 현재 이미지는 남는다.
+        """
+        self.upload("red")
+        profile = Profile.objects.get()
+        directory = os.path.dirname(self.path(profile.image.name))
+        files = set(os.listdir(directory))
+        name = f"profile/{profile.username_id}/upload-replaced.jpg"
+        Image.new("RGB", (100, 100), "green").save(self.path(name), "JPEG")
+
+        process_profile_image(profile.username_id, name)
+        self.assertEqual(set(os.listdir(directory)), files)
+        replaced = Profile.objects.get()
+        self.assertEqual(
+            (replaced.image.name, replaced.image_variants),
+            (profile.image.name, profile.image_variants),
+        )
+
+
+class PasswordHashTestCase(UserBaseTestCase):
+    """
+    hash 설정을 바꾸면 로그인할 때 새 설정으로 다시 저장되는지와 process pool에서 계산되는지 검증하는 케이스
+    """
+
+    def login(self):
+        response = self.client.post(reverse("token"), self.user_data)
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        return self.user.password
+
+    def test_rehash_on_login(self):
+        cost = {**settings.PASSWORD_HASH_COST, "pbkdf2": {"iterations": 1000}}
+        with self.settings(PASSWORD_HASH_COST=cost):
+            self.assertTrue(self.login().startswith("pbkdf2_sha256$1000$"))
+        hashers = ["user.hashers.ScryptPasswordHasher", *settings.PASSWORD_HASHERS]
+        with self.settings(PASSWORD_HASHERS=hashers):
+            self.assertTrue(self.login().startswith("scrypt$"))
+        # 이전 알고리즘의 hash도 확인할 수 있고, 다시 기본 설정으로 저장됩니다.
+        iterations = settings.PASSWORD_HASH_COST["pbkdf2"]["iterations"]
+        self.assertTrue(self.login().startswith(f"pbkdf2_sha256${iterations}$"))
+
+    def test_process_pool(self):
+        with self.settings(PASSWORD_HASH_WORKERS=1):
+            self.assertTrue(self.user.check_password("asdf1234!!"))
+            self.assertFalse(self.user.check_password("wrong1234!!"))
+            self.user.set_password("qwer1234!!")
+        self.assertTrue(self.user.check_password("qwer1234!!"))
+
+    def test_broken_pool(self):
+        """
+        worker process가 죽어도 pool을 새로 만들어 계산한다.
+        """
+        with self.settings(PASSWORD_HASH_WORKERS=1):
+            self.assertTrue(self.user.check_password("asdf1234!!"))
+            broken = hashers._executor
+            for process in list(broken._processes.values()):
+                process.kill()
+                process.join()
+            self.assertTrue(self.user.check_password("asdf1234!!"))
+            self.assertIsNot(hashers._executor, broken)
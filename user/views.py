@@ -11,12 +11,29 @@ from user.serializers import (
     ProfileEditSerializer,
 )
 from user.permissions import SignOutAuthenticatedOnly, IsMeOrReadOnly
+from user.authentication import deactivate_user
 from rest_framework.generics import get_object_or_404
 from user.models import User, Profile
 
+from article.models import Article
 from article.serializers import ArticleListSerializer
 from article.paginations import ArticlePagination
+from article.streaming import StreamingListMixin
+from article.relations import set_follow
+from article.conditional import (
+    ArticleListValidatorsMixin,
+    conditional_get,
+    version_validators,
+)
+from article.cache import get_or_build, profile_key
+from django.conf import settings
+from django.utils.functional import cached_property
 from django.db.models.query_utils import Q
+from DRF_Community_WebSite_Project.throttling import (
+    IPBucketThrottle,
+    UserBucketThrottle,
+    UsernameBucketThrottle,
+)
 
 
 # Create the_userr views here.
@@ -27,6 +44,7 @@ class UserSignUpAndOutView(APIView):
     """
 
     permission_classes = (SignOutAuthenticatedOnly,)
+    query_budget = {"GET": 2, "POST": 5, "PUT": 4, "PATCH": 4}
 
     def post(self, request):
         """
@@ -54,6 +72,7 @@ class UserSignUpAndOutView(APIView):
         if serializer.is_valid():
             user.is_active = False
             user.save()
+            deactivate_user(user.id)
             return Response({"message": "signout_success"}, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -86,6 +105,10 @@ class MyTokenObtaionVeiw(TokenObtainPairView):
     """
 
     serializer_class = MyTokenObtainSerializer
+    throttle_classes = [IPBucketThrottle, UsernameBucketThrottle]
+    throttle_scope = "login"
+    # 비밀번호 hash 설정이 바뀐 경우 새 hash를 저장하는 쿼리가 추가됩니다.
+    query_budget = 2
 
 
 class ProfileView(APIView):
@@ -94,19 +117,44 @@ class ProfileView(APIView):
     """
 
     permission_classes = [IsMeOrReadOnly]
+    exact_last_modified = True
+    # 캐시는 새 버전으로 PROFILE_CACHE_TIMEOUT 동안 유지되므로, 늦게 반영되는 replica가 아닌 primary에서 만듭니다.
+    query_budget = {"GET": 1, "PUT": 3}
+
+    def build_profile(self, user_id):
+        """
+        (상태코드, 응답 데이터)를 반환합니다.
+        User를 select_related로 함께 불러오므로 쿼리 한 번으로 만듭니다.
+        """
+        profile = get_object_or_404(
+            Profile.objects.select_related("username"), username=user_id
+        )
+        if not profile.username.is_active:
+            return status.HTTP_404_NOT_FOUND, {"message": "탈퇴한 사용자입니다"}
+        return status.HTTP_200_OK, dict(ProfileSerializer(profile).data)
 
+    def get_validators(self, request, user_id):
+        """
+        프로필 캐시의 버전은 프로필/팔로우/게시글 수/탈퇴 여부가 바뀔 때마다 새로 발급되므로
+        DB를 조회하지 않고 버전으로 ETag를 만듭니다.
+        """
+        return version_validators(profile_key(user_id), "profile", user_id)
+
+    @conditional_get
     def get(self, request, user_id):
         """
         프로필 조회
-        username, email, image, bio, created_at, updated_at, articles
+        username, email, image, bio, created_at, updated_at, followers, following,
+        articles_count
         탈퇴한 사용자는 조회할 수 없다.
+        직렬화한 결과를 캐시에 저장해두고, 프로필 수정/팔로우/게시글 작성·삭제/탈퇴 시 무효화합니다.
         """
-        profile = get_object_or_404(Profile, username=user_id)
-        if not profile.username.is_active:
-            return Response({"message": "탈퇴한 사용자입니다"}, status=status.HTTP_404_NOT_FOUND)
-        else:
-            serialized = ProfileSerializer(profile)
-        return Response(serialized.data, status=status.HTTP_200_OK)
+        code, data = get_or_build(
+            profile_key(user_id),
+            lambda: self.build_profile(user_id),
+            settings.PROFILE_CACHE_TIMEOUT,
+        )
+        return Response(data, status=code)
 
     def put(self, request, user_id):
         """
@@ -121,38 +169,57 @@ class ProfileView(APIView):
             return Response({"message": "edit success"}, status=status.HTTP_200_OK)
 
 
-class ProfileArticleView(generics.ListAPIView):
-    paginations_class = ArticlePagination
+class ProfileArticleView(
+    ArticleListValidatorsMixin, StreamingListMixin, generics.ListAPIView
+):
+    pagination_class = ArticlePagination
     serializer_class = ArticleListSerializer
-
-    def list(self, request, *args, **kwargs):
-        queryset = self.filter_queryset(
-            get_object_or_404(User, id=kwargs.get("user_id"))
-            .article_set.all()
-            .order_by("-created_at")
+    query_budget = 3
+
+    @cached_property
+    def author(self):
+        return get_object_or_404(User, id=self.kwargs.get("user_id"))
+
+    def get_queryset(self):
+        user = self.author
+        return (
+            Article.objects.for_listing()
+            .filter(author=user)
+            .order_by("-created_at", "-id")
         )
 
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        return self.list(request, *args, **kwargs)
 
 
 class FollowView(APIView):
+    """
+    유저를 팔로우/언팔로우합니다.
+    POST는 토글, PUT은 팔로우, DELETE는 언팔로우이며 PUT/DELETE는 여러 번 요청해도 결과가 같습니다.
+    팔로우하면 상대의 기존 게시글을 내 피드에 채우고, 언팔로우하면 내 피드에서 지웁니다.
+    """
+
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [UserBucketThrottle, IPBucketThrottle]
+    throttle_scope = "toggle"
+    query_budget = 9
 
-    def post(self, request, user_id):
+    def follow(self, request, user_id, state=None):
         the_user = get_object_or_404(User, id=user_id)
-        if the_user == request.user:
+        if the_user.id == request.user.id:
             return Response(
                 {"message": "Can't self follow"}, status=status.HTTP_400_BAD_REQUEST
             )
-        if the_user in request.user.followings.all():
-            request.user.followings.remove(the_user)
-            return Response({"message": "Unfollow"}, status=status.HTTP_200_OK)
-        else:
-            request.user.followings.add(the_user)
+        if set_follow(request.user, the_user, state):
             return Response({"message": "Follow"}, status=status.HTTP_200_OK)
+        return Response({"message": "Unfollow"}, status=status.HTTP_200_OK)
+
+    def post(self, request, user_id):
+        return self.follow(request, user_id)
+
+    def put(self, request, user_id):
+        return self.follow(request, user_id, True)
+
+    def delete(self, request, user_id):
+        return self.follow(request, user_id, False)